@@ -0,0 +1,219 @@
+"""
+Streams a file of (operation, num1, num2) rows through the plugin registry in bounded chunks.
+
+Input and output formats are chosen by file extension: ``.csv`` (with an
+``operation,num1,num2`` header) or ``.jsonl`` (one object per line with the
+same keys). Each chunk is grouped by operation, evaluated with the plugins'
+``execute_batch``, written to the output and recorded in ``Calculations``
+with a single bulk insert, so memory stays proportional to the chunk size.
+In float numeric mode the operands are parsed as floats, so each group runs
+through ``execute_batch`` on native float64 arrays. Given a worker pool, float
+groups of at least ``SHARED_MEMORY_MIN_ROWS`` rows are split across the
+workers through a shared-memory block instead of running in this process.
+"""
+
+import csv
+import json
+import os
+import time
+from decimal import InvalidOperation
+from itertools import islice
+from typing import NamedTuple
+from app.core.calculations import Calculations
+from app.core.command import Command
+from app.core.numeric_mode import get_numeric_mode, parse_number
+
+DEFAULT_CHUNK_SIZE = 10_000
+SHARED_MEMORY_MIN_ROWS = 100_000  # below this, dispatch costs more than the workers save
+MP_CHUNK_SIZE = 1_000_000  # default chunk size with a pool, so groups can reach SHARED_MEMORY_MIN_ROWS
+INPUT_FIELDS = ["operation", "num1", "num2"]
+OUTPUT_FIELDS = ["operation", "num1", "num2", "result", "error"]
+
+class MalformedRow(NamedTuple):
+    """
+    Input line that could not be read as a row; it becomes an error row in the output.
+    """
+
+    error: str
+
+class BatchStats:
+    """
+    Summary of a batch run.
+    """
+
+    def __init__(self, rows: int, failed: int, seconds: float):
+        self.rows = rows
+        self.failed = failed
+        self.seconds = seconds
+
+    @property
+    def rows_per_second(self) -> float:
+        """
+        Throughput of the run.
+        """
+        return self.rows / self.seconds if self.seconds else float("inf")
+
+    def __str__(self) -> str:
+        return (f"Processed {self.rows} rows ({self.failed} failed) in {self.seconds:.3f}s "
+                f"({self.rows_per_second:,.0f} rows/s)")
+
+def _is_jsonl(filepath: str) -> bool:
+    """
+    Whether the file extension selects the JSON Lines format.
+    """
+    return os.path.splitext(filepath)[1].lower() in (".jsonl", ".ndjson")
+
+def iter_rows(filepath: str):
+    """
+    Lazily yields (operation, num1, num2) string triples from a CSV or JSONL file.
+
+    A JSONL line that is not a JSON object yields a MalformedRow instead.
+
+    :param filepath: Path of the input file.
+    """
+    with open(filepath, newline="", encoding="utf-8") as handle:
+        if _is_jsonl(filepath):
+            for number, line in enumerate(handle, start=1):
+                if line.strip():
+                    try:
+                        row = json.loads(line)
+                    except json.JSONDecodeError:
+                        row = None
+                    if not isinstance(row, dict):
+                        yield MalformedRow(f"Invalid JSON object on line {number}")
+                        continue
+                    yield tuple(str(row.get(field, "")) for field in INPUT_FIELDS)
+        else:
+            for row in csv.DictReader(handle):
+                yield tuple(row.get(field) or "" for field in INPUT_FIELDS)
+
+def iter_chunks(rows, chunk_size: int):
+    """
+    Groups an iterator of rows into lists of at most ``chunk_size`` rows.
+    """
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+class _ResultWriter:
+    """
+    Streams result rows to a CSV or JSONL file.
+    """
+
+    def __init__(self, handle, jsonl: bool):
+        self._handle = handle
+        self._jsonl = jsonl
+        if not jsonl:
+            self._writer = csv.writer(handle)
+            self._writer.writerow(OUTPUT_FIELDS)
+
+    def write(self, rows):
+        """
+        Writes a list of output rows ordered as OUTPUT_FIELDS.
+        """
+        if self._jsonl:
+            self._handle.writelines(json.dumps(dict(zip(OUTPUT_FIELDS, row))) + "\n" for row in rows)
+        else:
+            self._writer.writerows(rows)
+
+def process_chunk(chunk, command_registry, numeric_mode: str = None, pool=None):
+    """
+    Evaluates one chunk of rows, grouping them by operation for vectorized execution.
+
+    :param chunk: List of (operation, num1, num2) string triples or MalformedRows.
+    :param command_registry: Mapping of operation name to Command instance.
+    :param numeric_mode: 'decimal' or 'float'; defaults to the session mode.
+    :param pool: Optional WorkerPool that evaluates large float groups through shared memory.
+    :return: Tuple of the output rows and the (operation, num1, num2, result)
+             records of the successful rows, both in input order. Rows whose
+             operation fails get a "Division by zero" or "Undefined result" error.
+    """
+    numeric_mode = numeric_mode or get_numeric_mode()
+    output = [None] * len(chunk)
+    groups = {}
+    for position, row in enumerate(chunk):
+        if isinstance(row, MalformedRow):
+            output[position] = ["", "", "", "", row.error]
+            continue
+        operation, num1, num2 = row
+        if operation not in command_registry:
+            output[position] = [operation, num1, num2, "", f"Invalid operation: {operation}"]
+            continue
+        try:
+            operands = (parse_number(num1, numeric_mode), parse_number(num2, numeric_mode))
+        except InvalidOperation:
+            output[position] = [operation, num1, num2, "", f"Invalid numbers: {num1}, {num2}"]
+            continue
+        groups.setdefault(operation, []).append((position, *operands))
+
+    results = {}
+    for operation, members in groups.items():
+        positions, nums1, nums2 = zip(*members)
+        command = command_registry.get(operation)
+        if command is None:
+            for position in positions:
+                output[position] = [*chunk[position], "", f"Invalid operation: {operation}"]
+            continue
+        try:
+            if pool is not None and numeric_mode == "float" and len(positions) >= SHARED_MEMORY_MIN_ROWS:
+                batch = pool.execute_batch_shared(command, nums1, nums2)
+            else:
+                batch = command.execute_batch(nums1, nums2)
+        except ArithmeticError:  # an override that does not mask its own errors
+            batch = Command.execute_batch(command, nums1, nums2)
+        for position, num1, num2, value, failed in zip(positions, nums1, nums2, batch.values, batch.mask):
+            if failed:
+                output[position] = [operation, chunk[position][1], chunk[position][2], "",
+                                    _failure(command, num1, num2)]
+            else:
+                output[position] = [operation, chunk[position][1], chunk[position][2], str(value), ""]
+                results[position] = (operation, num1, num2, value)
+
+    return output, [results[position] for position in sorted(results)]
+
+def _failure(command, num1, num2) -> str:
+    """
+    Describes why a masked row failed, re-running its operation to recover the error.
+    """
+    try:
+        command.execute(num1, num2)
+    except ZeroDivisionError:  # decimal.DivisionByZero included
+        return "Division by zero"
+    except ArithmeticError:
+        pass
+    return "Undefined result"
+
+def run_batch(input_path: str, output_path: str, command_registry, chunk_size: int = DEFAULT_CHUNK_SIZE,
+              numeric_mode: str = None, pool=None) -> BatchStats:
+    """
+    Runs every operation in ``input_path`` and streams the results to ``output_path``.
+
+    :param input_path: CSV or JSONL file of operations.
+    :param output_path: CSV or JSONL file receiving one result row per input row.
+    :param command_registry: Mapping of operation name to Command instance.
+    :param chunk_size: Maximum number of rows held in memory at once.
+    :param numeric_mode: 'decimal' or 'float'; defaults to the session mode.
+    :param pool: Optional WorkerPool for large float groups (see ``process_chunk``).
+    :return: BatchStats for the run.
+    """
+    if not os.path.exists(input_path):
+        raise FileNotFoundError(f"No such file: '{input_path}'")
+    directory = os.path.dirname(output_path)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+
+    rows = failed = 0
+    start = time.perf_counter()
+    with open(output_path, "w", newline="", encoding="utf-8") as handle:
+        writer = _ResultWriter(handle, _is_jsonl(output_path))
+        for chunk in iter_chunks(iter_rows(input_path), chunk_size):
+            output, records = process_chunk(chunk, command_registry, numeric_mode, pool)
+            writer.write(output)
+            if records:
+                Calculations.add_calculations(*zip(*records))
+            rows += len(chunk)
+            failed += len(chunk) - len(records)
+    return BatchStats(rows, failed, time.perf_counter() - start)
@@ -8,20 +8,27 @@ from decimal import Decimal
 class Calculation:
     """
     Represents a single arithmetic calculation.
+
+    Instances use ``__slots__`` rather than a per-instance ``__dict__``,
+    which keeps each record small when many are created.
     """
 
-    def __init__(self, a: Decimal, b: Decimal, operation):
+    __slots__ = ("a", "b", "operation", "result")
+
+    def __init__(self, a: Decimal, b: Decimal, operation, result: Decimal = None):
         """
         Initializes a new Calculation instance.
 
         :param a: First operand as a Decimal.
         :param b: Second operand as a Decimal.
         :param operation: Operation object that has an execute method.
+        :param result: Result already computed by the caller, if any; otherwise
+                       ``operate`` computes it.
         """
         self.a = a
         self.b = b
         self.operation = operation
-        self.result = None
+        self.result = result
 
     def operate(self) -> Decimal:
         """
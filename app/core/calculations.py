@@ -1,18 +1,52 @@
 """
-This module defines the Calculations class for managing and persisting 
+This module defines the Calculations class for managing and persisting
 a history of performed calculations, backed by Pandas.
 """
 
-import pandas as pd
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from itertools import count
+from operator import itemgetter
+from typing import TYPE_CHECKING
 from app.core.calculation import Calculation
+from app.core.metrics import get_metrics
+from app.core.numeric_mode import parse_number
 from app.utils.pandas_facade import PandasFacade
+from app.utils.history_log import HistoryLog
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 class Calculations:
     """
     Maintains a collection of Calculation records and provides history management utilities.
+
+    The history may be used from several threads at once. Each thread
+    appends to its own shard, a deque of records stamped with a global
+    sequence number, so concurrent appends never wait on each other. The
+    shards are merged into the store, in sequence order, by the next
+    operation that reads or restructures the history (reads, filters,
+    queries, summary, delete, clear, load, save), and each of those runs
+    under one lock. A shard holding ``SHARD_MERGE_SIZE`` records is also
+    merged by its own thread whenever the lock is free.
+
+    With a write-ahead log enabled, appends take the lock as well, so the
+    log keeps the history's order.
     """
 
+    SHARD_MERGE_SIZE = 4096
+
     _facade = PandasFacade()
+    _log = None
+    _compact_every = None
+    _lock = threading.RLock()
+    _sequence = count()
+    _local = threading.local()
+    _shards = []
+    _unmerged = []
 
     @classmethod
     def add_calculation(cls, calculation: Calculation):
@@ -21,57 +55,262 @@ class Calculations:
 
         :param calculation: The Calculation instance containing operation details.
         """
-        record = {
-            "operation": calculation.operation.operation_name,
-            "num1": calculation.a,
-            "num2": calculation.b,
-            "result": calculation.result
-        }
-        cls._facade.add_record(record)
+        operation = calculation.operation.operation_name
+        if cls._log:
+            with cls._exclusive():
+                cls._facade.append(operation, calculation.a, calculation.b, calculation.result)
+                cls._append_log(cls._add_entry(operation, calculation.a, calculation.b, calculation.result))
+                metrics = get_metrics()
+                if metrics:
+                    metrics.record_history("append")
+            return
+        shard = getattr(cls._local, "shard", None)
+        if shard is None:
+            shard = cls._add_shard()
+        shard.append((next(cls._sequence), operation, calculation.a, calculation.b, calculation.result))
+        if len(shard) >= cls.SHARD_MERGE_SIZE and cls._lock.acquire(blocking=False):
+            try:
+                cls._merge_shards()
+            finally:
+                cls._lock.release()
+
+    @classmethod
+    def _add_shard(cls) -> deque:
+        """
+        Creates and registers the calling thread's append shard.
+        """
+        shard = cls._local.shard = deque()
+        with cls._lock:
+            cls._shards.append((threading.current_thread(), shard))
+        return shard
+
+    @classmethod
+    def _merge_shards(cls):
+        """
+        Moves every shard's records into the store in sequence order; the caller holds the lock.
+
+        Records are taken with ``popleft``, which is safe against the owning
+        thread's concurrent ``append``. Shards of finished threads are dropped
+        once emptied. If the store rejects the batch, which it then leaves
+        unchanged, the records are kept for the next merge.
+        """
+        records, cls._unmerged = cls._unmerged, []
+        for _, shard in cls._shards:
+            records.extend([shard.popleft() for _ in range(len(shard))])
+        cls._shards = [(thread, shard) for thread, shard in cls._shards if shard or thread.is_alive()]
+        if not records:
+            return
+        records.sort(key=itemgetter(0))  # each shard is already in order, so this merges sorted runs
+        try:
+            cls._facade.append_many(map(itemgetter(1, 2, 3, 4), records))
+        except Exception:
+            cls._unmerged = records
+            raise
+        metrics = get_metrics()
+        if metrics:
+            metrics.record_history("append", len(records))
+
+    @classmethod
+    @contextmanager
+    def _exclusive(cls):
+        """
+        Holds the history lock with every shard merged into the store.
+        """
+        with cls._lock:
+            cls._merge_shards()
+            yield
+
+    @classmethod
+    def add_calculations(cls, operations, nums1, nums2, results):
+        """
+        Adds many completed calculations to the history log in one bulk insert.
+
+        :param operations: Operation name of each calculation.
+        :param nums1: First operand of each calculation.
+        :param nums2: Second operand of each calculation.
+        :param results: Result of each calculation.
+        """
+        with cls._exclusive():
+            cls._facade.add_records({
+                "operation": operations,
+                "num1": nums1,
+                "num2": nums2,
+                "result": results
+            })
+            if cls._log:
+                for record in zip(operations, nums1, nums2, results):
+                    cls._log.append(cls._add_entry(*record))
+                cls._compact_if_due()
+            metrics = get_metrics()
+            if metrics:
+                metrics.record_history("append", len(operations))
 
     @classmethod
     def clear_history(cls):
         """
         Clears all recorded calculations from the history.
         """
-        cls._facade.clear()
+        with cls._exclusive():
+            cls._facade.clear()
+            if cls._log:
+                cls._append_log({"type": "clear"})
+            metrics = get_metrics()
+            if metrics:
+                metrics.record_history("clear")
 
     @classmethod
-    def get_all_calculations(cls) -> pd.DataFrame:
+    def get_all_calculations(cls) -> "pd.DataFrame":
         """
         Retrieves the entire history as a pandas DataFrame.
 
         :return: DataFrame containing all calculation records.
         """
-        return cls._facade.dataframe
+        with cls._exclusive():
+            return cls._facade.dataframe
 
     @classmethod
-    def filter_with_operation(cls, operation: str) -> pd.DataFrame:
+    def iter_history(cls, offset: int = 0, page_size: int = 20, operation: str = None):
+        """
+        Yields the history in pages of ``page_size`` records, starting at ``offset``.
+
+        Each page is read from the current history when it is requested,
+        without copying or consolidating the rest, so a page costs
+        O(page_size). The cursor advances by record count, like OFFSET:
+        records added meanwhile are reached, and a delete before the cursor
+        shifts the following records back by one.
+
+        :param offset: Index of the first record (among the operation's records when one is given).
+        :param page_size: Maximum number of records per page.
+        :param operation: Only page through records of this operation.
+        :return: Iterator of DataFrames labelled with their history index.
+        :raises ValueError: If the offset is negative or the page size is not positive.
+        """
+        if offset < 0 or page_size < 1:
+            raise ValueError("Offset must not be negative and page size must be positive.")
+        return cls._pages(offset, page_size, operation)
+
+    @classmethod
+    def _pages(cls, offset: int, page_size: int, operation: str):
+        """
+        Yields pages from ``offset`` until one comes back empty.
+        """
+        while True:
+            with cls._exclusive():
+                page = cls._facade.page(offset, page_size, operation)
+            if page.empty:
+                return
+            yield page
+            offset += len(page)
+
+    @classmethod
+    def iter_records(cls, offset: int = 0, operation: str = None, page_size: int = 1024):
+        """
+        Yields history records one at a time as (index, operation, num1, num2, result) tuples.
+
+        Records are read a page at a time through ``iter_history``.
+        """
+        for page in cls.iter_history(offset, page_size, operation):
+            yield from page.itertuples(name=None)
+
+    @classmethod
+    def filter_with_operation(cls, operation: str) -> "pd.DataFrame":
         """
         Filters the history for records that match the provided operation.
 
         :param operation: Name of the operation to filter by.
         :return: Filtered DataFrame of matching records.
         """
-        return cls._facade.filter_by_operation(operation)
+        with cls._exclusive():
+            return cls._facade.filter_by_operation(operation)
+
+    @classmethod
+    def query(cls, where=(), order_by: str = None, descending: bool = False, limit: int = None) -> "pd.DataFrame":
+        """
+        Returns the records matching every predicate, optionally ordered and limited.
+
+        Predicates are (column, operator, value) triples over ``operation``,
+        ``num1``, ``num2`` and ``result``, for example ``("result", ">", 10)``
+        or ``("num1", "between", (1, 5))``; ``parse_query`` builds them from
+        text. Numeric predicates are answered from sorted indexes built on
+        first use (see ``PandasFacade.query``).
+
+        :param where: Predicates that must all hold.
+        :param order_by: Column to order by; None keeps history order.
+        :param descending: Order from largest to smallest.
+        :param limit: Maximum number of rows returned; None for all.
+        :return: Matching records, labelled with their history index.
+        :raises QueryError: If a predicate, the order column or the limit is invalid.
+        """
+        from app.utils.history_query import COLUMNS, QueryError, predicate  # pylint: disable=import-outside-toplevel
+        conditions = tuple(predicate(*condition) for condition in where)
+        if order_by is not None and order_by not in COLUMNS:
+            raise QueryError(f"Unknown column '{order_by}'.")
+        if limit is not None and limit < 0:
+            raise QueryError("Limit must not be negative.")
+        with cls._exclusive():
+            return cls._facade.query(conditions, order_by, descending, limit)
+
+    @classmethod
+    def summary(cls) -> dict:
+        """
+        Returns running aggregates of the results for each operation.
+
+        The aggregates are maintained as records are added, deleted, cleared
+        or loaded, so this does not scan the history.
+
+        :return: Mapping of operation name to count, sum, min, max, mean and
+                 sample variance (None below two records).
+        """
+        with cls._exclusive():
+            return cls._facade.summary()
 
     @classmethod
     def save_history(cls, filepath: str):
         """
-        Persists the history to a CSV file at the specified location.
+        Persists the history to a file at the specified location.
+
+        The extension selects the format: .csv, or the binary columnar
+        .npz, .feather and .parquet formats that keep Decimal values exact.
 
-        :param filepath: Path where the history CSV should be stored.
+        :param filepath: Path where the history file should be stored.
         """
-        cls._facade.save_to_file(filepath)
+        with cls._exclusive():
+            start = time.perf_counter()
+            cls._facade.save_to_file(filepath)
+            metrics = get_metrics()
+            if metrics:
+                metrics.record_history("save", seconds=time.perf_counter() - start)
 
     @classmethod
-    def load_history(cls, filepath: str):
+    def load_history(cls, filepath: str, chunk_size: int = None, operations=None,
+                     min_result=None, max_result=None, append: bool = False) -> int:
         """
-        Loads calculation history from a CSV file.
+        Loads calculation history from a .csv, .npz, .feather or .parquet file.
 
-        :param filepath: Path of the CSV file to load.
+        With a chunk size, an operation or result-range filter, or ``append``,
+        the file is streamed in bounded chunks and only matching rows are kept
+        (see ``PandasFacade.load_from_file``).
+
+        When a write-ahead log is enabled, the loaded history is compacted
+        into a new snapshot so the log stays consistent with it.
+
+        :param filepath: Path of the history file to load.
+        :param chunk_size: Maximum number of rows read at once.
+        :param operations: Operation names to keep; None keeps every operation.
+        :param min_result: Smallest result to keep (inclusive).
+        :param max_result: Largest result to keep (inclusive).
+        :param append: Append the loaded rows instead of replacing the history.
+        :return: Number of rows loaded.
         """
-        cls._facade.load_from_file(filepath)
+        with cls._exclusive():
+            start = time.perf_counter()
+            loaded = cls._facade.load_from_file(filepath, chunk_size, operations, min_result, max_result, append)
+            metrics = get_metrics()
+            if metrics:
+                metrics.record_history("load", seconds=time.perf_counter() - start)
+            if cls._log:
+                cls.compact_log()
+            return loaded
 
     @classmethod
     def delete_history(cls, index: int):
@@ -80,4 +319,138 @@ class Calculations:
 
         :param index: Row index to delete from the DataFrame.
         """
-        cls._facade.delete_record(index)
+        with cls._exclusive():
+            if cls._facade.delete_record(index):
+                if cls._log:
+                    cls._append_log({"type": "delete", "index": index})
+                metrics = get_metrics()
+                if metrics:
+                    metrics.record_history("delete")
+
+    @classmethod
+    def configure_compaction(cls, ratio: float):
+        """
+        Sets the fraction of deleted rows at which the history is compacted.
+
+        Deleted rows are only marked until then; see ``PandasFacade``.
+
+        :param ratio: Dead-row fraction in (0, 1].
+        :raises ValueError: If the ratio is outside (0, 1].
+        """
+        if not 0 < ratio <= 1:
+            raise ValueError("Compaction ratio must be greater than 0 and at most 1.")
+        with cls._lock:
+            cls._facade.compact_ratio = ratio
+
+    @classmethod
+    def enable_log(cls, log_path: str, fsync: str = "batch", flush_every: int = 100, compact_every: int = 10000):
+        """
+        Switches persistence to an append-only write-ahead log.
+
+        The current history is replaced by the snapshot and entries recorded
+        in the log, after which every add, delete and clear is appended to it.
+        Once the log holds ``compact_every`` entries it is folded into a new
+        snapshot written next to it.
+
+        :param log_path: Path of the log file; created if missing.
+        :param fsync: Fsync policy for log batches ('always', 'batch' or 'never').
+        :param flush_every: Number of entries written per batch.
+        :param compact_every: Log length that triggers compaction; 0 disables it.
+        """
+        with cls._exclusive():
+            cls.disable_log()
+            cls._facade.clear()
+            for entry in HistoryLog.read(log_path):
+                cls._replay(entry, os.path.dirname(log_path))
+            cls._log = HistoryLog(log_path, fsync=fsync, flush_every=flush_every)
+            cls._compact_every = compact_every
+
+    @classmethod
+    def disable_log(cls):
+        """
+        Flushes and closes the write-ahead log, if one is enabled.
+        """
+        with cls._lock:
+            if cls._log:
+                cls._log.close()
+                cls._log = None
+
+    @classmethod
+    def flush_log(cls):
+        """
+        Writes any buffered log entries according to the fsync policy.
+        """
+        with cls._lock:
+            if cls._log:
+                cls._log.flush()
+
+    @classmethod
+    def compact_log(cls):
+        """
+        Folds the write-ahead log into a snapshot and restarts the log from it.
+
+        The snapshot is written under a new name first and the log is then
+        replaced atomically, so an interrupted compaction leaves the previous
+        snapshot and log intact.
+        """
+        with cls._exclusive():
+            if not cls._log:
+                return
+            log_path = cls._log.filepath
+            directory = os.path.dirname(log_path)
+            previous = cls._log.snapshot
+            generation = previous["generation"] + 1 if previous else 1
+            snapshot = f"{os.path.basename(log_path)}.snapshot-{generation}.npz"
+            cls._facade.save_to_file(os.path.join(directory, snapshot))
+            cls._log.rewrite([{"type": "snapshot", "file": snapshot, "generation": generation}])
+            if previous:
+                stale = os.path.join(directory, previous["file"])
+                if os.path.exists(stale):
+                    os.remove(stale)
+
+    @staticmethod
+    def _add_entry(operation: str, num1, num2, result) -> dict:
+        """
+        Builds the write-ahead log entry of an added calculation, marking float-mode values.
+
+        Missing values are written as JSON null.
+        """
+        entry = {"type": "add", "operation": operation}
+        for key, value in (("num1", num1), ("num2", num2), ("result", result)):
+            entry[key] = None if value is None else str(value)
+            if isinstance(value, float):
+                entry["numeric"] = "float"
+        return entry
+
+    @classmethod
+    def _append_log(cls, entry: dict):
+        """
+        Appends one entry to the write-ahead log and compacts it when due.
+        """
+        cls._log.append(entry)
+        cls._compact_if_due()
+
+    @classmethod
+    def _compact_if_due(cls):
+        """
+        Compacts the write-ahead log once it reaches the configured length.
+        """
+        if cls._compact_every and cls._log.entry_count >= cls._compact_every:
+            cls.compact_log()
+
+    @classmethod
+    def _replay(cls, entry: dict, directory: str):
+        """
+        Applies one write-ahead log entry to the in-memory history.
+        """
+        if entry["type"] == "snapshot":
+            cls._facade.load_from_file(os.path.join(directory, entry["file"]))
+        elif entry["type"] == "add":
+            mode = entry.get("numeric", "decimal")
+            num1, num2, result = (None if entry[key] is None else parse_number(entry[key], mode)
+                                  for key in ("num1", "num2", "result"))
+            cls._facade.append(entry["operation"], num1, num2, result)
+        elif entry["type"] == "delete":
+            cls._facade.remove_record(entry["index"])
+        elif entry["type"] == "clear":
+            cls._facade.clear()
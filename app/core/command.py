@@ -4,6 +4,67 @@ Defines the abstract Command class, serving as a blueprint for arithmetic operat
 
 from decimal import Decimal
 from abc import ABC, abstractmethod
+from typing import NamedTuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# NumPy is imported inside the batch helpers so that the scalar execute()
+# path, used by single-operation CLI calls, does not pay for the import.
+
+class BatchResult(NamedTuple):
+    """
+    Element-wise result of a batch execution.
+
+    ``values`` holds one result per operand pair. ``mask`` is True where the
+    pair could not be computed (e.g. division by zero); the matching entry
+    in ``values`` is NaN for float batches and None for Decimal batches.
+    """
+
+    values: "np.ndarray"
+    mask: "np.ndarray"
+
+def as_operand_arrays(nums1, nums2):
+    """
+    Converts two operand sequences into equally sized one-dimensional arrays.
+
+    Sequences of Decimal become object arrays; NumPy arrays are used as-is.
+
+    :param nums1: First operands.
+    :param nums2: Second operands.
+    :return: Tuple of the two operand arrays.
+    :raises ValueError: If the operands are not one-dimensional or differ in length.
+    """
+    import numpy as np  # pylint: disable=import-outside-toplevel,redefined-outer-name
+    operands1, operands2 = np.asarray(nums1), np.asarray(nums2)
+    if operands1.ndim != 1 or operands1.shape != operands2.shape:
+        raise ValueError("Operand arrays must be one-dimensional and of equal length.")
+    return operands1, operands2
+
+def unmasked(values: "np.ndarray") -> BatchResult:
+    """
+    Pairs a result array with an all-clear mask, for operations that cannot fail.
+
+    :param values: Result array computed for every operand pair.
+    :return: BatchResult with no masked entries.
+    """
+    import numpy as np  # pylint: disable=import-outside-toplevel,redefined-outer-name
+    return BatchResult(values, np.zeros(len(values), dtype=bool))
+
+def fill_masked(values: "np.ndarray", mask: "np.ndarray") -> BatchResult:
+    """
+    Blanks out the masked entries of a result array and pairs it with its mask.
+
+    :param values: Result array computed for every operand pair.
+    :param mask: Boolean array marking the pairs without a valid result.
+    :return: BatchResult with NaN (float) or None (object) in masked slots.
+    """
+    import numpy as np  # pylint: disable=import-outside-toplevel,redefined-outer-name
+    if mask.any():
+        if values.dtype.kind != "f" and values.dtype != object:
+            values = values.astype(np.float64)
+        values[mask] = np.nan if values.dtype.kind == "f" else None
+    return BatchResult(values, mask)
 
 class Command(ABC):
     """
@@ -11,6 +72,7 @@ class Command(ABC):
     """
 
     operation_name: str  # Should be overridden by subclasses
+    commutative: bool = False  # True if execute(a, b) == execute(b, a), letting both share a cache entry
 
     @abstractmethod
     def execute(self, num1: Decimal, num2: Decimal) -> Decimal:
@@ -33,3 +95,29 @@ class Command(ABC):
         :param result_queue: Multiprocessing queue to store the result.
         """
         pass  # Implementation is required in subclasses
+
+    def execute_batch(self, nums1, nums2) -> BatchResult:
+        """
+        Executes the operation over two operand arrays.
+
+        This default loops over ``execute`` so third-party plugins work
+        unchanged; built-in plugins override it with a vectorized pass.
+        Arithmetic errors are recorded in the mask instead of raised.
+
+        :param nums1: First operands (NumPy array or sequence of Decimal).
+        :param nums2: Second operands, same length as ``nums1``.
+        :return: BatchResult with one value and mask flag per pair.
+        """
+        import numpy as np  # pylint: disable=import-outside-toplevel,redefined-outer-name
+        operands1, operands2 = as_operand_arrays(nums1, nums2)
+        values = np.empty(len(operands1), dtype=object)
+        mask = np.zeros(len(operands1), dtype=bool)
+        for position, (num1, num2) in enumerate(zip(operands1, operands2)):
+            try:
+                values[position] = self.execute(num1, num2)
+            except ArithmeticError:
+                mask[position] = True
+        if operands1.dtype.kind in "fiu" and operands2.dtype.kind in "fiu":
+            values[mask] = np.nan
+            values = values.astype(np.float64)
+        return BatchResult(values, mask)
@@ -0,0 +1,267 @@
+"""
+Compiles prefix expressions over the plugin registry into DAG plans and evaluates them.
+
+Expressions nest binary operations in prefix form, with optional parentheses::
+
+    divide (add 1 2) (multiply 3 (add 1 2))
+    add x (multiply y 2)
+
+Tokens that are neither operations nor numbers are variables, bound at
+evaluation time. While compiling, every node is hash-consed: a repeated
+subexpression (including a commutative one with its operands swapped) maps
+to the node already built, so it is computed once per evaluation. Compiled
+plans are cached by their whitespace-normalised text.
+"""
+
+import re
+from collections import OrderedDict
+from typing import NamedTuple
+from app.core.command import BatchResult, fill_masked
+from app.core.numeric_mode import get_numeric_mode, parse_number
+
+_TOKEN = re.compile(r"\(|\)|[^\s()]+")
+_VARIABLE = re.compile(r"[A-Za-z_]\w*$")
+
+CONSTANT = "const"
+VARIABLE = "var"
+
+class ExpressionError(ValueError):
+    """
+    Raised for expressions that cannot be parsed or evaluated with the given bindings.
+    """
+
+class Node(NamedTuple):
+    """
+    One DAG node: a constant, a variable, or an operation over two earlier nodes.
+
+    ``kind`` is CONSTANT, VARIABLE or an operation name. ``value`` is the
+    constant text or variable name; ``left`` and ``right`` index the operands.
+    """
+
+    kind: str
+    value: str = None
+    left: int = None
+    right: int = None
+
+class ExpressionPlan:
+    """
+    Compiled expression: nodes in dependency order, with the last node as the result.
+    """
+
+    def __init__(self, text: str, nodes: list, commands: dict, tree_size: int):
+        """
+        :param text: Normalised expression text.
+        :param nodes: Deduplicated nodes; operands always precede the nodes using them.
+        :param commands: Operation name to Command instance for the operations used.
+        :param tree_size: Number of nodes the expression has before deduplication.
+        """
+        self.text = text
+        self.nodes = nodes
+        self.commands = commands
+        self.tree_size = tree_size
+        self.variables = tuple(dict.fromkeys(node.value for node in nodes if node.kind == VARIABLE))
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def _check_bindings(self, bindings: dict):
+        """
+        Raises ExpressionError naming the first variable without a binding.
+        """
+        missing = [name for name in self.variables if name not in bindings]
+        if missing:
+            raise ExpressionError(f"Unbound variable: {missing[0]}")
+
+    def evaluate(self, bindings: dict = None, numeric_mode: str = None, steps: list = None):
+        """
+        Evaluates the plan once, computing every distinct subexpression a single time.
+
+        :param bindings: Variable name to value (number or numeric text).
+        :param numeric_mode: 'decimal' or 'float'; defaults to the session mode.
+        :param steps: Optional list that receives an (operation, num1, num2, result)
+                      tuple for every operation evaluated, in evaluation order.
+        :return: The value of the expression.
+        :raises ExpressionError: If a variable is unbound.
+        :raises ArithmeticError: If an operation fails (e.g. division by zero).
+        """
+        bindings = bindings or {}
+        self._check_bindings(bindings)
+        values = []
+        for node in self.nodes:
+            if node.kind == CONSTANT:
+                values.append(parse_number(node.value, numeric_mode))
+            elif node.kind == VARIABLE:
+                values.append(parse_number(str(bindings[node.value]), numeric_mode))
+            else:
+                num1, num2 = values[node.left], values[node.right]
+                result = self.commands[node.kind].execute(num1, num2)
+                if steps is not None:
+                    steps.append((node.kind, num1, num2, result))
+                values.append(result)
+        return values[-1]
+
+    def evaluate_batch(self, bindings: dict, numeric_mode: str = None) -> BatchResult:
+        """
+        Evaluates the plan for many bindings at once, one vectorized pass per node.
+
+        :param bindings: Variable name to an equally long sequence of values.
+        :param numeric_mode: 'decimal' (object arrays) or 'float' (float64 arrays).
+        :return: BatchResult with one value per binding row; rows where any
+                 operation failed are masked.
+        :raises ExpressionError: If a variable is unbound or the sequences differ in length.
+        """
+        import numpy as np  # pylint: disable=import-outside-toplevel
+        self._check_bindings(bindings)
+        lengths = ({len(bindings[name]) for name in self.variables}
+                   or {len(column) for column in bindings.values()})
+        if len(lengths) != 1:
+            raise ExpressionError("Batch bindings must give every variable the same number of values.")
+        rows = lengths.pop()
+        numeric_mode = numeric_mode or get_numeric_mode()
+        dtype = np.float64 if numeric_mode == "float" else object
+        placeholder = parse_number("0", numeric_mode)
+
+        values, masks = [], []
+        for node in self.nodes:
+            if node.kind in (CONSTANT, VARIABLE):
+                if node.kind == CONSTANT:
+                    array = np.full(rows, parse_number(node.value, numeric_mode), dtype=dtype)
+                else:
+                    column = bindings[node.value]
+                    if isinstance(column, np.ndarray) and column.dtype == dtype:
+                        array = column
+                    else:
+                        array = np.fromiter((parse_number(str(value), numeric_mode) for value in column),
+                                            dtype=dtype, count=rows)
+                values.append(array)
+                masks.append(np.zeros(rows, dtype=bool))
+                continue
+            mask = masks[node.left] | masks[node.right]
+            operands1, operands2 = values[node.left], values[node.right]
+            if mask.any():
+                # Failed rows get a harmless operand; their results are discarded
+                operands1 = np.where(masks[node.left], placeholder, operands1)
+                operands2 = np.where(masks[node.right], placeholder, operands2)
+            result = self.commands[node.kind].execute_batch(operands1, operands2)
+            values.append(result.values)
+            masks.append(mask | result.mask)
+        return fill_masked(np.array(values[-1], copy=True), masks[-1])
+
+class ExpressionEngine:
+    """
+    Compiles expressions against a plugin registry and caches the plans by expression text.
+    """
+
+    def __init__(self, command_registry, cache_size: int = 256):
+        """
+        :param command_registry: Mapping of operation name to Command instance.
+        :param cache_size: Maximum number of compiled plans kept.
+        """
+        self.registry = command_registry
+        self.cache_size = cache_size
+        self._plans = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def compile(self, text: str) -> ExpressionPlan:
+        """
+        Returns the plan for an expression, compiling it on the first request.
+
+        :raises ExpressionError: If the expression is malformed or uses an unknown operation.
+        """
+        tokens = _TOKEN.findall(text)
+        key = " ".join(tokens)
+        plan = self._plans.get(key)
+        if plan is not None:
+            self.hits += 1
+            self._plans.move_to_end(key)
+            return plan
+        self.misses += 1
+        plan = _Compiler(self.registry, tokens).compile(key)
+        self._plans[key] = plan
+        if len(self._plans) > self.cache_size:
+            self._plans.popitem(last=False)
+        return plan
+
+    def evaluate(self, text: str, bindings: dict = None, numeric_mode: str = None, steps: list = None):
+        """
+        Compiles (or reuses) the plan for an expression and evaluates it once.
+        """
+        return self.compile(text).evaluate(bindings, numeric_mode, steps)
+
+    def evaluate_batch(self, text: str, bindings: dict, numeric_mode: str = None) -> BatchResult:
+        """
+        Compiles (or reuses) the plan for an expression and evaluates it over batch bindings.
+        """
+        return self.compile(text).evaluate_batch(bindings, numeric_mode)
+
+class _Compiler:
+    """
+    Recursive-descent parser that builds a hash-consed node list.
+    """
+
+    def __init__(self, command_registry, tokens: list):
+        self.registry = command_registry
+        self.tokens = tokens
+        self.position = 0
+        self.nodes = []
+        self.index = {}
+        self.commands = {}
+        self.tree_size = 0
+
+    def compile(self, text: str) -> ExpressionPlan:
+        """
+        Parses the whole token list into a plan.
+        """
+        if not self.tokens:
+            raise ExpressionError("Empty expression.")
+        self._expression()  # children are interned before their parent, so the root is the last node
+        if self.position != len(self.tokens):
+            raise ExpressionError(f"Unexpected token: {self.tokens[self.position]}")
+        return ExpressionPlan(text, self.nodes, self.commands, self.tree_size)
+
+    def _next(self) -> str:
+        if self.position >= len(self.tokens):
+            raise ExpressionError("Incomplete expression.")
+        token = self.tokens[self.position]
+        self.position += 1
+        return token
+
+    def _intern(self, node: Node) -> int:
+        """
+        Returns the index of an identical node, adding the node only if it is new.
+        """
+        self.tree_size += 1
+        if node not in self.index:
+            self.index[node] = len(self.nodes)
+            self.nodes.append(node)
+        return self.index[node]
+
+    def _expression(self) -> int:
+        token = self._next()
+        if token == "(":
+            node = self._expression()
+            if self._next() != ")":
+                raise ExpressionError("Expected ')'.")
+            return node
+        if token == ")":
+            raise ExpressionError("Unexpected ')'.")
+        if token in self.registry:
+            return self._operation(token)
+        if _VARIABLE.match(token):
+            return self._intern(Node(VARIABLE, token))
+        try:
+            parse_number(token, "decimal")
+        except ArithmeticError as error:
+            raise ExpressionError(f"Invalid token: {token}") from error
+        return self._intern(Node(CONSTANT, token))
+
+    def _operation(self, operation: str) -> int:
+        command = self.registry.get(operation)
+        if command is None:
+            raise ExpressionError(f"Invalid operation: {operation}")
+        self.commands[operation] = command
+        left, right = self._expression(), self._expression()
+        if getattr(command, "commutative", False) and right < left:
+            left, right = right, left
+        return self._intern(Node(operation, left=left, right=right))
@@ -0,0 +1,216 @@
+"""
+Provides optional runtime metrics: per-operation counters, error counts and fixed-bucket latency histograms.
+
+Metrics are enabled by setting METRICS=1, or by naming an export file in
+METRICS_FILE. When disabled, ``get_metrics`` returns None and callers skip
+timing entirely, so the only cost left on the dispatch path is one function
+call and a None check. The registry renders itself in the Prometheus text
+exposition format for scraping from a file.
+"""
+
+import math
+import os
+from bisect import bisect_left
+
+# Upper bounds in seconds, from 10 microseconds to 2.5 seconds
+DEFAULT_BUCKETS = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025,
+                   0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+OPERATIONS = "calculator_operations_total"
+ERRORS = "calculator_operation_errors_total"
+LATENCY = "calculator_operation_seconds"
+HISTORY_EVENTS = "calculator_history_events_total"
+HISTORY_LATENCY = "calculator_history_seconds"
+
+HELP = {
+    OPERATIONS: "Operations dispatched, by operation and execution path.",
+    ERRORS: "Operations that failed, by operation and error type.",
+    LATENCY: "Operation dispatch latency, by operation and execution path.",
+    HISTORY_EVENTS: "History store events (records appended, deleted, cleared, loaded, saved).",
+    HISTORY_LATENCY: "History store load and save latency.",
+}
+
+class Histogram:
+    """
+    Counts observations into fixed buckets and keeps their sum.
+    """
+
+    __slots__ = ("bounds", "counts", "count", "sum")
+
+    def __init__(self, bounds: tuple = DEFAULT_BUCKETS):
+        """
+        :param bounds: Sorted bucket upper bounds; a final +Inf bucket is implied.
+        """
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        """
+        Adds one observation to the bucket whose upper bound is the first at or above it.
+        """
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, fraction: float) -> float:
+        """
+        Returns the upper bound of the bucket holding the given quantile (inf for the overflow bucket).
+        """
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(fraction * self.count))
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+class MetricsRegistry:
+    """
+    In-process store of labelled counters and latency histograms.
+    """
+
+    def __init__(self, buckets: tuple = DEFAULT_BUCKETS):
+        """
+        :param buckets: Histogram bucket upper bounds in seconds.
+        """
+        self.buckets = tuple(sorted(buckets))
+        self._counters = {}
+        self._histograms = {}
+
+    def increment(self, name: str, amount: int = 1, **labels):
+        """
+        Adds to the counter identified by name and labels.
+        """
+        key = (name, tuple(sorted(labels.items())))
+        self._counters[key] = self._counters.get(key, 0) + amount
+
+    def observe(self, name: str, seconds: float, **labels):
+        """
+        Adds a latency to the histogram identified by name and labels.
+        """
+        key = (name, tuple(sorted(labels.items())))
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            histogram = self._histograms[key] = Histogram(self.buckets)
+        histogram.observe(seconds)
+
+    def record_operation(self, operation: str, seconds: float, path: str = "inline"):
+        """
+        Counts one dispatched operation and records its latency.
+
+        :param path: 'inline', or 'mp' for the worker pool.
+        """
+        labels = (("operation", operation), ("path", path))  # already in sorted label order
+        key = (OPERATIONS, labels)
+        self._counters[key] = self._counters.get(key, 0) + 1
+        histogram = self._histograms.get((LATENCY, labels))
+        if histogram is None:
+            histogram = self._histograms[(LATENCY, labels)] = Histogram(self.buckets)
+        histogram.observe(seconds)
+
+    def record_error(self, operation: str, error: BaseException):
+        """
+        Counts one failed operation under the error's type name (e.g. DivisionByZero, InvalidOperation).
+        """
+        self.increment(ERRORS, operation=operation, error=type(error).__name__)
+
+    def record_history(self, event: str, amount: int = 1, seconds: float = None):
+        """
+        Counts a history store event and, when given, records its latency.
+        """
+        self.increment(HISTORY_EVENTS, amount, event=event)
+        if seconds is not None:
+            self.observe(HISTORY_LATENCY, seconds, event=event)
+
+    def stats(self) -> dict:
+        """
+        Returns per-operation counts, errors and latency summaries, plus history event counts.
+
+        :return: {'operations': {operation: {path: {count, mean_ms, p50_ms, p99_ms}} | {'errors': {type: n}}},
+                  'history': {event: count}}
+        """
+        operations, history = {}, {}
+        for (name, labels), histogram in self._histograms.items():
+            labels = dict(labels)
+            if name == LATENCY:
+                operations.setdefault(labels["operation"], {})[labels["path"]] = {
+                    "count": histogram.count,
+                    "mean_ms": histogram.sum / histogram.count * 1e3,
+                    "p50_ms": histogram.quantile(0.5) * 1e3,
+                    "p99_ms": histogram.quantile(0.99) * 1e3,
+                }
+        for (name, labels), value in self._counters.items():
+            labels = dict(labels)
+            if name == ERRORS:
+                operations.setdefault(labels["operation"], {}).setdefault("errors", {})[labels["error"]] = value
+            elif name == HISTORY_EVENTS:
+                history[labels["event"]] = value
+        return {"operations": operations, "history": history}
+
+    def to_prometheus(self) -> str:
+        """
+        Renders every metric in the Prometheus text exposition format.
+        """
+        lines = []
+        for name in sorted({name for name, _ in self._counters}):
+            lines += [f"# HELP {name} {HELP.get(name, name)}", f"# TYPE {name} counter"]
+            lines += [f"{name}{_labels(labels)} {value}"
+                      for (counter, labels), value in sorted(self._counters.items()) if counter == name]
+        for name in sorted({name for name, _ in self._histograms}):
+            lines += [f"# HELP {name} {HELP.get(name, name)}", f"# TYPE {name} histogram"]
+            for (histogram_name, labels), histogram in sorted(self._histograms.items(), key=lambda item: item[0]):
+                if histogram_name != name:
+                    continue
+                cumulative = 0
+                for bound, count in zip(histogram.bounds + (float("inf"),), histogram.counts):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f"{name}_bucket{_labels(labels + (('le', le),))} {cumulative}")
+                lines.append(f"{name}_sum{_labels(labels)} {histogram.sum!r}")
+                lines.append(f"{name}_count{_labels(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def export(self, filepath: str):
+        """
+        Writes the Prometheus text to a file, replacing it atomically so scrapers never read a partial file.
+        """
+        temporary = f"{filepath}.tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            file.write(self.to_prometheus())
+        os.replace(temporary, filepath)
+
+    def clear(self):
+        """
+        Drops every counter and histogram.
+        """
+        self._counters.clear()
+        self._histograms.clear()
+
+def _labels(labels: tuple) -> str:
+    """
+    Formats label pairs as {name="value",...}, escaping as the text format requires.
+    """
+    if not labels:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in labels)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(labels, escaped)) + "}"
+
+_default_metrics = None
+_configured = False
+
+def get_metrics():
+    """
+    Returns the shared metrics registry, or None when metrics are disabled.
+
+    Metrics are enabled by METRICS=1 or by setting METRICS_FILE.
+    """
+    global _default_metrics, _configured  # pylint: disable=global-statement
+    if not _configured:
+        enabled = os.getenv("METRICS", "0").lower() in ("1", "true", "yes") or bool(os.getenv("METRICS_FILE"))
+        _default_metrics = MetricsRegistry() if enabled else None
+        _configured = True
+    return _default_metrics
@@ -0,0 +1,57 @@
+"""
+Selects how operands are represented: exact ``decimal`` (the default) or native ``float`` (float64).
+
+The session mode comes from ``set_numeric_mode`` or the NUMERIC_MODE
+environment variable; any call may override it with an explicit mode. In
+float mode operands are parsed as Python floats, plugins compute in native
+floating point, batch chunks run through the plugins' NumPy ``execute_batch``
+on float64 arrays, and the history stores a float64 result column.
+"""
+
+import os
+from decimal import Decimal, InvalidOperation
+
+NUMERIC_MODES = ("decimal", "float")
+DEFAULT_NUMERIC_MODE = "decimal"
+
+_session_mode = None
+
+def check_numeric_mode(mode: str) -> str:
+    """
+    Returns the normalised mode name.
+
+    :raises ValueError: If the mode is not 'decimal' or 'float'.
+    """
+    normalised = mode.lower()
+    if normalised not in NUMERIC_MODES:
+        raise ValueError(f"Unknown numeric mode '{mode}'; expected one of {', '.join(NUMERIC_MODES)}.")
+    return normalised
+
+def set_numeric_mode(mode: str):
+    """
+    Sets the numeric mode for the rest of the session.
+    """
+    global _session_mode  # pylint: disable=global-statement
+    _session_mode = check_numeric_mode(mode)
+
+def get_numeric_mode() -> str:
+    """
+    Returns the session numeric mode, falling back to NUMERIC_MODE and then 'decimal'.
+    """
+    if _session_mode is not None:
+        return _session_mode
+    return check_numeric_mode(os.getenv("NUMERIC_MODE", DEFAULT_NUMERIC_MODE))
+
+def parse_number(text, mode: str = None):
+    """
+    Parses an operand in the given mode, or the session mode when none is given.
+
+    :return: A Decimal in decimal mode, a float in float mode.
+    :raises decimal.InvalidOperation: If the text is not a number, in either mode.
+    """
+    if (check_numeric_mode(mode) if mode else get_numeric_mode()) == "decimal":
+        return Decimal(text)
+    try:
+        return float(text)
+    except (TypeError, ValueError) as error:
+        raise InvalidOperation(f"Invalid number: {text}") from error
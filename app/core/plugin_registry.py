@@ -0,0 +1,156 @@
+"""
+Provides a lazily importing plugin registry backed by a cached on-disk manifest.
+
+The manifest maps every operation name to its plugin module and command
+class. It is built by parsing the ``*_command.py`` files (without importing
+them) and cached as JSON; the cache is reused as long as the set of plugin
+files and their modification times are unchanged. Plugin modules are only
+imported the first time their operation is dispatched.
+"""
+
+import ast
+import importlib
+import json
+import logging
+import os
+from collections.abc import Mapping
+
+MANIFEST_VERSION = 1
+
+def _plugin_files(plugins_directory: str) -> dict:
+    """
+    Returns the modification time (ns) of every plugin file, keyed by file name.
+    """
+    return {
+        entry.name: entry.stat().st_mtime_ns
+        for entry in sorted(os.scandir(plugins_directory), key=lambda entry: entry.name)
+        if entry.name.endswith('_command.py')
+    }
+
+def _describe_plugin(filepath: str, class_name: str):
+    """
+    Finds the command class in a plugin file without importing it.
+
+    :return: First line of the class docstring, or None if the class is missing.
+    """
+    with open(filepath, encoding="utf-8") as handle:
+        tree = ast.parse(handle.read(), filename=filepath)
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef) and node.name == class_name:
+            return ((ast.get_docstring(node) or "").strip().splitlines() or [""])[0]
+    return None
+
+def build_manifest(plugins_directory: str, files: dict) -> dict:
+    """
+    Parses the plugin files into a manifest of operation name to module and class.
+
+    :param plugins_directory: Directory holding the ``*_command.py`` files.
+    :param files: Plugin file names mapped to their modification times.
+    :return: Manifest dictionary, ready to be cached as JSON.
+    """
+    package = plugins_directory.replace(os.sep, '.').strip('.')
+    plugins = {}
+    for file in files:
+        module_name = file[:-3]
+        operation = module_name[:-8]
+        class_name = operation.capitalize() + 'Command'
+        try:
+            description = _describe_plugin(os.path.join(plugins_directory, file), class_name)
+        except (OSError, SyntaxError) as e:
+            logging.error("Error reading plugin %s: %s", module_name, e)
+            continue
+        if description is None:
+            logging.error("Error loading plugin %s: no class %s", module_name, class_name)
+            continue
+        plugins[operation] = {
+            "module": f"{package}.{module_name}",
+            "class": class_name,
+            "description": description,
+        }
+    return {"version": MANIFEST_VERSION, "files": files, "plugins": plugins}
+
+def load_manifest(plugins_directory: str, cache_path: str) -> dict:
+    """
+    Returns the cached manifest if it is still valid, rebuilding and caching it otherwise.
+
+    :param plugins_directory: Directory holding the ``*_command.py`` files.
+    :param cache_path: JSON file used to cache the manifest.
+    """
+    files = _plugin_files(plugins_directory)
+    try:
+        with open(cache_path, encoding="utf-8") as handle:
+            manifest = json.load(handle)
+        if manifest.get("version") == MANIFEST_VERSION and manifest.get("files") == files:
+            return manifest
+    except (OSError, ValueError):
+        pass
+
+    manifest = build_manifest(plugins_directory, files)
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(cache_path, "w", encoding="utf-8") as handle:
+            json.dump(manifest, handle)
+    except OSError as e:
+        logging.warning("Could not cache plugin manifest: %s", e)
+    return manifest
+
+class PluginRegistry(Mapping):
+    """
+    Read-only mapping of operation name to command instance that imports plugins on first use.
+
+    Iterating, ``len`` and ``in`` only consult the manifest, so listing the
+    available operations never imports plugin code.
+    """
+
+    def __init__(self, manifest: dict):
+        """
+        :param manifest: Manifest produced by ``build_manifest``/``load_manifest``.
+        """
+        self._plugins = manifest["plugins"]
+        self._commands = {}
+
+    def __getitem__(self, operation: str):
+        """
+        Returns the command for an operation, importing its module on first access.
+
+        :raises KeyError: If the operation is unknown or its plugin fails to load.
+        """
+        command = self._commands.get(operation)
+        if command is not None:
+            return command
+        entry = self._plugins[operation]
+        try:
+            module = importlib.import_module(entry["module"])
+            command = getattr(module, entry["class"])()
+        except (ImportError, AttributeError) as e:
+            logging.error("Error loading plugin %s: %s", entry['module'], e)
+            raise KeyError(operation) from e
+        logging.info("Plugin loaded: %s", entry['module'].rsplit('.', 1)[-1])
+        self._commands[operation] = command
+        return command
+
+    def __contains__(self, operation) -> bool:
+        return operation in self._plugins
+
+    def __iter__(self):
+        return iter(self._plugins)
+
+    def __len__(self) -> int:
+        return len(self._plugins)
+
+    def describe(self, operation: str) -> str:
+        """
+        Returns the manifest description of an operation without importing it.
+        """
+        return self._plugins[operation]["description"]
+
+def discover_registry(plugins_directory: str, cache_path: str = None) -> PluginRegistry:
+    """
+    Builds a lazy registry for the plugins in a directory.
+
+    :param plugins_directory: Directory holding the ``*_command.py`` files.
+    :param cache_path: Manifest cache file; defaults to ``__pycache__/plugin_manifest.json``
+                       inside the plugins directory.
+    """
+    cache_path = cache_path or os.path.join(plugins_directory, "__pycache__", "plugin_manifest.json")
+    return PluginRegistry(load_manifest(plugins_directory, cache_path))
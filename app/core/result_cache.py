@@ -0,0 +1,110 @@
+"""
+Provides an optional, bounded LRU cache of operation results placed in front of command dispatch.
+
+Keys are built from the operation name and the ``repr`` of both operands,
+so ``2`` and ``2.0`` are cached separately, results keep their Decimal
+representation, and Decimal and float operands never share an entry. Commands that declare ``commutative = True`` share
+one entry for ``(a, b)`` and ``(b, a)``.
+"""
+
+import os
+from collections import OrderedDict
+
+class ResultCache:
+    """
+    Least-recently-used cache of command results with hit, miss and eviction counters.
+    """
+
+    def __init__(self, max_size: int = 1024):
+        """
+        :param max_size: Maximum number of cached results; must be positive.
+        :raises ValueError: If max_size is not positive.
+        """
+        if max_size <= 0:
+            raise ValueError("Result cache size must be positive.")
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(command, num1, num2) -> tuple:
+        """
+        Builds the cache key for an operation, ordering operands of commutative commands.
+        """
+        operands = (repr(num1), repr(num2))
+        if getattr(command, "commutative", False):
+            operands = tuple(sorted(operands))
+        return (command.operation_name, *operands)
+
+    def execute(self, command, num1, num2):
+        """
+        Returns the cached result for the operation, computing and storing it on a miss.
+
+        Exceptions raised by the command propagate and are not cached.
+        """
+        key = self.key(command, num1, num2)
+        result = self.lookup(key)
+        if result is None:
+            result = command.execute(num1, num2)
+            self.store(key, result)
+        return result
+
+    def lookup(self, key: tuple):
+        """
+        Returns the cached result for a key, or None on a miss.
+        """
+        if key in self._entries:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return self._entries[key]
+        self.misses += 1
+        return None
+
+    def store(self, key: tuple, result):
+        """
+        Caches a result, evicting the least recently used entry when full.
+        """
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        """
+        Drops all cached results and resets the counters.
+        """
+        self._entries.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict:
+        """
+        Returns the cache size, capacity and hit/miss/eviction counters.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+_default_cache = None
+_configured = False
+
+def get_result_cache():
+    """
+    Returns the shared result cache, or None when caching is disabled.
+
+    The cache is enabled by setting RESULT_CACHE_SIZE to a positive size.
+    """
+    global _default_cache, _configured  # pylint: disable=global-statement
+    if not _configured:
+        size = int(os.getenv("RESULT_CACHE_SIZE", "0"))
+        _default_cache = ResultCache(size) if size > 0 else None
+        _configured = True
+    return _default_cache
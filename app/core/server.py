@@ -0,0 +1,249 @@
+"""
+Serves calculator operations over newline-delimited JSON on a TCP port or Unix socket.
+
+Each request is one JSON object per line and gets exactly one JSON response
+line, in request order, so clients may pipeline requests:
+
+- ``{"op": "add", "a": "1", "b": "2"}`` returns ``{"result": "3"}`` or ``{"error": "..."}``.
+- ``{"op": "add", "batch": [["1", "2"], ["3", "4"]]}`` evaluates many pairs and
+  returns ``{"results": [...], "errors": [...]}`` with null where not applicable.
+- ``{"cmd": "stats"}`` returns request counts and latency percentiles.
+
+An optional ``"id"`` is echoed back and an optional ``"mode"`` ('decimal' or
+'float') overrides the numeric mode. Single operations run on the event loop.
+Batches run in an executor. By default this is a process pool, so batches do
+not hold the GIL of the process serving requests. Every history update happens
+on the event-loop thread, so ``Calculations`` is never mutated concurrently.
+"""
+
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import signal
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from decimal import InvalidOperation
+from app.core.batch_runner import process_chunk
+from app.core.calculation import Calculation
+from app.core.calculations import Calculations
+from app.core.numeric_mode import parse_number
+from app.core.result_cache import get_result_cache
+
+DEFAULT_ADDRESS = "127.0.0.1:8765"
+MAX_LINE_BYTES = 16 * 1024 * 1024
+MAX_PIPELINE = 1024
+
+class LatencyTracker:
+    """
+    Keeps the most recent request latencies and reports their percentiles.
+    """
+
+    def __init__(self, window: int = 100_000):
+        """
+        :param window: Number of most recent latencies kept for the percentiles.
+        """
+        self._latencies = deque(maxlen=window)
+        self.requests = 0
+
+    def record(self, seconds: float):
+        """
+        Adds the latency of one completed request.
+        """
+        self._latencies.append(seconds)
+        self.requests += 1
+
+    def percentiles(self, points=(50, 90, 99)) -> dict:
+        """
+        Returns nearest-rank latency percentiles in milliseconds, plus the maximum.
+        """
+        ordered = sorted(self._latencies)
+        if not ordered:
+            return {}
+        report = {f"p{point}": ordered[min(len(ordered) - 1, max(0, -(-point * len(ordered) // 100) - 1))] * 1e3
+                  for point in points}
+        report["max"] = ordered[-1] * 1e3
+        return report
+
+def parse_address(address: str) -> tuple:
+    """
+    Splits 'host:port' or 'unix:/path/to/socket' into ('tcp', host, port) or ('unix', path).
+    """
+    if address.startswith("unix:"):
+        return ("unix", address[len("unix:"):])
+    host, _, port = address.rpartition(":")
+    return ("tcp", host or "127.0.0.1", int(port))
+
+class CalculatorServer:
+    """
+    Asyncio JSONL server that dispatches requests through a plugin registry.
+    """
+
+    def __init__(self, command_registry, executor=None):
+        """
+        :param command_registry: Mapping of operation name to Command instance.
+        :param executor: Executor for batch requests; defaults to a process pool created on first use.
+        """
+        self.registry = command_registry
+        self.latency = LatencyTracker()
+        self.connections = 0
+        self._executor = executor
+        self._server = None
+
+    async def start(self, address: str = DEFAULT_ADDRESS):
+        """
+        Starts listening on the address and returns the asyncio server.
+        """
+        kind, *target = parse_address(address)
+        if kind == "unix":
+            if os.path.exists(target[0]):
+                os.remove(target[0])
+            self._server = await asyncio.start_unix_server(self._serve_connection, target[0], limit=MAX_LINE_BYTES)
+        else:
+            self._server = await asyncio.start_server(self._serve_connection, *target, limit=MAX_LINE_BYTES)
+        return self._server
+
+    async def close(self):
+        """
+        Stops accepting connections and shuts the batch executor down.
+        """
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+
+    async def _serve_connection(self, reader, writer):
+        """
+        Reads pipelined requests from one connection and writes the responses in order.
+        """
+        self.connections += 1
+        pending = asyncio.Queue(MAX_PIPELINE)
+        responder = asyncio.create_task(self._write_responses(pending, writer))
+        try:
+            while line := await reader.readline():
+                if line.strip():
+                    await pending.put(asyncio.ensure_future(self._timed(line)))
+            await pending.put(None)
+            await responder
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError) as error:
+            logging.warning("Connection dropped: %s", error)
+            responder.cancel()
+        finally:
+            self.connections -= 1
+
+    async def _write_responses(self, pending: asyncio.Queue, writer):
+        """
+        Writes each response as soon as it and every earlier one are ready.
+        """
+        try:
+            while (task := await pending.get()) is not None:
+                writer.write(json.dumps(await task).encode() + b"\n")
+                if pending.empty():
+                    await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _timed(self, line: bytes) -> dict:
+        """
+        Handles one request line and records its latency.
+        """
+        start = time.perf_counter()
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("request must be a JSON object")
+        except ValueError as error:
+            return {"error": f"Invalid request: {error}"}
+        try:
+            response = await self.handle(request)
+        except Exception as error:  # pylint: disable=broad-except
+            logging.error("Request failed: %s", error)
+            response = {"error": f"An error occurred: {error}"}
+        if "id" in request:
+            response["id"] = request["id"]
+        self.latency.record(time.perf_counter() - start)
+        return response
+
+    async def handle(self, request: dict) -> dict:
+        """
+        Evaluates one decoded request and returns its response object.
+        """
+        if request.get("cmd") == "stats":
+            return {"requests": self.latency.requests, "connections": self.connections,
+                    "latency_ms": self.latency.percentiles()}
+        operation, mode = request.get("op"), request.get("mode")
+        if operation not in self.registry:
+            return {"error": f"Invalid operation: {operation}"}
+        if "batch" in request:
+            return await self._handle_batch(operation, request["batch"], mode)
+        return self._handle_single(operation, request.get("a"), request.get("b"), mode)
+
+    def _handle_single(self, operation: str, num1, num2, mode: str) -> dict:
+        """
+        Evaluates one operation on the event loop and records it in the history.
+        """
+        try:
+            operand1, operand2 = parse_number(str(num1), mode), parse_number(str(num2), mode)
+        except InvalidOperation:
+            return {"error": f"Invalid numbers: {num1}, {num2}"}
+        except ValueError as error:
+            return {"error": str(error)}
+        command = self.registry.get(operation)
+        if command is None:
+            return {"error": f"Invalid operation: {operation}"}
+        cache = get_result_cache()
+        try:
+            result = cache.execute(command, operand1, operand2) if cache else command.execute(operand1, operand2)
+        except ArithmeticError as error:
+            return {"error": str(error) or type(error).__name__}
+        Calculations.add_calculation(Calculation(operand1, operand2, command, result))
+        return {"result": str(result)}
+
+    async def _handle_batch(self, operation: str, pairs, mode: str) -> dict:
+        """
+        Evaluates many operand pairs in the executor, then records them on the event loop.
+        """
+        try:
+            chunk = [(operation, str(num1), str(num2)) for num1, num2 in pairs]
+        except (TypeError, ValueError):
+            return {"error": "Invalid batch: expected a list of [a, b] pairs"}
+        if self._executor is None:
+            # Spawned (not forked) workers do not inherit the listening socket
+            self._executor = ProcessPoolExecutor(mp_context=multiprocessing.get_context("spawn"))
+        try:
+            output, records = await asyncio.get_running_loop().run_in_executor(
+                self._executor, process_chunk, chunk, self.registry, mode)
+        except ValueError as error:
+            return {"error": str(error)}
+        if records:
+            Calculations.add_calculations(*zip(*records))
+        return {"results": [row[3] or None for row in output], "errors": [row[4] or None for row in output]}
+
+async def serve(command_registry, address: str = DEFAULT_ADDRESS, ready=None):
+    """
+    Runs the server until cancelled or sent SIGTERM, then logs the latency percentiles.
+
+    :param command_registry: Mapping of operation name to Command instance.
+    :param address: 'host:port' or 'unix:/path/to/socket'.
+    :param ready: Optional callback invoked with the asyncio server once listening.
+    """
+    server = CalculatorServer(command_registry)
+    listener = await server.start(address)
+    try:
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+    except (NotImplementedError, RuntimeError):
+        pass  # No signal handlers on this platform or outside the main thread
+    if ready is not None:
+        ready(listener)
+    try:
+        await listener.serve_forever()
+    except asyncio.CancelledError:
+        pass
+    finally:
+        await server.close()
+        logging.info("Served %d requests; latency (ms): %s", server.latency.requests, server.latency.percentiles())
@@ -0,0 +1,243 @@
+"""
+Computes mean, median and mode over any number of values in a single pass over an iterable.
+
+Every function consumes its input lazily, so values can come from a
+generator such as ``iter_values`` reading a file. Mean keeps only a running
+sum and count, and mode keeps one counter per distinct value. Median keeps
+the values seen so far in two heaps (the lower half as a max-heap, the upper
+half as a min-heap), so each value costs O(log n) and no full sort is done.
+
+``RunningAggregate`` keeps count, sum, min, max, mean and variance of a
+changing collection up to date as values are added and removed.
+"""
+
+import csv
+import heapq
+from collections import Counter
+from decimal import Decimal
+from typing import Iterable, Iterator
+from app.core.numeric_mode import parse_number
+
+def _require_values(count: int):
+    """
+    Raises ValueError when no value was supplied.
+    """
+    if count == 0:
+        raise ValueError("At least one value is required.")
+
+def streaming_mean(values: Iterable[Decimal]) -> Decimal:
+    """
+    Returns the arithmetic mean of the values in one streaming pass.
+
+    :param values: Iterable of numbers; consumed once.
+    :raises ValueError: If the iterable is empty.
+    """
+    total, count = 0, 0
+    for value in values:
+        total += value
+        count += 1
+    _require_values(count)
+    return total / count
+
+class RunningMedian:
+    """
+    Maintains the median of the values pushed so far using two balanced heaps.
+    """
+
+    def __init__(self):
+        self._lower = []  # max-heap of the smaller half, stored negated
+        self._upper = []  # min-heap of the larger half
+
+    def __len__(self) -> int:
+        return len(self._lower) + len(self._upper)
+
+    def push(self, value):
+        """
+        Adds a value, keeping the lower half the same size as the upper half or one larger.
+        """
+        if not self._lower or value <= -self._lower[0]:
+            heapq.heappush(self._lower, -value)
+        else:
+            heapq.heappush(self._upper, value)
+        if len(self._lower) > len(self._upper) + 1:
+            heapq.heappush(self._upper, -heapq.heappop(self._lower))
+        elif len(self._upper) > len(self._lower):
+            heapq.heappush(self._lower, -heapq.heappop(self._upper))
+
+    def median(self):
+        """
+        Returns the current median; the mean of the two middle values for an even count.
+
+        :raises ValueError: If no value has been pushed.
+        """
+        _require_values(len(self))
+        if len(self._lower) > len(self._upper):
+            return -self._lower[0]
+        return (-self._lower[0] + self._upper[0]) / 2
+
+def streaming_median(values: Iterable[Decimal]) -> Decimal:
+    """
+    Returns the median of the values without sorting them.
+
+    :param values: Iterable of numbers; consumed once.
+    :raises ValueError: If the iterable is empty.
+    """
+    running = RunningMedian()
+    for value in values:
+        running.push(value)
+    return running.median()
+
+def streaming_mode(values: Iterable[Decimal]) -> Decimal:
+    """
+    Returns the most frequent value, counting occurrences in a hash table.
+
+    Ties are broken by returning the smallest of the most frequent values,
+    matching the two-operand ``mode`` command.
+
+    :param values: Iterable of numbers; consumed once.
+    :raises ValueError: If the iterable is empty.
+    """
+    counts = Counter(values)
+    _require_values(len(counts))
+    highest = max(counts.values())
+    return min(value for value, count in counts.items() if count == highest)
+
+def as_decimal(value):
+    """
+    Returns a number as a Decimal (floats through their shortest repr), or None for missing values.
+
+    NaN and infinities count as missing: they cannot be ordered or aggregated.
+    """
+    if value is None:
+        return None
+    if not isinstance(value, Decimal):
+        value = Decimal(repr(value)) if isinstance(value, float) else Decimal(str(value))
+    return value if value.is_finite() else None
+
+class RunningAggregate:
+    """
+    Count, sum, min, max, mean and variance of a collection of values, updated with Welford's method.
+
+    Adding or removing a value is O(1). Removing the current minimum or
+    maximum marks the extremes as stale; the owner then supplies the
+    remaining values to ``refresh_extremes``.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.total = Decimal(0)
+        self.mean = Decimal(0)
+        self.m2 = Decimal(0)
+        self.minimum = None
+        self.maximum = None
+        self.stale = False
+
+    @classmethod
+    def from_values(cls, values: list) -> "RunningAggregate":
+        """
+        Builds an aggregate from a sequence of values in bulk, as two passes instead of per-value updates.
+        """
+        aggregate = cls()
+        if values:
+            aggregate.count = len(values)
+            aggregate.total = sum(values, Decimal(0))
+            aggregate.mean = aggregate.total / aggregate.count
+            aggregate.m2 = sum(((value - aggregate.mean) ** 2 for value in values), Decimal(0))
+            aggregate.minimum, aggregate.maximum = min(values), max(values)
+        return aggregate
+
+    def add(self, value: Decimal):
+        """
+        Includes a value in the aggregate.
+        """
+        self.count += 1
+        self.total += value
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        if not self.stale:
+            self.minimum = value if self.minimum is None else min(self.minimum, value)
+            self.maximum = value if self.maximum is None else max(self.maximum, value)
+
+    def merge(self, other: "RunningAggregate"):
+        """
+        Includes every value of another aggregate, combining the two with Chan's parallel update.
+        """
+        if not other.count:
+            return
+        if not self.count:
+            self.__dict__.update(other.__dict__)
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.mean += delta * other.count / count
+        self.total += other.total
+        self.count = count
+        self.stale = self.stale or other.stale
+        if not self.stale:
+            self.minimum = min(self.minimum, other.minimum)
+            self.maximum = max(self.maximum, other.maximum)
+
+    def remove(self, value: Decimal):
+        """
+        Excludes a previously added value from the aggregate by reversing its Welford update.
+        """
+        if self.count <= 1:
+            self.__init__()
+            return
+        self.count -= 1
+        self.total -= value
+        delta = value - self.mean
+        self.mean -= delta / self.count
+        self.m2 = max(self.m2 - delta * (value - self.mean), Decimal(0))
+        if value in (self.minimum, self.maximum):
+            self.stale = True
+
+    def refresh_extremes(self, values: Iterable[Decimal]):
+        """
+        Recomputes the minimum and maximum from the values currently in the aggregate.
+        """
+        self.minimum = self.maximum = None
+        for value in values:
+            self.minimum = value if self.minimum is None else min(self.minimum, value)
+            self.maximum = value if self.maximum is None else max(self.maximum, value)
+        self.stale = False
+
+    def as_dict(self) -> dict:
+        """
+        Returns the aggregate as a dictionary; variance is the sample variance (None below two values).
+        """
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "min": self.minimum,
+            "max": self.maximum,
+            "mean": self.mean,
+            "variance": self.m2 / (self.count - 1) if self.count > 1 else None,
+        }
+
+def iter_values(filepath: str, column: str = None, numeric_mode: str = None) -> Iterator[Decimal]:
+    """
+    Lazily reads numbers from a file, as Decimal or float according to the numeric mode.
+
+    :param filepath: Path of the file to read.
+    :param column: Name of a CSV column to read (the file must have a header
+                   row). Without it, every comma- or whitespace-separated
+                   token on every line is read as a value.
+    :param numeric_mode: 'decimal' or 'float'; defaults to the session mode.
+    :raises decimal.InvalidOperation: On a value that is not a number.
+    :raises KeyError: If the column is not in the CSV header.
+    """
+    with open(filepath, newline="", encoding="utf-8") as handle:
+        if column is not None:
+            reader = csv.DictReader(handle)
+            if column not in (reader.fieldnames or []):
+                raise KeyError(column)
+            for row in reader:
+                if row[column].strip():
+                    yield parse_number(row[column], numeric_mode)
+        else:
+            for line in handle:
+                for token in line.replace(",", " ").split():
+                    yield parse_number(token, numeric_mode)
@@ -0,0 +1,238 @@
+"""
+Provides a persistent pool of worker processes for the multiprocessing ('mp') execution mode.
+
+Starting a process per operation costs far more than the arithmetic itself,
+so the pool is started once, on the first 'mp' request, and reused until
+``shutdown_worker_pool`` is called.
+
+Single operations travel through the pool's pipes, pickled. Large float64
+batches use ``execute_batch_shared`` instead: the operands and results live
+in one ``multiprocessing.shared_memory`` block, each worker evaluates a slice
+of it in place, and only (block name, row range) messages cross the pipes.
+"""
+
+import os
+import threading
+import time
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from app.core.command import BatchResult
+
+# Bytes per row of a shared block: two float64 operands, a float64 result and a bool mask
+SHARED_ROW_BYTES = 8 + 8 + 8 + 1
+
+class _ResultSink:
+    """
+    Queue stand-in that collects what a plugin puts from execute_multiprocessing.
+    """
+
+    def __init__(self):
+        self.items = []
+
+    def put(self, item):
+        """
+        Stores an item produced by the plugin.
+        """
+        self.items.append(item)
+
+def _run_command(command, num1, num2):
+    """
+    Runs a command inside a worker process.
+
+    :return: Tuple of the worker pid, busy seconds and the items the command produced.
+    """
+    start = time.perf_counter()
+    sink = _ResultSink()
+    try:
+        command.execute_multiprocessing(num1, num2, sink)
+    except Exception as error:  # pylint: disable=broad-except
+        sink.put(error)
+    return os.getpid(), time.perf_counter() - start, sink.items
+
+def _shared_views(buffer, rows: int) -> tuple:
+    """
+    Returns the (nums1, nums2, results, mask) NumPy views over a shared block of ``rows`` rows.
+    """
+    import numpy as np  # pylint: disable=import-outside-toplevel
+    return (np.ndarray((rows,), np.float64, buffer, 0),
+            np.ndarray((rows,), np.float64, buffer, 8 * rows),
+            np.ndarray((rows,), np.float64, buffer, 16 * rows),
+            np.ndarray((rows,), np.bool_, buffer, 24 * rows))
+
+def _run_shared_slice(command, name: str, rows: int, start: int, stop: int):
+    """
+    Evaluates rows [start, stop) of a shared block inside a worker process.
+
+    The operands are read through views of the shared buffer and the results
+    and mask are written straight back into it.
+
+    :return: Tuple of the worker pid and busy seconds.
+    """
+    from multiprocessing import shared_memory  # pylint: disable=import-outside-toplevel
+    began = time.perf_counter()
+    block = shared_memory.SharedMemory(name=name)
+    views = _shared_views(block.buf, rows)
+    try:
+        batch = command.execute_batch(views[0][start:stop], views[1][start:stop])
+        views[2][start:stop] = batch.values
+        views[3][start:stop] = batch.mask
+    finally:
+        views = batch = None  # the block cannot be closed while views of it exist
+        block.close()
+    return os.getpid(), time.perf_counter() - began
+
+class WorkerPool:
+    """
+    Lazily started, reusable pool of worker processes with per-worker usage statistics.
+    """
+
+    def __init__(self, size: int = None):
+        """
+        Creates the pool object without starting any process.
+
+        :param size: Number of worker processes; defaults to the CPU count.
+        """
+        self.size = size or os.cpu_count() or 1
+        self._pool = None
+        self._started_at = None
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    @property
+    def started(self) -> bool:
+        """
+        Whether the worker processes are running.
+        """
+        return self._pool is not None
+
+    def _ensure_started(self):
+        """
+        Starts the worker processes on first use.
+        """
+        with self._lock:
+            if self._pool is None:
+                import multiprocessing  # pylint: disable=import-outside-toplevel
+                if os.name == "posix":
+                    # Workers must share the parent's resource tracker; with their own, a tracker
+                    # would "clean up" shared blocks the workers only attached to
+                    from multiprocessing import resource_tracker  # pylint: disable=import-outside-toplevel
+                    resource_tracker.ensure_running()
+                self._pool = multiprocessing.Pool(self.size)
+                self._started_at = time.perf_counter()
+                self._stats = {}
+
+    def submit(self, command, num1, num2):
+        """
+        Executes a command on a warm worker and waits for its result.
+
+        :param command: Command instance to run; must be picklable.
+        :param num1: First operand.
+        :param num2: Second operand.
+        :return: The value the command put on its result queue (an exception
+                 instance for handled errors), or None if it produced nothing.
+        """
+        self._ensure_started()
+        pid, busy, items = self._pool.apply(_run_command, (command, num1, num2))
+        self._record(pid, busy)
+        return items[0] if items else None
+
+    def execute_batch_shared(self, command, nums1, nums2, slices: int = None) -> "BatchResult":
+        """
+        Evaluates a float64 batch across the workers through a shared-memory block.
+
+        The operands are copied into the block once; each worker runs the
+        command's ``execute_batch`` on its slice and writes the results and
+        mask in place, so no array is pickled in either direction.
+
+        :param command: Command instance to run; must be picklable.
+        :param nums1: First operands, convertible to float64.
+        :param nums2: Second operands, convertible to float64.
+        :param slices: Number of slices to split the rows into; defaults to the pool size.
+        :return: BatchResult with NaN in the masked slots.
+        :raises ValueError: If the operands are not one-dimensional, of equal length and numeric.
+        """
+        import numpy as np  # pylint: disable=import-outside-toplevel
+        from multiprocessing import shared_memory  # pylint: disable=import-outside-toplevel
+        from app.core.command import BatchResult  # pylint: disable=import-outside-toplevel,redefined-outer-name
+        try:
+            operands1, operands2 = np.asarray(nums1, dtype=np.float64), np.asarray(nums2, dtype=np.float64)
+        except TypeError as error:
+            raise ValueError("The shared-memory transport needs float64 operands.") from error
+        if operands1.ndim != 1 or operands1.shape != operands2.shape:
+            raise ValueError("Operand arrays must be one-dimensional and of equal length.")
+        rows = len(operands1)
+        if not rows:
+            return BatchResult(np.empty(0), np.zeros(0, dtype=bool))
+
+        self._ensure_started()
+        block = shared_memory.SharedMemory(create=True, size=rows * SHARED_ROW_BYTES)
+        views = _shared_views(block.buf, rows)
+        try:
+            views[0][:] = operands1
+            views[1][:] = operands2
+            bounds = np.linspace(0, rows, min(rows, slices or self.size) + 1).astype(int)
+            tasks = [(command, block.name, rows, int(start), int(stop)) for start, stop in zip(bounds, bounds[1:])]
+            for pid, busy in self._pool.starmap(_run_shared_slice, tasks):
+                self._record(pid, busy)
+            result = BatchResult(views[2].copy(), views[3].copy())
+        finally:
+            views = None  # the block cannot be closed while views of it exist
+            block.close()
+            block.unlink()
+        return result
+
+    def _record(self, pid: int, busy: float):
+        """
+        Adds one completed task to a worker's usage statistics.
+        """
+        with self._lock:
+            tasks, total_busy = self._stats.get(pid, (0, 0.0))
+            self._stats[pid] = (tasks + 1, total_busy + busy)
+
+    def utilisation(self) -> dict:
+        """
+        Reports how busy each worker has been since the pool started.
+
+        :return: Mapping of worker pid to its task count, busy seconds and
+                 busy fraction of the pool's wall-clock lifetime.
+        """
+        if not self.started:
+            return {}
+        elapsed = time.perf_counter() - self._started_at
+        with self._lock:
+            return {
+                pid: {"tasks": tasks, "busy_seconds": busy, "utilisation": busy / elapsed if elapsed else 0.0}
+                for pid, (tasks, busy) in self._stats.items()
+            }
+
+    def shutdown(self):
+        """
+        Stops the worker processes; the pool restarts lazily if used again.
+        """
+        with self._lock:
+            if self._pool is not None:
+                self._pool.close()
+                self._pool.join()
+                self._pool = None
+
+_default_pool = None
+
+def get_worker_pool(size: int = None) -> WorkerPool:
+    """
+    Returns the shared worker pool, creating it (but not its processes) on first call.
+
+    :param size: Worker count used when the pool is created; falls back to
+                 the MP_POOL_SIZE environment variable, then the CPU count.
+    """
+    global _default_pool  # pylint: disable=global-statement
+    if _default_pool is None:
+        _default_pool = WorkerPool(size or int(os.getenv("MP_POOL_SIZE", "0")) or None)
+    return _default_pool
+
+def shutdown_worker_pool():
+    """
+    Shuts down the shared worker pool if it was ever started.
+    """
+    if _default_pool is not None:
+        _default_pool.shutdown()
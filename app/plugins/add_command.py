@@ -4,14 +4,15 @@ This module defines the `AddCommand` class for performing addition operations.
 """
 
 from decimal import Decimal
-from app.core.command import Command
+from app.core.command import Command, BatchResult, as_operand_arrays, unmasked
 
 class AddCommand(Command):
     """
     Command class for performing addition operations.
-    Implements the `execute` and `execute_multiprocessing` methods.
+    Implements the `execute`, `execute_multiprocessing` and `execute_batch` methods.
     """
     operation_name = "add"
+    commutative = True
 
     def execute(self, num1: Decimal, num2: Decimal) -> Decimal:
         """
@@ -37,4 +38,22 @@ class AddCommand(Command):
             result_queue (multiprocessing.Queue): Queue to store the result.
         """
         result = self.execute(num1, num2)
-        result_queue.put(result)
\ No newline at end of file
+        result_queue.put(result)
+
+    def execute_batch(self, nums1, nums2) -> BatchResult:
+        """
+        Adds two operand arrays element-wise.
+
+        Args:
+            nums1 (numpy.ndarray | Sequence[Decimal]): The first operands.
+            nums2 (numpy.ndarray | Sequence[Decimal]): The second operands.
+
+        Returns:
+            BatchResult: Element-wise sums; pairs raising an
+            ArithmeticError (e.g. Decimal overflow) are flagged in the mask.
+        """
+        operands1, operands2 = as_operand_arrays(nums1, nums2)
+        try:
+            return unmasked(operands1 + operands2)
+        except ArithmeticError:
+            return super().execute_batch(operands1, operands2)  # per pair, masking only the failing ones
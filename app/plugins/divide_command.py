@@ -4,12 +4,12 @@ This module defines the `DivideCommand` class for performing division operations
 """
 
 from decimal import Decimal, DivisionByZero
-from app.core.command import Command
+from app.core.command import Command, BatchResult, as_operand_arrays, fill_masked
 
 class DivideCommand(Command):
     """
     Command class for performing division operations.
-    Implements the `execute` and `execute_multiprocessing` methods.
+    Implements the `execute`, `execute_multiprocessing` and `execute_batch` methods.
     """
     operation_name = "divide"
 
@@ -45,4 +45,26 @@ class DivideCommand(Command):
             result = self.execute(num1, num2)
             result_queue.put(result)
         except DivisionByZero as e:
-            result_queue.put(e)
\ No newline at end of file
+            result_queue.put(e)
+
+    def execute_batch(self, nums1, nums2) -> BatchResult:
+        """
+        Divides two operand arrays element-wise in one vectorized pass.
+
+        Args:
+            nums1 (numpy.ndarray | Sequence[Decimal]): The numerators.
+            nums2 (numpy.ndarray | Sequence[Decimal]): The denominators.
+
+        Returns:
+            BatchResult: Element-wise quotients. Pairs with a zero denominator
+            are flagged in the mask instead of raising DivisionByZero, as are
+            pairs raising any other ArithmeticError (e.g. Decimal overflow).
+        """
+        import numpy as np  # pylint: disable=import-outside-toplevel
+        operands1, operands2 = as_operand_arrays(nums1, nums2)
+        mask = np.asarray(operands2 == 0, dtype=bool)
+        divisors = np.where(mask, 1, operands2) if mask.any() else operands2
+        try:
+            return fill_masked(operands1 / divisors, mask)
+        except ArithmeticError:
+            return super().execute_batch(operands1, operands2)  # per pair, masking only the failing ones
@@ -1,16 +1,20 @@
 """
-This module defines the `MeanCommand` class for calculating the mean of two numbers.
+This module defines the `MeanCommand` class for calculating the mean of two numbers,
+or of any number of values streamed from an iterable.
 """
 
 from decimal import Decimal
-from app.core.command import Command
+from typing import Iterable
+from app.core.command import Command, BatchResult, as_operand_arrays, unmasked
+from app.core.statistics import streaming_mean
 
 class MeanCommand(Command):
     """
-    Command class for calculating the mean (average) of two numbers.
+    Command class for calculating the mean (average) of two or more numbers.
     """
 
     operation_name = "mean"
+    commutative = True
 
     def execute(self, num1: Decimal, num2: Decimal) -> Decimal:
         """
@@ -23,7 +27,7 @@ class MeanCommand(Command):
         Returns:
             Decimal: The mean of num1 and num2.
         """
-        return (num1 + num2) / Decimal(2)
+        return (num1 + num2) / 2
 
     def execute_multiprocessing(self, num1: Decimal, num2: Decimal, result_queue):
         """
@@ -36,3 +40,36 @@ class MeanCommand(Command):
         """
         result = self.execute(num1, num2)
         result_queue.put(result)
+
+    def execute_batch(self, nums1, nums2) -> BatchResult:
+        """
+        Computes the mean of each operand pair in one vectorized pass.
+
+        Args:
+            nums1 (numpy.ndarray | Sequence[Decimal]): First numbers.
+            nums2 (numpy.ndarray | Sequence[Decimal]): Second numbers.
+
+        Returns:
+            BatchResult: Element-wise means; pairs raising an
+            ArithmeticError (e.g. Decimal overflow) are flagged in the mask.
+        """
+        operands1, operands2 = as_operand_arrays(nums1, nums2)
+        try:
+            return unmasked((operands1 + operands2) / 2)
+        except ArithmeticError:
+            return super().execute_batch(operands1, operands2)  # per pair, masking only the failing ones
+
+    def execute_many(self, values: Iterable[Decimal]) -> Decimal:
+        """
+        Computes the mean of any number of values in a single streaming pass.
+
+        Args:
+            values (Iterable[Decimal]): Values to summarise; may be a generator.
+
+        Returns:
+            Decimal: The mean of the values.
+
+        Raises:
+            ValueError: If no values are given.
+        """
+        return streaming_mean(values)
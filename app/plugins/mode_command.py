@@ -1,22 +1,27 @@
 """
-This module defines the `ModeCommand` class for finding the mode of two numbers.
+This module defines the `ModeCommand` class for finding the mode of two numbers,
+or of any number of values streamed from an iterable.
 """
 
 from decimal import Decimal
-from app.core.command import Command
+from typing import Iterable
+from app.core.command import Command, BatchResult, as_operand_arrays, unmasked
+from app.core.statistics import streaming_mode
 
 class ModeCommand(Command):
     """
-    Command class for finding the mode between two numbers.
+    Command class for finding the mode of two or more numbers.
     """
 
     operation_name = "mode"
+    commutative = True
 
     def execute(self, num1: Decimal, num2: Decimal) -> Decimal:
         """
-        Returns the mode of two numbers. 
-        If they are equal, returns that value (mode). 
-        If different, returns the smallest one (arbitrary choice).
+        Returns the mode of two numbers: the smaller one (an arbitrary choice
+        when they differ). Equal numbers written differently, such as 1.0 and
+        1.00, are told apart by their repr, so the result does not depend on
+        the operand order.
 
         Args:
             num1 (Decimal): First number.
@@ -25,11 +30,7 @@ class ModeCommand(Command):
         Returns:
             Decimal: The mode or selected number.
         """
-        if num1 == num2:
-            return num1
-        else:
-            # Mode requires frequency; here we arbitrarily return the smaller number
-            return min(num1, num2)
+        return min(num1, num2, key=lambda number: (number, repr(number)))
 
     def execute_multiprocessing(self, num1: Decimal, num2: Decimal, result_queue):
         """
@@ -42,3 +43,40 @@ class ModeCommand(Command):
         """
         result = self.execute(num1, num2)
         result_queue.put(result)
+
+    def execute_batch(self, nums1, nums2) -> BatchResult:
+        """
+        Computes the mode of each operand pair in one vectorized pass.
+
+        Args:
+            nums1 (numpy.ndarray | Sequence[Decimal]): First numbers.
+            nums2 (numpy.ndarray | Sequence[Decimal]): Second numbers.
+
+        Returns:
+            BatchResult: Element-wise modes, chosen as in ``execute``.
+        """
+        import numpy as np  # pylint: disable=import-outside-toplevel
+        operands1, operands2 = as_operand_arrays(nums1, nums2)
+        first = np.asarray(operands1 < operands2, dtype=bool)
+        ties = np.asarray(operands1 == operands2, dtype=bool)
+        if operands1.dtype == object:
+            for position in np.flatnonzero(ties):
+                first[position] = repr(operands1[position]) <= repr(operands2[position])
+        else:
+            first |= ties & np.signbit(operands1)  # -0.0 before 0.0, as its repr sorts first
+        return unmasked(np.where(first, operands1, operands2))
+
+    def execute_many(self, values: Iterable[Decimal]) -> Decimal:
+        """
+        Finds the most frequent of any number of values by hash counting.
+
+        Args:
+            values (Iterable[Decimal]): Values to summarise; may be a generator.
+
+        Returns:
+            Decimal: The mode of the values; the smallest one on ties.
+
+        Raises:
+            ValueError: If no values are given.
+        """
+        return streaming_mode(values)
@@ -4,14 +4,15 @@ This module defines the `MultiplyCommand` class for performing multiplication op
 """
 
 from decimal import Decimal
-from app.core.command import Command
+from app.core.command import Command, BatchResult, as_operand_arrays, unmasked
 
 class MultiplyCommand(Command):
     """
     Command class for performing multiplication operations.
-    Implements the `execute` and `execute_multiprocessing` methods.
+    Implements the `execute`, `execute_multiprocessing` and `execute_batch` methods.
     """
     operation_name = "multiply"
+    commutative = True
 
     def execute(self, num1: Decimal, num2: Decimal) -> Decimal:
         """
@@ -37,4 +38,22 @@ class MultiplyCommand(Command):
             result_queue (multiprocessing.Queue): Queue to store the result.
         """
         result = self.execute(num1, num2)
-        result_queue.put(result)
\ No newline at end of file
+        result_queue.put(result)
+
+    def execute_batch(self, nums1, nums2) -> BatchResult:
+        """
+        Multiplies two operand arrays element-wise.
+
+        Args:
+            nums1 (numpy.ndarray | Sequence[Decimal]): The first operands.
+            nums2 (numpy.ndarray | Sequence[Decimal]): The second operands.
+
+        Returns:
+            BatchResult: Element-wise products; pairs raising an
+            ArithmeticError (e.g. Decimal overflow) are flagged in the mask.
+        """
+        operands1, operands2 = as_operand_arrays(nums1, nums2)
+        try:
+            return unmasked(operands1 * operands2)
+        except ArithmeticError:
+            return super().execute_batch(operands1, operands2)  # per pair, masking only the failing ones
@@ -4,12 +4,12 @@ This module defines the `SubtractCommand` class for performing subtraction opera
 """
 
 from decimal import Decimal
-from app.core.command import Command
+from app.core.command import Command, BatchResult, as_operand_arrays, unmasked
 
 class SubtractCommand(Command):
     """
     Command class for performing subtraction operations.
-    Implements the `execute` and `execute_multiprocessing` methods.
+    Implements the `execute`, `execute_multiprocessing` and `execute_batch` methods.
     """
     operation_name = "subtract"
 
@@ -37,4 +37,22 @@ class SubtractCommand(Command):
             result_queue (multiprocessing.Queue): Queue to store the result.
         """
         result = self.execute(num1, num2)
-        result_queue.put(result)
\ No newline at end of file
+        result_queue.put(result)
+
+    def execute_batch(self, nums1, nums2) -> BatchResult:
+        """
+        Subtracts the second operand array from the first element-wise.
+
+        Args:
+            nums1 (numpy.ndarray | Sequence[Decimal]): The first operands.
+            nums2 (numpy.ndarray | Sequence[Decimal]): The second operands.
+
+        Returns:
+            BatchResult: Element-wise differences; pairs raising an
+            ArithmeticError (e.g. Decimal overflow) are flagged in the mask.
+        """
+        operands1, operands2 = as_operand_arrays(nums1, nums2)
+        try:
+            return unmasked(operands1 - operands2)
+        except ArithmeticError:
+            return super().execute_batch(operands1, operands2)  # per pair, masking only the failing ones
@@ -0,0 +1,274 @@
+"""
+Reads and writes calculation history files, choosing the format by file extension.
+
+- ``.csv`` (and any unrecognised extension): plain text through ``pd.read_csv``/``to_csv``.
+- ``.npz``: uncompressed NumPy archive with one array per column. Loading
+  memory-maps each member straight out of the archive.
+- ``.feather`` / ``.parquet``: Arrow columnar files, available when pyarrow
+  is installed and read with memory mapping.
+
+In the binary formats the operation column is dictionary-encoded and
+Decimal columns are stored as their exact string representation (bytes
+arrays in ``.npz``, string columns in Arrow); native float or integer
+columns are stored as-is. An object column that also holds missing values
+or floats gets a ``<column>.kinds`` companion of one code per value, so
+those come back as None and float instead of Decimal.
+
+``iter_frames`` reads any of the formats as a sequence of bounded chunks
+(``read_csv`` chunks, slices of the memory-mapped ``.npz`` members, Arrow
+record batches), so a caller can filter a file larger than it wants resident.
+"""
+
+import os
+import struct
+import zipfile
+from decimal import Decimal
+import numpy as np
+import pandas as pd
+
+BINARY_FORMATS = (".npz", ".feather", ".parquet")
+
+_ZIP_LOCAL_HEADER_SIZE = 30
+
+# Codes of the ``<column>.kinds`` companion arrays
+_DECIMAL, _MISSING, _FLOAT = 0, 1, 2
+_PARSERS = {_DECIMAL: Decimal, _MISSING: lambda _: None, _FLOAT: float}
+
+def file_format(filepath: str) -> str:
+    """
+    Returns the binary format selected by the file extension, or ".csv" for any other extension.
+    """
+    extension = os.path.splitext(filepath)[1].lower()
+    return extension if extension in BINARY_FORMATS else ".csv"
+
+def save_frame(frame: pd.DataFrame, filepath: str):
+    """
+    Writes a history DataFrame in the format selected by the file extension.
+
+    :param frame: History with operation, num1, num2 and result columns.
+    :param filepath: Destination path.
+    """
+    extension = file_format(filepath)
+    if extension == ".csv":
+        frame.to_csv(filepath, index=False)
+    elif extension == ".npz":
+        _save_npz(frame, filepath)
+    else:
+        _save_arrow(frame, filepath, extension)
+
+def load_frame(filepath: str) -> pd.DataFrame:
+    """
+    Reads a history DataFrame in the format selected by the file extension.
+
+    :param filepath: Path of the history file.
+    :return: DataFrame with Decimal values restored for exactly stored columns.
+    """
+    extension = file_format(filepath)
+    if extension == ".csv":
+        return pd.read_csv(filepath)
+    if extension == ".npz":
+        return _load_npz(filepath)
+    return _load_arrow(filepath, extension)
+
+def iter_frames(filepath: str, chunk_size: int):
+    """
+    Lazily reads a history file as DataFrames of at most ``chunk_size`` rows.
+
+    :param filepath: Path of the history file.
+    :param chunk_size: Maximum number of rows per yielded DataFrame.
+    :raises ValueError: If chunk_size is not positive.
+    """
+    if chunk_size <= 0:
+        raise ValueError("Chunk size must be positive.")
+    extension = file_format(filepath)
+    if extension == ".csv":
+        with pd.read_csv(filepath, chunksize=chunk_size) as reader:
+            yield from reader
+    elif extension == ".npz":
+        arrays = _npz_arrays(filepath)
+        rows = len(arrays["operation.codes"])
+        for start in range(0, rows, chunk_size):
+            yield _npz_frame(arrays, start, min(start + chunk_size, rows))
+    else:
+        pa = _import_pyarrow()
+        if extension == ".feather":
+            import pyarrow.feather as feather  # pylint: disable=import-outside-toplevel
+            batches = feather.read_table(filepath, memory_map=True).to_batches(max_chunksize=chunk_size)
+        else:
+            import pyarrow.parquet as parquet  # pylint: disable=import-outside-toplevel
+            batches = parquet.ParquetFile(filepath, memory_map=True).iter_batches(batch_size=chunk_size)
+        for batch in batches:
+            yield _arrow_frame(pa, batch)
+
+def _object_strings(column: pd.Series) -> tuple:
+    """
+    Returns the exact string form of every value in an object column, and their kinds.
+
+    Missing values are written as an empty string and floats through their
+    repr. The kinds are None when every value is a Decimal (or other number
+    read back as one).
+    """
+    strings, kinds = [], []
+    for value in column:
+        if value is None:
+            strings.append("")
+            kinds.append(_MISSING)
+        elif isinstance(value, float):
+            strings.append(repr(float(value)))
+            kinds.append(_FLOAT)
+        else:
+            strings.append(str(value))
+            kinds.append(_DECIMAL)
+    if all(kind == _DECIMAL for kind in kinds):
+        return strings, None
+    return strings, np.asarray(kinds, dtype=np.uint8)
+
+def _from_strings(strings, kinds=None) -> np.ndarray:
+    """
+    Parses exact string values back into an object array of Decimal, or of the given kinds.
+    """
+    if kinds is None:
+        return np.fromiter(map(Decimal, strings), dtype=object, count=len(strings))
+    return np.fromiter((_PARSERS[kind](text) for text, kind in zip(strings, kinds.tolist())),
+                       dtype=object, count=len(strings))
+
+def _save_npz(frame: pd.DataFrame, filepath: str):
+    """
+    Stores each column as its own array inside an uncompressed .npz archive.
+    """
+    operations = pd.Categorical(frame["operation"])
+    arrays = {
+        "operation.categories": np.asarray(operations.categories, dtype=str),
+        "operation.codes": operations.codes,
+    }
+    for column in frame.columns.drop("operation"):
+        series = frame[column]
+        if series.dtype.kind in "fiu":
+            arrays[column] = series.to_numpy()
+        else:
+            strings, kinds = _object_strings(series)
+            arrays[column] = np.array(strings, dtype="S")
+            if kinds is not None:
+                arrays[f"{column}.kinds"] = kinds
+    np.savez(filepath, **arrays)
+
+def _map_member(filepath: str, info: zipfile.ZipInfo) -> np.ndarray:
+    """
+    Memory-maps one stored (uncompressed) .npy member of a zip archive.
+    """
+    with open(filepath, "rb") as handle:
+        handle.seek(info.header_offset)
+        header = handle.read(_ZIP_LOCAL_HEADER_SIZE)
+        name_length, extra_length = struct.unpack("<HH", header[26:30])
+        handle.seek(info.header_offset + _ZIP_LOCAL_HEADER_SIZE + name_length + extra_length)
+        version = np.lib.format.read_magic(handle)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(handle)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(handle)
+        offset = handle.tell()
+    if dtype.hasobject or 0 in shape:
+        return np.empty(shape, dtype=dtype)
+    return np.memmap(filepath, dtype=dtype, mode="r", offset=offset, shape=shape,
+                     order="F" if fortran_order else "C")
+
+def _npz_arrays(filepath: str) -> dict:
+    """
+    Returns every member of an .npz history archive, memory-mapped when stored uncompressed.
+    """
+    with zipfile.ZipFile(filepath) as archive:
+        members = {info.filename[:-len(".npy")]: info for info in archive.infolist()}
+    if any(info.compress_type != zipfile.ZIP_STORED for info in members.values()):
+        with np.load(filepath) as archive:
+            return {name: archive[name] for name in archive.files}
+    return {name: _map_member(filepath, info) for name, info in members.items()}
+
+def _npz_frame(arrays: dict, start: int, stop: int) -> pd.DataFrame:
+    """
+    Builds the DataFrame of rows [start, stop) from the members of an .npz archive.
+    """
+    categories = np.asarray(arrays["operation.categories"], dtype=object)
+    columns = {"operation": categories[np.asarray(arrays["operation.codes"][start:stop])]}
+    for column, values in arrays.items():
+        if "." in column:  # operation.* and the .kinds companions
+            continue
+        values = values[start:stop]
+        if values.dtype.kind == "S":
+            kinds = arrays.get(f"{column}.kinds")
+            columns[column] = _from_strings(values.astype(str).tolist(),
+                                            None if kinds is None else np.asarray(kinds[start:stop]))
+        else:
+            columns[column] = np.array(values)
+    return pd.DataFrame(columns)
+
+def _load_npz(filepath: str) -> pd.DataFrame:
+    """
+    Loads an .npz history archive, memory-mapping every stored column.
+    """
+    arrays = _npz_arrays(filepath)
+    return _npz_frame(arrays, 0, len(arrays["operation.codes"]))
+
+def _import_pyarrow():
+    """
+    Imports pyarrow, which is only needed for the Arrow-based formats.
+    """
+    try:
+        import pyarrow  # pylint: disable=import-outside-toplevel
+    except ImportError as error:
+        raise ImportError("The .feather and .parquet history formats require pyarrow.") from error
+    return pyarrow
+
+def _save_arrow(frame: pd.DataFrame, filepath: str, extension: str):
+    """
+    Stores the history as a Feather or Parquet file.
+    """
+    pa = _import_pyarrow()
+    columns = {"operation": pa.array(frame["operation"].astype(str).tolist()).dictionary_encode()}
+    for column in frame.columns.drop("operation"):
+        series = frame[column]
+        if series.dtype.kind in "fiu":
+            columns[column] = pa.array(series.to_numpy())
+            continue
+        strings, kinds = _object_strings(series)
+        columns[column] = pa.array(strings, type=pa.string())
+        if kinds is not None:
+            columns[f"{column}.kinds"] = pa.array(kinds)
+    table = pa.table(columns)
+    if extension == ".feather":
+        import pyarrow.feather as feather  # pylint: disable=import-outside-toplevel
+        feather.write_feather(table, filepath, compression="uncompressed")
+    else:
+        import pyarrow.parquet as parquet  # pylint: disable=import-outside-toplevel
+        parquet.write_table(table, filepath)
+
+def _load_arrow(filepath: str, extension: str) -> pd.DataFrame:
+    """
+    Loads a Feather or Parquet history file through a memory map.
+    """
+    pa = _import_pyarrow()
+    if extension == ".feather":
+        import pyarrow.feather as feather  # pylint: disable=import-outside-toplevel
+        table = feather.read_table(filepath, memory_map=True)
+    else:
+        import pyarrow.parquet as parquet  # pylint: disable=import-outside-toplevel
+        table = parquet.read_table(filepath, memory_map=True)
+    return _arrow_frame(pa, table)
+
+def _arrow_frame(pa, table) -> pd.DataFrame:
+    """
+    Converts an Arrow table or record batch to a history DataFrame, restoring Decimal columns.
+    """
+    columns, names = {}, set(table.schema.names)
+    for field in table.schema:
+        if field.name.endswith(".kinds"):
+            continue
+        column = table.column(field.name)
+        if field.name == "operation":
+            columns[field.name] = np.asarray(column.to_pylist(), dtype=object)
+        elif pa.types.is_string(field.type) or pa.types.is_large_string(field.type):
+            kinds = f"{field.name}.kinds"
+            columns[field.name] = _from_strings(column.to_pylist(),
+                                                table.column(kinds).to_numpy() if kinds in names else None)
+        else:
+            columns[field.name] = column.to_numpy()
+    return pd.DataFrame(columns)
@@ -0,0 +1,141 @@
+"""
+Implements an append-only, JSON Lines write-ahead log for calculation history.
+
+Every mutation (add, delete, clear) is appended as one line instead of
+rewriting the whole history file. Lines are buffered and written in batches;
+the fsync policy decides how durable each batch is:
+
+- ``always``: write and fsync after every entry.
+- ``batch``: write and fsync once ``flush_every`` entries are buffered.
+- ``never``: write in batches and leave syncing to the operating system.
+
+A log may start with a ``snapshot`` entry naming the file that holds the
+compacted history it builds on; compaction swaps in a new log atomically.
+"""
+
+import json
+import os
+
+FSYNC_POLICIES = ("always", "batch", "never")
+
+class HistoryLog:
+    """
+    Buffered writer and reader for a history write-ahead log file.
+    """
+
+    def __init__(self, filepath: str, fsync: str = "batch", flush_every: int = 100):
+        """
+        Opens (or creates) the log for appending.
+
+        :param filepath: Path of the log file.
+        :param fsync: One of FSYNC_POLICIES.
+        :param flush_every: Number of buffered entries written per batch.
+        :raises ValueError: If the fsync policy is unknown.
+        """
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy '{fsync}'. Expected one of {', '.join(FSYNC_POLICIES)}.")
+        directory = os.path.dirname(filepath)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        self.filepath = filepath
+        self.fsync = fsync
+        self.flush_every = 1 if fsync == "always" else max(1, flush_every)
+        self._drop_torn_tail(filepath)
+        self.snapshot = None
+        self.entry_count = 0
+        for entry in self.read(filepath):
+            if self.entry_count == 0 and entry.get("type") == "snapshot":
+                self.snapshot = entry
+            self.entry_count += 1
+        self._pending = []
+        self._handle = open(filepath, "a", encoding="utf-8")
+
+    @staticmethod
+    def _drop_torn_tail(filepath: str):
+        """
+        Truncates a partially written last line so new entries start on a fresh line.
+        """
+        if not os.path.exists(filepath):
+            return
+        with open(filepath, "rb+") as handle:
+            end = position = handle.seek(0, os.SEEK_END)
+            while position > 0:
+                step = min(4096, position)
+                position -= step
+                handle.seek(position)
+                block = handle.read(step)
+                if position + step == end and block.endswith(b"\n"):
+                    return
+                newline = block.rfind(b"\n")
+                if newline >= 0:
+                    handle.truncate(position + newline + 1)
+                    return
+            handle.truncate(0)
+
+    @staticmethod
+    def read(filepath: str):
+        """
+        Yields the entries stored in a log file, oldest first.
+
+        A torn final line left by an interrupted write is ignored.
+
+        :param filepath: Path of the log file; a missing file yields nothing.
+        """
+        if not os.path.exists(filepath):
+            return
+        with open(filepath, encoding="utf-8") as handle:
+            for line in handle:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    if line.endswith("\n"):
+                        raise
+                    return
+
+    def append(self, entry: dict):
+        """
+        Buffers an entry, writing the batch once it is full.
+
+        :param entry: JSON-serialisable mapping with a ``type`` key.
+        """
+        self._pending.append(json.dumps(entry))
+        self.entry_count += 1
+        if len(self._pending) >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        """
+        Writes buffered entries and syncs them according to the fsync policy.
+        """
+        if not self._pending:
+            return
+        self._handle.write("\n".join(self._pending) + "\n")
+        self._pending = []
+        self._handle.flush()
+        if self.fsync != "never":
+            os.fsync(self._handle.fileno())
+
+    def rewrite(self, entries):
+        """
+        Atomically replaces the log with the given entries.
+
+        :param entries: Entries the new log starts with, e.g. a snapshot marker.
+        """
+        self.flush()
+        self._handle.close()
+        temporary = f"{self.filepath}.tmp"
+        with open(temporary, "w", encoding="utf-8") as handle:
+            handle.writelines(json.dumps(entry) + "\n" for entry in entries)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temporary, self.filepath)
+        self.entry_count = len(entries)
+        self.snapshot = entries[0] if entries and entries[0].get("type") == "snapshot" else None
+        self._handle = open(self.filepath, "a", encoding="utf-8")
+
+    def close(self):
+        """
+        Flushes pending entries and closes the file.
+        """
+        self.flush()
+        self._handle.close()
@@ -0,0 +1,276 @@
+"""
+Parses history queries and keeps the sorted secondary indexes that answer them.
+
+A query is a conjunction of predicates on the history columns, with an
+optional ordering and row limit::
+
+    result > 10 and operation = divide order by result desc limit 5
+    num1 between 1 and 5 and operation in add,divide
+
+``operation`` accepts ``=``, ``!=`` and ``in``; ``num1``, ``num2`` and
+``result`` accept ``=``, ``!=``, ``<``, ``<=``, ``>``, ``>=`` and
+``between <low> and <high>`` (inclusive). Numbers are compared as Decimals,
+so float-mode and Decimal-mode records compare exactly.
+"""
+
+import re
+from bisect import bisect_left, bisect_right
+from decimal import InvalidOperation
+from heapq import merge
+from operator import itemgetter
+from typing import NamedTuple
+from app.core.statistics import as_decimal
+
+NUMERIC_COLUMNS = ("num1", "num2", "result")
+COLUMNS = ("operation",) + NUMERIC_COLUMNS
+TAIL_INSERT_LIMIT = 32  # larger tails are merged in one pass instead of inserted one by one
+OPERATION_OPERATORS = ("=", "!=", "in")
+NUMERIC_OPERATORS = ("=", "!=", "<", "<=", ">", ">=", "between")
+
+_TOKEN = re.compile(r"<=|>=|!=|[<>=,]|[^\s<>=!,]+")
+
+class QueryError(ValueError):
+    """
+    Raised for queries that cannot be parsed or name an unknown column or operator.
+    """
+
+class Predicate(NamedTuple):
+    """
+    One condition on a column.
+
+    ``value`` is a Decimal for numeric operators, a (low, high) pair of
+    Decimals for ``between``, an operation name for ``=`` and ``!=`` on
+    ``operation``, and a tuple of names for ``in``.
+    """
+
+    column: str
+    operator: str
+    value: object
+
+class Query(NamedTuple):
+    """
+    Parsed query: predicates that must all hold, then an optional ordering and limit.
+    """
+
+    where: tuple = ()
+    order_by: str = None
+    descending: bool = False
+    limit: int = None
+
+def predicate(column: str, operator: str, value) -> Predicate:
+    """
+    Builds a validated predicate, converting numeric values to Decimal.
+
+    :raises QueryError: If the column, operator or value is not valid.
+    """
+    if column == "operation":
+        if operator not in OPERATION_OPERATORS:
+            raise QueryError(f"Operator '{operator}' is not supported on operation.")
+        if operator == "in":
+            value = tuple(value.split(",") if isinstance(value, str) else value)
+        return Predicate(column, operator, value)
+    if column not in NUMERIC_COLUMNS:
+        raise QueryError(f"Unknown column '{column}'. Expected operation, {', '.join(NUMERIC_COLUMNS)}.")
+    if operator not in NUMERIC_OPERATORS:
+        raise QueryError(f"Operator '{operator}' is not supported on {column}.")
+    try:
+        if operator == "between":
+            low, high = (predicate(column, ">=", bound).value for bound in value)
+            return Predicate(column, operator, (low, high))
+        number = as_decimal(value)
+        if number is None or number.is_nan():
+            raise InvalidOperation(value)
+        return Predicate(column, operator, number)
+    except (InvalidOperation, TypeError, ValueError) as err:
+        raise QueryError(f"Invalid number for {column}: {value!r}") from err
+
+def parse_query(text: str) -> Query:
+    """
+    Parses query text into a Query.
+
+    :raises QueryError: If the text does not follow the query grammar.
+    """
+    tokens = _TOKEN.findall(text)
+    position = 0
+
+    def take(what: str = "more input") -> str:
+        nonlocal position
+        if position >= len(tokens):
+            raise QueryError(f"Query ends early; expected {what}.")
+        position += 1
+        return tokens[position - 1]
+
+    def expect(keyword: str):
+        token = take(f"'{keyword}'")
+        if token.lower() != keyword:
+            raise QueryError(f"Expected '{keyword}' but found '{token}'.")
+
+    def peek() -> str:
+        return tokens[position].lower() if position < len(tokens) else None
+
+    where, order_by, descending, limit = [], None, False, None
+    if peek() == "where":
+        take()
+    while peek() not in (None, "order", "limit"):
+        column, operator = take("a column").lower(), take("an operator").lower()
+        if operator == "between":
+            low = take("a number")
+            expect("and")
+            where.append(predicate(column, operator, (low, take("a number"))))
+        elif operator == "in":
+            names = [take("an operation")]
+            while peek() == ",":
+                take()
+                names.append(take("an operation"))
+            where.append(predicate(column, operator, names))
+        else:
+            where.append(predicate(column, operator, take("a value")))
+        if peek() == "and":
+            take()
+        elif peek() not in (None, "order", "limit"):
+            raise QueryError(f"Expected 'and', 'order by' or 'limit' but found '{tokens[position]}'.")
+    if peek() == "order":
+        take()
+        expect("by")
+        order_by = take("a column").lower()
+        if order_by not in COLUMNS:
+            raise QueryError(f"Unknown column '{order_by}'.")
+        if peek() in ("asc", "desc"):
+            descending = take().lower() == "desc"
+    if peek() == "limit":
+        take()
+        count = take("a row count")
+        if not count.isdigit():
+            raise QueryError(f"Invalid limit '{count}'.")
+        limit = int(count)
+    if position < len(tokens):
+        raise QueryError(f"Unexpected '{tokens[position]}'.")
+    return Query(tuple(where), order_by, descending, limit)
+
+def matches(condition: Predicate, value) -> bool:
+    """
+    Returns whether a stored value satisfies a predicate; missing numbers never match.
+    """
+    operator, expected = condition.operator, condition.value
+    if condition.column != "operation":
+        value = as_decimal(value)
+        if value is None:
+            return False
+    if operator == "=":
+        return value == expected
+    if operator == "!=":
+        return value != expected
+    if operator == "in":
+        return value in expected
+    if operator == "between":
+        return expected[0] <= value <= expected[1]
+    if operator == "<":
+        return value < expected
+    if operator == "<=":
+        return value <= expected
+    if operator == ">":
+        return value > expected
+    return value >= expected
+
+class SortedIndex:
+    """
+    Physical row positions of one numeric column, ordered by value, searched with bisect.
+
+    ``keys`` and ``positions`` are parallel lists; rows with equal keys keep
+    their physical order, so an index slice is also ordered by position within
+    each key. Rows without a value are left out. Appended rows wait in an
+    unsorted tail and are merged in by the next search, so appends stay O(1).
+    Deleted rows stay in the index until the history is compacted; readers
+    skip them.
+    """
+
+    __slots__ = ("keys", "positions", "_tail")
+
+    def __init__(self, values):
+        """
+        :param values: Column values in physical row order.
+        """
+        keys = list(map(as_decimal, values))
+        positions = [position for position, key in enumerate(keys) if key is not None]
+        positions.sort(key=keys.__getitem__)
+        self.keys = [keys[position] for position in positions]
+        self.positions = positions
+        self._tail = []
+
+    def __len__(self) -> int:
+        return len(self.keys) + len(self._tail)
+
+    def insert(self, value, position: int):
+        """
+        Adds a row appended after every indexed row.
+        """
+        key = as_decimal(value)
+        if key is not None:
+            self._tail.append((key, position))
+
+    def _settle(self):
+        """
+        Merges the appended rows into ``keys`` and ``positions``.
+        """
+        if not self._tail:
+            return
+        tail, self._tail = self._tail, []
+        tail.sort(key=itemgetter(0))  # stable, so equal keys stay in position order
+        if len(tail) <= TAIL_INSERT_LIMIT:
+            slot = 0
+            for key, position in tail:
+                slot = bisect_right(self.keys, key, slot)
+                self.keys.insert(slot, key)
+                self.positions.insert(slot, position)
+                slot += 1
+            return
+        merged = list(merge(zip(self.keys, self.positions), tail, key=itemgetter(0)))
+        self.keys = [key for key, _ in merged]
+        self.positions = [position for _, position in merged]
+
+    def span(self, condition: Predicate) -> tuple:
+        """
+        Returns the [start, stop) slice of the index whose keys satisfy a range or equality predicate.
+        """
+        self._settle()
+        operator, value, keys = condition.operator, condition.value, self.keys
+        if operator == "=":
+            return bisect_left(keys, value), bisect_right(keys, value)
+        if operator == "between":
+            return bisect_left(keys, value[0]), max(bisect_left(keys, value[0]), bisect_right(keys, value[1]))
+        if operator == "<":
+            return 0, bisect_left(keys, value)
+        if operator == "<=":
+            return 0, bisect_right(keys, value)
+        if operator == ">":
+            return bisect_right(keys, value), len(keys)
+        if operator == ">=":
+            return bisect_left(keys, value), len(keys)
+        return 0, len(keys)
+
+    def walk(self, start: int, stop: int, descending: bool = False):
+        """
+        Yields the positions of an index slice by key, ascending or descending.
+
+        Rows with equal keys come out in physical order either way.
+        """
+        self._settle()
+        if not descending:
+            yield from self.positions[start:stop]
+            return
+        while stop > start:
+            first = bisect_left(self.keys, self.keys[stop - 1], start, stop)
+            yield from self.positions[first:stop]
+            stop = first
+
+    def compact(self, dead: set, renumber):
+        """
+        Drops deleted rows and renumbers the rest after the history is compacted.
+
+        :param dead: Physical positions of the deleted rows.
+        :param renumber: Callable mapping a list of live physical positions to their new positions.
+        """
+        self._settle()
+        kept = [slot for slot, position in enumerate(self.positions) if position not in dead]
+        self.keys = [self.keys[slot] for slot in kept]
+        self.positions = renumber([self.positions[slot] for slot in kept])
@@ -1,77 +1,779 @@
 """
 Implements a simplified interface over Pandas for manipulating calculation records stored as a DataFrame.
+
+Pandas is only imported once a DataFrame is actually needed (reading the
+history, filtering, saving or loading), so recording calculations from a
+single-operation CLI call does not pay for the import.
 """
 
-import pandas as pd
 import os
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import accumulate, chain
+from typing import TYPE_CHECKING
+from app.core.statistics import RunningAggregate, as_decimal
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 class PandasFacade:
     """
     Simplifies common Pandas DataFrame operations for managing calculation records.
+
+    New records are appended to per-column Python lists, sealed into chunks
+    every ``chunk_size`` rows. The chunks are only turned into a DataFrame,
+    in bulk, when ``dataframe`` is read, so appending stays O(1) amortized
+    instead of copying the whole history on every record.
+
+    The operation column is stored as a categorical, and a per-operation
+    list of row positions is kept in step with every add, delete and load,
+    so filtering by operation is a positional lookup whose cost grows with
+    the number of matching rows rather than the size of the history.
+
+    Running aggregates of the result column (count, sum, min, max, mean and
+    variance) are kept per operation in the same way, so ``summary`` does
+    not scan the history.
+
+    Deleting a record only marks its physical row as dead. Readers see the
+    live rows, renumbered from zero, so indexes passed to ``remove_record``
+    keep their meaning; a Fenwick tree over the live rows maps such a logical
+    index to its physical row in O(log n). Once dead rows reach
+    ``compact_ratio`` of the stored rows they are dropped in one pass, so a
+    run of deletes costs amortized O(log n) each instead of a full copy.
+    The operation index holds physical positions and so never shifts on delete.
+
+    ``query`` answers conjunctive predicates through sorted indexes of the
+    numeric columns (see ``app.utils.history_query``), each built on first
+    use. Appends are inserted into the built indexes; bulk inserts and loads
+    drop them, to be rebuilt by the next query that needs them.
+
+    A PandasFacade is not thread-safe; ``Calculations`` serialises access to
+    the shared one.
     """
 
-    def __init__(self):
+    COLUMNS = ["operation", "num1", "num2", "result"]
+    LOAD_CHUNK_SIZE = 100_000
+    COMPACT_RATIO = 0.25
+
+    def __init__(self, chunk_size: int = 4096, compact_ratio: float = COMPACT_RATIO):
+        """
+        Initializes an empty history with predefined columns.
+
+        :param chunk_size: Number of buffered records sealed into one chunk.
+        :param compact_ratio: Fraction of dead rows among the stored rows that triggers compaction.
+        """
+        self.chunk_size = chunk_size
+        self.compact_ratio = compact_ratio
+        self._frame = None
+        self._chunks = []
+        self._buffer = self._empty_columns()
+        self._positions = {}
+        self._aggregates = {}
+        self._size = 0
+        self._dead = set()
+        self._live = None
+        self._indexes = {}
+
+    @classmethod
+    def _empty_columns(cls) -> dict:
+        """
+        Returns a fresh mapping of column name to an empty list.
+        """
+        return {column: [] for column in cls.COLUMNS}
+
+    @property
+    def dataframe(self) -> "pd.DataFrame":
+        """
+        Returns the live history, consolidating any pending appends first.
+
+        Deleted rows still awaiting compaction are compacted away here, since
+        building the live rows costs the same copy either way.
+        """
+        if self._dead:
+            self.compact()
+        return self._physical_frame()
+
+    def _physical_frame(self) -> "pd.DataFrame":
+        """
+        Returns every stored row, deleted ones included, in physical order.
+        """
+        if self._frame is None or self._chunks or self._buffer["operation"]:
+            self._consolidate()
+        return self._frame
+
+    @dataframe.setter
+    def dataframe(self, frame: "pd.DataFrame"):
+        """
+        Replaces the history with the given DataFrame, discarding pending appends
+        and rebuilding the operation index.
+        """
+        if frame is not None and frame["operation"].dtype != "category":
+            frame = frame.astype({"operation": "category"})
+        self._frame = frame
+        self._chunks = []
+        self._buffer = self._empty_columns()
+        self._positions = {}
+        self._aggregates = {}
+        self._dead = set()
+        self._live = None
+        self._indexes = {}
+        self._size = 0 if frame is None else len(frame)
+        if self._size:
+            groups = frame.groupby("operation", observed=True, sort=False).indices
+            self._positions = {operation: rows.tolist() for operation, rows in groups.items()}
+            self._aggregates = None  # rebuilt in bulk by the first summary()
+
+    def __len__(self) -> int:
+        """
+        Returns the number of live records, including pending appends, without consolidating.
+        """
+        return self._size
+
+    @property
+    def _stored(self) -> int:
+        """
+        Number of physical rows, live and dead, including pending appends.
+        """
+        return self._size + len(self._dead)
+
+    def _seal_chunk(self):
+        """
+        Moves the buffered column lists into the list of pending chunks.
+        """
+        self._chunks.append(self._buffer)
+        self._buffer = self._empty_columns()
+
+    def _consolidate(self):
+        """
+        Builds one DataFrame from all pending chunks and appends it to the stored frame.
+        """
+        import pandas as pd  # pylint: disable=import-outside-toplevel,redefined-outer-name
+        if self._buffer["operation"]:
+            self._seal_chunk()
+        if self._chunks:
+            pending = pd.DataFrame({
+                column: list(chain.from_iterable(chunk[column] for chunk in self._chunks))
+                for column in self.COLUMNS
+            }, columns=self.COLUMNS).astype({"operation": "category"})
+            self._extend_frame(pending)
+            self._chunks = []
+        elif self._frame is None:
+            self._frame = pd.DataFrame(columns=self.COLUMNS).astype({"operation": "category"})
+
+    def _extend_frame(self, pending: "pd.DataFrame"):
         """
-        Initializes an empty DataFrame with predefined columns.
+        Appends a DataFrame whose operation column is categorical to the stored frame.
         """
-        self.dataframe = pd.DataFrame(columns=["operation", "num1", "num2", "result"])
+        import pandas as pd  # pylint: disable=import-outside-toplevel,redefined-outer-name
+        if self._frame is None or self._frame.empty:
+            self._frame = pending
+        else:
+            from pandas.api.types import union_categoricals  # pylint: disable=import-outside-toplevel
+            operations = union_categoricals([self._frame["operation"], pending["operation"]])
+            self._frame = pd.concat([self._frame.drop(columns="operation"), pending.drop(columns="operation")],
+                                    ignore_index=True)
+            self._frame.insert(0, "operation", operations)
 
     def add_record(self, record: dict):
         """
-        Appends a new record to the DataFrame.
+        Appends a new record to the history buffer.
 
         :param record: Dictionary representing a single calculation record.
         """
-        new_entry = pd.DataFrame([record])
-        self.dataframe = pd.concat([self.dataframe, new_entry], ignore_index=True)
+        self.append(record.get("operation"), record.get("num1"), record.get("num2"), record.get("result"))
+
+    def append(self, operation: str, num1, num2, result):
+        """
+        Appends one record to the history buffer, writing each value straight into its column.
+
+        :param operation: Operation name.
+        :param num1: First operand.
+        :param num2: Second operand.
+        :param result: Result of the operation.
+        """
+        buffer = self._buffer
+        buffer["operation"].append(operation)
+        buffer["num1"].append(num1)
+        buffer["num2"].append(num2)
+        buffer["result"].append(result)
+        self._positions.setdefault(operation, []).append(self._size + len(self._dead))
+        self._aggregate(operation, result)
+        if self._indexes:
+            self._index_row(self._size + len(self._dead), num1, num2, result)
+        self._size += 1
+        if len(buffer["operation"]) >= self.chunk_size:
+            self._seal_chunk()
+
+    def append_many(self, records):
+        """
+        Appends (operation, num1, num2, result) records in order, as repeated ``append`` calls would.
+
+        The running aggregates are updated once per operation, from a bulk
+        aggregate of the new results, instead of once per record. The bulk
+        aggregates are built before any row is stored, so if that fails the
+        store is left unchanged.
+
+        :param records: Iterable of (operation, num1, num2, result) tuples.
+        """
+        records = list(records)
+        results = {}
+        for operation, _, _, result in records:
+            value = as_decimal(result)
+            if value is not None:
+                results.setdefault(operation, []).append(value)
+        batches = {operation: RunningAggregate.from_values(values) for operation, values in results.items()}
+        for operation, num1, num2, result in records:
+            buffer = self._buffer
+            buffer["operation"].append(operation)
+            buffer["num1"].append(num1)
+            buffer["num2"].append(num2)
+            buffer["result"].append(result)
+            position = self._size + len(self._dead)
+            self._positions.setdefault(operation, []).append(position)
+            if self._indexes:
+                self._index_row(position, num1, num2, result)
+            self._size += 1
+            if len(buffer["operation"]) >= self.chunk_size:
+                self._seal_chunk()
+        if self._aggregates is not None:
+            for operation, batch in batches.items():
+                self._aggregates.setdefault(operation, RunningAggregate()).merge(batch)
+
+    def add_records(self, columns: dict):
+        """
+        Appends many records at once as a single chunk.
+
+        :param columns: Mapping of column name to an equally long sequence of values.
+        """
+        if self._buffer["operation"]:
+            self._seal_chunk()
+        chunk = {column: list(columns[column]) for column in self.COLUMNS}
+        if chunk["operation"]:
+            self._chunks.append(chunk)
+            for position, operation in enumerate(chunk["operation"], start=self._stored):
+                self._positions.setdefault(operation, []).append(position)
+            for operation, result in zip(chunk["operation"], chunk["result"]):
+                self._aggregate(operation, result)
+            self._size += len(chunk["operation"])
+            self._indexes = {}
+
+    def _aggregate(self, operation: str, result):
+        """
+        Adds a result to the running aggregate of its operation.
+        """
+        value = as_decimal(result)
+        if value is not None and self._aggregates is not None:
+            if operation not in self._aggregates:
+                self._aggregates[operation] = RunningAggregate()
+            self._aggregates[operation].add(value)
+
+    def summary(self) -> dict:
+        """
+        Returns the running aggregates of the result column per operation.
+
+        After a load the aggregates are built once, in bulk, by the first
+        call. Afterwards only an operation whose minimum or maximum was
+        deleted has its extremes recomputed, from that operation's rows.
+
+        :return: Mapping of operation name to count, sum, min, max, mean and variance.
+        """
+        if self._aggregates is None:
+            self._rebuild_aggregates()
+        for operation, aggregate in self._aggregates.items():
+            if aggregate.stale:
+                results = self._physical_frame()["result"].iloc[self._positions.get(operation, [])]
+                aggregate.refresh_extremes(value for value in map(as_decimal, results) if value is not None)
+        return {operation: aggregate.as_dict() for operation, aggregate in self._aggregates.items()}
+
+    def _rebuild_aggregates(self):
+        """
+        Builds the running aggregates of every operation from the stored results.
+        """
+        results = self._physical_frame()["result"].to_numpy()
+        self._aggregates = {}
+        for operation, positions in self._positions.items():
+            values = [value for value in map(as_decimal, results[positions]) if value is not None]
+            if values:
+                self._aggregates[operation] = RunningAggregate.from_values(values)
 
     def clear(self):
         """
         Clears all records from the DataFrame.
         """
-        self.dataframe = pd.DataFrame(columns=self.dataframe.columns)
+        self.dataframe = None
 
-    def filter_by_operation(self, operation: str) -> pd.DataFrame:
+    def filter_by_operation(self, operation: str) -> "pd.DataFrame":
         """
         Returns records where the operation matches the specified name.
 
+        Rows are taken by position from the operation index, labelled with
+        their index in the live history, so no comparison runs over the whole
+        history.
+
         :param operation: Operation name to filter by.
         :return: Filtered DataFrame.
         """
-        return self.dataframe[self.dataframe["operation"] == operation]
+        positions = self._positions.get(operation, [])
+        rows = self._physical_frame().iloc[positions]
+        if self._dead:
+            rows.index = self._logical_positions(positions)
+        return rows
+
+    def query(self, where=(), order_by: str = None, descending: bool = False, limit: int = None) -> "pd.DataFrame":
+        """
+        Returns the records matching every predicate, optionally ordered and limited.
+
+        The most selective predicate drives the scan: an operation predicate
+        through the operation index, a numeric one through a bisected range
+        of its sorted index. The remaining predicates are checked on the
+        driving rows only. A missing sorted index is built on first use,
+        unless an operation predicate already narrows the rows to under
+        1/16 of the history. When the driving index is on the ``order_by``
+        column, rows are read in order and the scan stops at ``limit``;
+        otherwise ``limit`` selects rows with a bounded heap rather than a
+        full sort.
+
+        :param where: Predicates (see ``history_query.predicate``) that must all hold.
+        :param order_by: Column to order by; None keeps history order.
+        :param descending: Order from largest to smallest.
+        :param limit: Maximum number of rows returned; None for all.
+        :return: Matching records, labelled with their index in the live history.
+        """
+        frame = self._physical_frame()
+        positions = self._query_positions(frame, where, order_by, descending, limit)
+        rows = frame.iloc[positions]
+        if self._dead:
+            rows.index = self._logical_positions(positions)
+        return rows
+
+    def _query_positions(self, frame: "pd.DataFrame", where, order_by, descending, limit) -> list:
+        """
+        Returns the physical positions of the rows a query selects, in result order.
+        """
+        import heapq  # pylint: disable=import-outside-toplevel
+        from itertools import islice  # pylint: disable=import-outside-toplevel
+        from app.utils.history_query import matches  # pylint: disable=import-outside-toplevel
+        driver, candidates, ordered = self._plan(where, order_by, descending)
+        readers = {column: _column_reader(frame, column) for column in {c.column for c in where} | {order_by}
+                   if column is not None}
+        rest = [condition for condition in where if condition is not driver]
+        dead = self._dead
+        rows = (position for position in candidates if position not in dead
+                and all(matches(condition, readers[condition.column](position)) for condition in rest))
+        if order_by is None and driver is not None and driver.column != "operation":
+            return heapq.nsmallest(limit, rows) if limit is not None else sorted(rows)  # back to history order
+        if order_by is None or ordered:
+            return list(rows if limit is None else islice(rows, limit))
+        read = readers[order_by]
+        convert = (lambda value: value) if order_by == "operation" else as_decimal
+        keyed, missing = [], []
+        for position in rows:
+            value = convert(read(position))
+            if value is None:
+                missing.append(position)
+            else:
+                keyed.append((value, position))
+        if descending:
+            def rank(pair):
+                return pair[0], -pair[1]  # ties stay in history order
+            keyed = heapq.nlargest(limit, keyed, key=rank) if limit is not None else sorted(keyed, key=rank,
+                                                                                             reverse=True)
+        else:
+            keyed = heapq.nsmallest(limit, keyed) if limit is not None else sorted(keyed)
+        ordered_rows = [position for _, position in keyed] + missing
+        return ordered_rows if limit is None else ordered_rows[:limit]
+
+    def _plan(self, where, order_by, descending) -> tuple:
+        """
+        Chooses the predicate that drives a query.
+
+        :return: (driving predicate or None, candidate physical positions,
+                  whether the candidates already come in ``order_by`` order).
+        """
+        from heapq import merge  # pylint: disable=import-outside-toplevel
+        best = None
+        for condition in where:
+            if condition.column == "operation" and condition.operator != "!=":
+                names = (condition.value,) if condition.operator == "=" else dict.fromkeys(condition.value)
+                lists = [self._positions.get(name, []) for name in names]
+                size = sum(map(len, lists))
+                if best is None or size < best[0]:
+                    best = (size, condition, lists[0] if len(lists) == 1 else merge(*lists), False)
+        narrowed = best is not None and best[0] * 16 < self._stored
+        for condition in where:
+            if condition.column != "operation" and condition.operator != "!=":
+                if narrowed and condition.column not in self._indexes:
+                    continue
+                index = self._sorted_index(condition.column)
+                start, stop = index.span(condition)
+                if best is None or stop - start < best[0]:
+                    ordered = condition.column == order_by
+                    best = (stop - start, condition, index.walk(start, stop, descending and ordered), ordered)
+        if best is not None:
+            return best[1:]
+        index = self._indexes.get(order_by)
+        if index is not None and len(index) == self._stored:
+            return None, index.walk(0, len(index), descending), True
+        return None, range(self._stored), False
+
+    def _sorted_index(self, column: str):
+        """
+        Returns the sorted index of a numeric column, building it on first use.
+        """
+        index = self._indexes.get(column)
+        if index is None:
+            from app.utils.history_query import SortedIndex  # pylint: disable=import-outside-toplevel
+            index = self._indexes[column] = SortedIndex(self._physical_frame()[column].to_numpy())
+        return index
+
+    def _index_row(self, position: int, num1, num2, result):
+        """
+        Adds an appended row to the sorted indexes built so far (merged in on their next search).
+        """
+        for column, value in (("num1", num1), ("num2", num2), ("result", result)):
+            index = self._indexes.get(column)
+            if index is not None:
+                index.insert(value, position)
+
+    def page(self, offset: int, limit: int, operation: str = None) -> "pd.DataFrame":
+        """
+        Returns up to ``limit`` live records starting at index ``offset``.
+
+        Only the requested rows are read, from the stored frame or straight
+        from the pending chunks, so a page costs O(log n + limit): nothing is
+        consolidated, compacted or copied beyond the page itself.
+
+        :param offset: Index of the first record, in the history or among the operation's records.
+        :param limit: Maximum number of records returned.
+        :param operation: Page through this operation's records only.
+        :return: Records labelled with their index in the live history.
+        """
+        if operation is not None:
+            positions = self._positions.get(operation, [])[offset:offset + limit]
+            labels = [self._live_rows().rank(position) for position in positions] if self._dead else positions
+        else:
+            positions = self._live_range(offset, limit)
+            labels = range(offset, offset + len(positions))
+        return self._rows_at(positions, labels)
+
+    def _live_range(self, offset: int, limit: int) -> list:
+        """
+        Returns the physical positions of up to ``limit`` live rows from logical index ``offset``.
+        """
+        if not self._dead:
+            return list(range(offset, min(offset + limit, self._size)))
+        if offset >= self._size:
+            return []
+        positions, physical, stored = [], self._live_rows().select(offset), self._stored
+        while physical < stored and len(positions) < limit:
+            if physical not in self._dead:
+                positions.append(physical)
+            physical += 1
+        return positions
+
+    def _rows_at(self, positions: list, labels) -> "pd.DataFrame":
+        """
+        Builds a DataFrame of the rows at the given physical positions, from the frame or pending chunks.
+        """
+        import pandas as pd  # pylint: disable=import-outside-toplevel,redefined-outer-name
+        stored = 0 if self._frame is None else len(self._frame)
+        readers = [_column_reader(self._frame, column) for column in self.COLUMNS] if stored else []
+        pending = [*self._chunks, self._buffer]
+        starts = list(accumulate((len(chunk["operation"]) for chunk in pending), initial=stored))
+        columns = [[] for _ in self.COLUMNS]
+        for position in positions:
+            if position < stored:
+                for values, read in zip(columns, readers):
+                    values.append(read(position))
+            else:
+                slot = bisect_right(starts, position) - 1
+                chunk, row = pending[slot], position - starts[slot]
+                for values, column in zip(columns, self.COLUMNS):
+                    values.append(chunk[column][row])
+        rows = pd.DataFrame(dict(zip(self.COLUMNS, columns)), index=labels, columns=self.COLUMNS)
+        return rows.astype({"operation": "category"})
 
     def save_to_file(self, filepath: str):
         """
-        Saves the DataFrame to a CSV file.
+        Saves the DataFrame to a file whose extension selects the format
+        (.csv, .npz, .feather or .parquet).
 
-        :param filepath: Filepath where the CSV file will be stored.
+        :param filepath: Filepath where the file will be stored.
         """
         directory = os.path.dirname(filepath)
         if directory and not os.path.exists(directory):
             os.makedirs(directory)
-        self.dataframe.to_csv(filepath, index=False)
+        from app.utils.history_formats import save_frame  # pylint: disable=import-outside-toplevel
+        save_frame(self.dataframe, filepath)
 
-    def load_from_file(self, filepath: str):
+    def load_from_file(self, filepath: str, chunk_size: int = None, operations=None,
+                       min_result=None, max_result=None, append: bool = False) -> int:
         """
-        Loads records from an existing CSV file into the DataFrame.
+        Loads records from an existing history file into the DataFrame.
 
-        :param filepath: Path to the CSV file to load.
+        Without options the whole file replaces the history. Given a chunk
+        size, a predicate or ``append``, the file is streamed instead, in
+        chunks of ``chunk_size`` rows (``LOAD_CHUNK_SIZE`` by default). Only the
+        matching rows of each chunk are kept, so peak memory depends on the
+        chunk size and the number of matching rows, not on the file size.
+
+        :param filepath: Path to the .csv, .npz, .feather or .parquet file to load.
+        :param chunk_size: Maximum number of rows read at once.
+        :param operations: Operation names to keep; None keeps every operation.
+        :param min_result: Smallest result to keep (inclusive); None for no lower bound.
+        :param max_result: Largest result to keep (inclusive); None for no upper bound.
+        :param append: Append the loaded rows to the history instead of replacing it.
+        :return: Number of rows loaded.
         """
-        if os.path.exists(filepath):
-            self.dataframe = pd.read_csv(filepath)
-        else:
+        if not os.path.exists(filepath):
             raise FileNotFoundError(f"No such file: '{filepath}'")
-        
+        if chunk_size is None and operations is None and min_result is None and max_result is None and not append:
+            from app.utils.history_formats import load_frame  # pylint: disable=import-outside-toplevel
+            self.dataframe = load_frame(filepath)
+            return len(self)
+        frame = self._read_matching(filepath, chunk_size or self.LOAD_CHUNK_SIZE, operations, min_result, max_result)
+        if append:
+            self._append_frame(frame)
+        else:
+            self.dataframe = frame
+        return len(frame)
+
+    def _read_matching(self, filepath: str, chunk_size: int, operations, min_result, max_result) -> "pd.DataFrame":
+        """
+        Streams a history file chunk by chunk and returns only the rows matching the predicates.
+        """
+        import pandas as pd  # pylint: disable=import-outside-toplevel,redefined-outer-name
+        from app.utils.history_formats import iter_frames  # pylint: disable=import-outside-toplevel
+        wanted = None if operations is None else list(operations)
+        low, high = (None if bound is None else as_decimal(bound) for bound in (min_result, max_result))
+        matches = []
+        for chunk in iter_frames(filepath, chunk_size):
+            keep = chunk["operation"].isin(wanted).to_numpy() if wanted is not None else None
+            if low is not None or high is not None:
+                in_range = _results_in_range(chunk["result"], low, high)
+                keep = in_range if keep is None else keep & in_range
+            chunk = chunk if keep is None else chunk[keep]
+            if len(chunk):
+                matches.append(chunk.astype({"operation": "category"}))
+        if not matches:
+            return pd.DataFrame(columns=self.COLUMNS)
+        from pandas.api.types import union_categoricals  # pylint: disable=import-outside-toplevel
+        operations = union_categoricals([match["operation"] for match in matches])
+        frame = pd.concat([match.drop(columns="operation") for match in matches], ignore_index=True)
+        frame.insert(0, "operation", operations)
+        return frame
+
+    def _append_frame(self, frame: "pd.DataFrame"):
+        """
+        Appends a loaded DataFrame after the current history, extending the operation index.
+        """
+        if frame.empty:
+            return
+        if frame["operation"].dtype != "category":
+            frame = frame.astype({"operation": "category"})
+        self._physical_frame()
+        self._extend_frame(frame)
+        for operation, rows in frame.groupby("operation", observed=True, sort=False).indices.items():
+            self._positions.setdefault(operation, []).extend((rows + self._stored).tolist())
+        self._size += len(frame)
+        self._aggregates = None  # rebuilt in bulk by the first summary()
+        self._indexes = {}
+
+    def remove_record(self, index: int) -> bool:
+        """
+        Removes a record by its index without reporting to the console.
+
+        The row is marked dead rather than dropped; the history is compacted
+        once the dead rows reach ``compact_ratio`` of the stored rows.
+
+        :param index: Index of the record in the live history.
+        :return: True if the record existed and was removed.
+        """
+        if not 0 <= index < len(self):
+            return False
+        live = self._live_rows()
+        physical = live.select(index) if self._dead else index
+        operation, result = self._stored_row(physical)
+        positions = self._positions[operation]
+        del positions[bisect_left(positions, physical)]
+        if not positions:
+            del self._positions[operation]
+        self._unaggregate(operation, result)
+        live.remove(physical)
+        self._dead.add(physical)
+        self._size -= 1
+        if len(self._dead) >= self.compact_ratio * self._stored:
+            self.compact()
+        return True
+
+    def _live_rows(self) -> "_LiveRows":
+        """
+        Returns the Fenwick tree of live rows, rebuilding it once the stored rows outgrow it.
+        """
+        if self._live is None or self._stored > self._live.capacity:
+            self._live = _LiveRows(max(1024, 2 * self._stored), self._dead)
+        return self._live
+
+    def _stored_row(self, physical: int) -> tuple:
+        """
+        Returns the operation and result stored at a physical row, consolidated or pending.
+        """
+        stored = 0 if self._frame is None else len(self._frame)
+        if physical < stored:
+            return self._frame["operation"].iat[physical], self._frame["result"].iat[physical]
+        physical -= stored
+        for chunk in [*self._chunks, self._buffer]:
+            if physical < len(chunk["operation"]):
+                return chunk["operation"][physical], chunk["result"][physical]
+            physical -= len(chunk["operation"])
+        raise IndexError(physical)
+
+    def _live_positions(self):
+        """
+        Returns the physical positions of the live rows, in order.
+        """
+        import numpy as np  # pylint: disable=import-outside-toplevel
+        live = np.ones(self._stored, dtype=bool)
+        live[np.fromiter(self._dead, dtype=np.int64, count=len(self._dead))] = False
+        return np.flatnonzero(live)
+
+    def _logical_positions(self, positions: list):
+        """
+        Converts physical positions of live rows to their indexes in the live history.
+        """
+        import numpy as np  # pylint: disable=import-outside-toplevel
+        dead = np.sort(np.fromiter(self._dead, dtype=np.int64, count=len(self._dead)))
+        positions = np.asarray(positions, dtype=np.int64)
+        return positions - np.searchsorted(dead, positions)
+
+    def compact(self):
+        """
+        Drops the dead rows, renumbering the stored rows and the operation index.
+        """
+        if not self._dead:
+            return
+        frame = self._physical_frame()
+        self._positions = {operation: self._logical_positions(positions).tolist()
+                           for operation, positions in self._positions.items()}
+        for index in self._indexes.values():
+            index.compact(self._dead, lambda positions: self._logical_positions(positions).tolist())
+        import pandas as pd  # pylint: disable=import-outside-toplevel,redefined-outer-name
+        frame = frame.iloc[self._live_positions()]
+        frame.index = pd.RangeIndex(len(frame))  # relabel the new frame without another copy
+        self._frame = frame
+        self._dead = set()
+        self._live = None
+
+    def _unaggregate(self, operation: str, result):
+        """
+        Removes a deleted record's result from the running aggregate of its operation.
+        """
+        value = as_decimal(result)
+        aggregate = self._aggregates.get(operation) if self._aggregates is not None else None
+        if value is not None and aggregate is not None:
+            aggregate.remove(value)
+            if aggregate.count == 0:
+                del self._aggregates[operation]
+
     def delete_record(self, index: int):
         """
         Delete a record from the DataFrame by its index.
 
         Args:
             index (int): The index of the record to delete.
+
+        Returns:
+            bool: True if the record was deleted.
         """
-        if 0 <= index < len(self.dataframe):
-            self.dataframe = self.dataframe.drop(index).reset_index(drop=True)
+        if self.remove_record(index):
             print(f"Deleted calculation at index {index}.")
-        else:
-            print(f"Index {index} is out of range. Unable to delete.")  # <- FIXED MESSAGE
+            return True
+        print(f"Index {index} is out of range. Unable to delete.")  # <- FIXED MESSAGE
+        return False
+
+class _LiveRows:
+    """
+    Fenwick tree of live-row counts over physical positions, mapping a logical index to its physical row.
+
+    Rows past the stored ones count as live, so appends need no update
+    until the stored rows outgrow ``capacity``.
+    """
+
+    def __init__(self, capacity: int, dead):
+        """
+        :param capacity: Number of physical positions covered.
+        :param dead: Physical positions already deleted.
+        """
+        import numpy as np  # pylint: disable=import-outside-toplevel
+        self.capacity = capacity
+        live = np.ones(capacity + 1, dtype=np.int64)
+        live[0] = 0
+        live[np.fromiter(dead, dtype=np.int64, count=len(dead)) + 1] = 0
+        prefix = np.cumsum(live)
+        nodes = np.arange(1, capacity + 1)
+        self._tree = array("q", [0])
+        self._tree.frombytes((prefix[nodes] - prefix[nodes - (nodes & -nodes)]).tobytes())
+        self._top = 1 << (capacity.bit_length() - 1)
+
+    def remove(self, physical: int):
+        """
+        Marks a physical row as dead.
+        """
+        tree, node = self._tree, physical + 1
+        while node <= self.capacity:
+            tree[node] -= 1
+            node += node & -node
+
+    def rank(self, physical: int) -> int:
+        """
+        Returns the number of live rows before a physical position, which is its logical index.
+        """
+        if physical > self.capacity:
+            return self.rank(self.capacity) + physical - self.capacity
+        tree, node, count = self._tree, physical, 0
+        while node:
+            count += tree[node]
+            node -= node & -node
+        return count
 
+    def select(self, logical: int) -> int:
+        """
+        Returns the physical position of the live row with the given logical index.
+        """
+        tree, node, remaining, step = self._tree, 0, logical + 1, self._top
+        while step:
+            candidate = node + step
+            if candidate <= self.capacity and tree[candidate] < remaining:
+                node = candidate
+                remaining -= tree[candidate]
+            step >>= 1
+        return node
+
+def _column_reader(frame: "pd.DataFrame", column: str):
+    """
+    Returns a function reading one column's value at a physical position, without copying the column.
+    """
+    if column == "operation":
+        categories = frame["operation"].cat.categories.tolist()
+        codes = frame["operation"].cat.codes.to_numpy()
+        return lambda position: categories[codes[position]]
+    return frame[column].to_numpy().__getitem__
+
+def _results_in_range(results: "pd.Series", low, high):
+    """
+    Returns a boolean array marking results within [low, high]; missing and non-finite results never match.
+
+    Native numeric columns are compared vectorized; Decimal columns are compared exactly.
+    """
+    import numpy as np  # pylint: disable=import-outside-toplevel
+    if results.dtype.kind in "fiu":
+        values = results.to_numpy(dtype=np.float64)
+        keep = np.isfinite(values)
+        if low is not None:
+            keep &= values >= float(low)
+        if high is not None:
+            keep &= values <= float(high)
+        return keep
+    decimals = map(as_decimal, results)
+    return np.fromiter(((value is not None and (low is None or value >= low) and (high is None or value <= high))
+                        for value in decimals), dtype=bool, count=len(results))
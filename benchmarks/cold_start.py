@@ -0,0 +1,54 @@
+"""
+Measures cold-start time of the single-operation CLI path in fresh interpreters.
+
+Run from the project root:
+
+    python -m benchmarks.cold_start [--runs 10]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+DISCOVERY_SNIPPET = (
+    "import time, main; start = time.perf_counter(); registry = main.discover_plugins(); "
+    "registry.get('add'); print(time.perf_counter() - start)"
+)
+
+def time_cli(runs: int) -> list:
+    """
+    Returns the wall-clock seconds of ``python main.py 1 2 add`` for each run.
+    """
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "main.py", "1", "2", "add"], check=True, capture_output=True)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+def time_discovery(runs: int) -> list:
+    """
+    Returns the seconds spent in discover_plugins plus the first dispatch, per fresh interpreter.
+    """
+    return [
+        float(subprocess.run([sys.executable, "-c", DISCOVERY_SNIPPET], check=True,
+                             capture_output=True, text=True).stdout.split()[-1])
+        for _ in range(runs)
+    ]
+
+def main():
+    """
+    Prints the median and best cold-start timings.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    for label, timings in (("main.py 1 2 add", time_cli(args.runs)),
+                           ("discover_plugins + first dispatch", time_discovery(args.runs))):
+        print(f"{label:<36} median {statistics.median(timings) * 1e3:8.2f} ms   best {min(timings) * 1e3:8.2f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Measures history append throughput as threads are added.
+
+Run from the project root:
+
+    python -m benchmarks.concurrent_append [--threads 1 2 4 8] [--records 200000]
+
+``records`` appends are split evenly over the threads. For each thread count
+it reports the aggregate appends per second of:
+
+- ``locked``: every append takes one shared lock around ``PandasFacade.append``,
+  the straightforward way to make the old store safe;
+- ``sharded``: ``Calculations.add_calculation``, which appends to a
+  per-thread shard and merges the shards on the next read; the final merge
+  is included in the timing.
+
+Appends are pure Python, so under the GIL neither variant runs appends in
+parallel; the comparison shows what the locking costs as threads contend.
+"""
+
+import argparse
+import threading
+import time
+from decimal import Decimal
+from app.core.calculation import Calculation
+from app.core.calculations import Calculations
+from app.plugins.add_command import AddCommand
+from app.utils.pandas_facade import PandasFacade
+
+def run_threads(threads: int, target) -> float:
+    """
+    Runs ``target(thread)`` on each thread at once and returns the elapsed seconds.
+    """
+    workers = [threading.Thread(target=target, args=(thread,)) for thread in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return time.perf_counter() - start
+
+def share(calculations: list, thread: int, threads: int) -> list:
+    """
+    Returns one thread's contiguous block of the calculations.
+    """
+    size = -(-len(calculations) // threads)
+    return calculations[thread * size:(thread + 1) * size]
+
+def time_locked(threads: int, calculations: list) -> float:
+    """
+    Returns seconds to append every calculation through one lock around a shared store.
+    """
+    facade, lock = PandasFacade(), threading.Lock()
+
+    def append(thread):
+        for calculation in share(calculations, thread, threads):
+            with lock:
+                facade.append(calculation.operation.operation_name, calculation.a, calculation.b,
+                              calculation.result)
+    return run_threads(threads, append)
+
+def time_sharded(threads: int, calculations: list) -> float:
+    """
+    Returns seconds to append every calculation through Calculations, including the final merge.
+    """
+    Calculations.clear_history()
+
+    def append(thread):
+        for calculation in share(calculations, thread, threads):
+            Calculations.add_calculation(calculation)
+    start = time.perf_counter()
+    run_threads(threads, append)
+    Calculations.summary()  # merges what is left in the shards
+    elapsed = time.perf_counter() - start
+    Calculations.clear_history()
+    return elapsed
+
+def main():
+    """
+    Prints aggregate append throughput for each thread count.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--records", type=int, default=200_000)
+    args = parser.parse_args()
+
+    command = AddCommand()
+    calculations = [Calculation(Decimal(index), Decimal(1), command, Decimal(index + 1))
+                    for index in range(args.records)]
+    print(f"{args.records} appends; thousands of appends per second")
+    print(f"{'threads':>8}{'locked':>10}{'sharded':>10}")
+    for threads in args.threads:
+        locked = args.records / time_locked(threads, calculations) / 1e3
+        sharded = args.records / time_sharded(threads, calculations) / 1e3
+        print(f"{threads:>8}{locked:>10.0f}{sharded:>10.0f}")
+
+if __name__ == "__main__":
+    main()
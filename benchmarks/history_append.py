@@ -0,0 +1,65 @@
+"""
+Benchmarks PandasFacade.add_record to show that appends stay flat as the history grows.
+
+Run from the project root:
+
+    python -m benchmarks.history_append [--sizes 1000 10000 100000 1000000] [--legacy]
+"""
+
+import argparse
+import time
+from decimal import Decimal
+import pandas as pd
+from app.utils.pandas_facade import PandasFacade
+
+DEFAULT_SIZES = [10**3, 10**4, 10**5, 10**6]
+LEGACY_MAX_SIZE = 10**4
+
+def make_record(index: int) -> dict:
+    """
+    Builds a deterministic calculation record for the given position.
+    """
+    num1, num2 = Decimal(index), Decimal(index % 97 + 1)
+    return {"operation": "add", "num1": num1, "num2": num2, "result": num1 + num2}
+
+def time_appends(size: int) -> float:
+    """
+    Returns the seconds needed to append ``size`` records and read the history once.
+    """
+    facade = PandasFacade()
+    start = time.perf_counter()
+    for index in range(size):
+        facade.add_record(make_record(index))
+    assert len(facade.dataframe) == size
+    return time.perf_counter() - start
+
+def time_legacy_appends(size: int) -> float:
+    """
+    Returns the seconds needed to append ``size`` records with one pd.concat per record.
+    """
+    dataframe = pd.DataFrame(columns=PandasFacade.COLUMNS)
+    start = time.perf_counter()
+    for index in range(size):
+        dataframe = pd.concat([dataframe, pd.DataFrame([make_record(index)])], ignore_index=True)
+    return time.perf_counter() - start
+
+def main():
+    """
+    Prints the total and per-append cost for each history size.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", nargs="+", type=int, default=DEFAULT_SIZES)
+    parser.add_argument("--legacy", action="store_true",
+                        help=f"also time the per-record concat path (sizes <= {LEGACY_MAX_SIZE})")
+    args = parser.parse_args()
+
+    print(f"{'records':>10} {'total (s)':>10} {'per append (us)':>16}")
+    for size in args.sizes:
+        elapsed = time_appends(size)
+        print(f"{size:>10} {elapsed:>10.3f} {elapsed / size * 1e6:>16.2f}")
+        if args.legacy and size <= LEGACY_MAX_SIZE:
+            legacy = time_legacy_appends(size)
+            print(f"{'  legacy':>10} {legacy:>10.3f} {legacy / size * 1e6:>16.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Compares load time and file size of the CSV and binary columnar history formats.
+
+Run from the project root:
+
+    python -m benchmarks.history_formats [--rows 1000000] [--directory /tmp]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from decimal import Decimal
+import pandas as pd
+from app.utils.history_formats import save_frame, load_frame
+
+OPERATIONS = ["add", "subtract", "multiply", "divide", "mean", "median", "mode"]
+
+def build_history(rows: int) -> pd.DataFrame:
+    """
+    Builds a deterministic history of ``rows`` Decimal calculations.
+    """
+    nums1 = [Decimal(index % 10007) / 8 for index in range(rows)]
+    nums2 = [Decimal(index % 101 + 1) for index in range(rows)]
+    return pd.DataFrame({
+        "operation": [OPERATIONS[index % len(OPERATIONS)] for index in range(rows)],
+        "num1": nums1,
+        "num2": nums2,
+        "result": [num1 + num2 for num1, num2 in zip(nums1, nums2)],
+    })
+
+def available_formats() -> list:
+    """
+    Returns the extensions that can be benchmarked in this environment.
+    """
+    formats = [".csv", ".npz"]
+    try:
+        import pyarrow  # pylint: disable=import-outside-toplevel,unused-import
+        formats += [".feather", ".parquet"]
+    except ImportError:
+        pass
+    return formats
+
+def main():
+    """
+    Saves the same history in every available format and prints size and load time.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=10**6)
+    parser.add_argument("--directory", default=tempfile.gettempdir())
+    args = parser.parse_args()
+
+    frame = build_history(args.rows)
+    print(f"{args.rows} rows")
+    print(f"{'format':>10} {'size (MB)':>10} {'save (s)':>9} {'load (s)':>9}  exact")
+    for extension in available_formats():
+        path = os.path.join(args.directory, f"history_benchmark{extension}")
+        start = time.perf_counter()
+        save_frame(frame, path)
+        saved = time.perf_counter() - start
+        start = time.perf_counter()
+        loaded = load_frame(path)
+        load = time.perf_counter() - start
+        exact = all(isinstance(value, Decimal) for value in loaded["result"].head(1000)) \
+            and loaded["result"].astype(str).equals(frame["result"].astype(str))
+        print(f"{extension:>10} {os.path.getsize(path) / 1e6:>10.1f} {saved:>9.2f} {load:>9.2f}  {exact}")
+        os.remove(path)
+
+if __name__ == "__main__":
+    main()
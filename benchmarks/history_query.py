@@ -0,0 +1,77 @@
+"""
+Compares indexed history queries with a full scan of the DataFrame.
+
+Run from the project root:
+
+    python -m benchmarks.history_query [--rows 1000000] [--repeat 5]
+
+A history of Decimal records is built, and for each query it reports the
+milliseconds of:
+
+- ``scan``: the hand-written pandas equivalent, comparing every row
+  (with ``sort_values`` and ``head`` for ``order by`` and ``limit``);
+- ``first``: ``PandasFacade.query`` on the first call, including building
+  any sorted index it needs;
+- ``indexed``: the same query once its indexes exist.
+"""
+
+import argparse
+import time
+from decimal import Decimal
+from app.utils.history_query import parse_query
+from app.utils.pandas_facade import PandasFacade
+
+OPERATIONS = ("add", "subtract", "multiply", "divide")
+
+QUERIES = {
+    "result > 9990": lambda frame: frame[frame["result"] > Decimal(9990)],
+    "operation = divide and num1 between 100 and 110":
+        lambda frame: frame[(frame["operation"] == "divide") & (frame["num1"] >= Decimal(100))
+                            & (frame["num1"] <= Decimal(110))],
+    "result >= 0 order by result desc limit 10":
+        lambda frame: frame[frame["result"] >= Decimal(0)].sort_values("result", ascending=False).head(10),
+}
+
+def build(rows: int) -> PandasFacade:
+    """
+    Returns a consolidated history of deterministic records.
+    """
+    facade = PandasFacade()
+    facade.add_records({
+        "operation": [OPERATIONS[index % 4] for index in range(rows)],
+        "num1": [Decimal(index % 9973) for index in range(rows)],
+        "num2": [Decimal(index % 97 + 1) for index in range(rows)],
+        "result": [Decimal(index * 7919 % 10007) for index in range(rows)],
+    })
+    facade.dataframe
+    return facade
+
+def timed(func) -> float:
+    """
+    Returns the run time of ``func`` in milliseconds.
+    """
+    start = time.perf_counter()
+    func()
+    return (time.perf_counter() - start) * 1e3
+
+def main():
+    """
+    Prints scan, first-call and indexed timings of each query.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    facade = build(args.rows)
+    print(f"{args.rows} rows; milliseconds per query")
+    print(f"{'scan':>10}{'first':>10}{'indexed':>10}  query")
+    for text, scan in QUERIES.items():
+        query = parse_query(text)
+        scan_ms = min(timed(lambda: scan(facade.dataframe)) for _ in range(args.repeat))  # pylint: disable=cell-var-from-loop
+        first_ms = timed(lambda: facade.query(*query))  # pylint: disable=cell-var-from-loop
+        indexed_ms = min(timed(lambda: facade.query(*query)) for _ in range(args.repeat))  # pylint: disable=cell-var-from-loop
+        print(f"{scan_ms:>10.2f}{first_ms:>10.2f}{indexed_ms:>10.3f}  {text}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Compares the exact Decimal numeric mode with the float64 fast-math mode.
+
+Run from the project root:
+
+    python -m benchmarks.numeric_modes [--rows 100000]
+
+For each mode it times parsing plus ``execute`` per plugin, recording
+``--rows`` results in the history and reading it back as a DataFrame, and
+evaluating ``--rows`` batch rows with ``process_chunk``. It also reports the
+memory used by the history's result column.
+"""
+
+import argparse
+import os
+import time
+from app.core.batch_runner import process_chunk
+from app.core.numeric_mode import NUMERIC_MODES, parse_number
+from app.core.plugin_registry import discover_registry
+from app.utils.pandas_facade import PandasFacade
+
+def operand_texts(rows: int) -> list:
+    """
+    Returns deterministic (num1, num2) operand strings with a few decimal places.
+    """
+    return [(f"{index % 9973 / 7:.4f}", f"{index % 97 + 1}.25") for index in range(rows)]
+
+def time_execute(command, operands, mode: str) -> float:
+    """
+    Returns seconds per call of parsing both operands and executing the command.
+    """
+    start = time.perf_counter()
+    for num1, num2 in operands:
+        command.execute(parse_number(num1, mode), parse_number(num2, mode))
+    return (time.perf_counter() - start) / len(operands)
+
+def time_history(command, operands, mode: str) -> tuple:
+    """
+    Returns seconds per record of appending results and building the DataFrame, and the result column size.
+    """
+    facade = PandasFacade()
+    values = [(parse_number(num1, mode), parse_number(num2, mode)) for num1, num2 in operands]
+    start = time.perf_counter()
+    for num1, num2 in values:
+        facade.add_record({"operation": command.operation_name, "num1": num1, "num2": num2,
+                           "result": command.execute(num1, num2)})
+    result = facade.dataframe["result"]
+    seconds = (time.perf_counter() - start) / len(values)
+    return seconds, result.memory_usage(deep=True, index=False)
+
+def main():
+    """
+    Prints per-mode timings for every plugin, the history store and the batch path.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    registry = discover_registry(os.path.join("app", "plugins"))
+    operands = operand_texts(args.rows)
+    print(f"{args.rows} rows; microseconds per row")
+    print(f"{'benchmark':<28}" + "".join(f"{mode:>12}" for mode in NUMERIC_MODES) + f"{'speed-up':>10}")
+
+    def report(name, timings):
+        print(f"{name:<28}" + "".join(f"{seconds * 1e6:>12.3f}" for seconds in timings)
+              + f"{timings[0] / timings[1]:>9.1f}x")
+
+    for operation in registry:
+        command = registry[operation]
+        report(f"execute {operation}", [time_execute(command, operands, mode) for mode in NUMERIC_MODES])
+
+    history = [time_history(registry["add"], operands, mode) for mode in NUMERIC_MODES]
+    report("history add + dataframe", [seconds for seconds, _ in history])
+    print(f"{'result column (MB)':<28}" + "".join(f"{size / 1e6:>12.1f}" for _, size in history))
+
+    chunk = [(operation, num1, num2) for operation in registry for num1, num2 in operands[:args.rows // len(registry)]]
+    batch = []
+    for mode in NUMERIC_MODES:
+        start = time.perf_counter()
+        process_chunk(chunk, registry, mode)
+        batch.append((time.perf_counter() - start) / len(chunk))
+    report("batch process_chunk", batch)
+
+if __name__ == "__main__":
+    main()
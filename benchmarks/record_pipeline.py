@@ -0,0 +1,106 @@
+"""
+Compares the per-operation cost of the record pipeline before and after compact Calculation records.
+
+Run from the project root:
+
+    python -m benchmarks.record_pipeline [--operations 1000000]
+
+The ``legacy`` pipeline reproduces the earlier behaviour: the result is
+computed by ``command.execute``, computed again by ``Calculation.operate``
+on a ``__dict__``-backed record, and stored through a per-record dict. The
+``single`` pipeline computes the result once into a ``__slots__`` record and
+appends its values straight into the history columns. For each pipeline it
+reports CPU microseconds per operation, and the bytes per operation held by
+the retained Calculation objects, measured with tracemalloc.
+"""
+
+import argparse
+import os
+import time
+import tracemalloc
+from decimal import Decimal
+from app.core.calculation import Calculation
+from app.core.plugin_registry import discover_registry
+from app.utils.pandas_facade import PandasFacade
+
+class LegacyCalculation:
+    """
+    The earlier dict-backed Calculation, kept here only as the benchmark baseline.
+    """
+
+    def __init__(self, a, b, operation):
+        self.a = a
+        self.b = b
+        self.operation = operation
+        self.result = None
+
+    def operate(self):
+        self.result = self.operation.execute(self.a, self.b)
+        return self.result
+
+def operands(count: int) -> list:
+    """
+    Returns deterministic Decimal operand pairs.
+    """
+    return [(Decimal(index % 9973), Decimal(index % 97 + 1)) for index in range(count)]
+
+def run_legacy(command, pairs, facade: PandasFacade, keep: list):
+    """
+    Executes, re-executes via operate(), and stores each record through a dict.
+    """
+    for num1, num2 in pairs:
+        command.execute(num1, num2)
+        calculation = LegacyCalculation(num1, num2, command)
+        calculation.operate()
+        facade.add_record({"operation": command.operation_name, "num1": calculation.a,
+                           "num2": calculation.b, "result": calculation.result})
+        keep.append(calculation)
+
+def run_single(command, pairs, facade: PandasFacade, keep: list):
+    """
+    Executes once into a slotted record and appends its values directly.
+    """
+    name = command.operation_name
+    for num1, num2 in pairs:
+        calculation = Calculation(num1, num2, command, command.execute(num1, num2))
+        facade.append(name, calculation.a, calculation.b, calculation.result)
+        keep.append(calculation)
+
+def record_bytes(factory, command, pairs) -> float:
+    """
+    Returns the traced bytes per retained record created by ``factory``.
+    """
+    keep = []
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for num1, num2 in pairs:
+        keep.append(factory(num1, num2, command))
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return size / len(pairs)
+
+def main():
+    """
+    Prints CPU time and record memory per operation for both pipelines.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--operations", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    command = discover_registry(os.path.join("app", "plugins"))["multiply"]
+    pairs = operands(args.operations)
+    print(f"{args.operations} multiply operations")
+    print(f"{'pipeline':<10}{'cpu us/op':>12}{'record bytes/op':>18}")
+    timings = {}
+    for name, run, factory in (("legacy", run_legacy, LegacyCalculation), ("single", run_single, Calculation)):
+        keep = []
+        start = time.process_time()
+        run(command, pairs, PandasFacade(), keep)
+        timings[name] = (time.process_time() - start) / len(pairs)
+        del keep
+        memory = record_bytes(factory, command, pairs)
+        print(f"{name:<10}{timings[name] * 1e6:>12.3f}{memory:>18.1f}")
+    print(f"CPU saving: {1 - timings['single'] / timings['legacy']:.1%} per operation")
+
+if __name__ == "__main__":
+    main()
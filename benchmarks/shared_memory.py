@@ -0,0 +1,94 @@
+"""
+Compares the shared-memory batch transport with the pickling transports of the worker pool.
+
+Run from the project root:
+
+    python -m benchmarks.shared_memory [--rows 10000 100000 1000000] [--workers 4]
+
+For each size it reports microseconds per row of:
+
+- ``queue``: the existing per-operation 'mp' path, one ``submit`` per row,
+  where the command puts its result on a queue-like sink that is pickled
+  back (measured on at most ``--queue-rows`` rows, it is far slower);
+- ``pickled``: the batch split into one slice per worker, with operand and
+  result arrays pickled through the pool's pipes;
+- ``shared``: ``execute_batch_shared``, where only block names and row
+  ranges are pickled;
+- ``inline``: ``execute_batch`` in this process, for reference.
+"""
+
+import argparse
+import os
+import time
+import numpy as np
+from app.core.plugin_registry import discover_registry
+from app.core.worker_pool import WorkerPool
+
+def _pickled_slice(command, nums1, nums2):
+    """
+    Evaluates one pickled slice inside a worker and returns the pickled result.
+    """
+    return command.execute_batch(nums1, nums2)
+
+def time_pickled(pool: WorkerPool, command, nums1, nums2) -> float:
+    """
+    Returns seconds to evaluate the batch as one pickled slice per worker.
+    """
+    bounds = np.linspace(0, len(nums1), pool.size + 1).astype(int)
+    tasks = [(command, nums1[start:stop], nums2[start:stop]) for start, stop in zip(bounds, bounds[1:])]
+    start = time.perf_counter()
+    parts = pool._pool.starmap(_pickled_slice, tasks)  # pylint: disable=protected-access
+    np.concatenate([part.values for part in parts])
+    return time.perf_counter() - start
+
+def best(func, repeat: int) -> float:
+    """
+    Returns the best of ``repeat`` timings of ``func``.
+    """
+    return min(func() for _ in range(repeat))
+
+def timed(func):
+    """
+    Wraps ``func`` so calling the wrapper returns its run time in seconds.
+    """
+    def run():
+        start = time.perf_counter()
+        func()
+        return time.perf_counter() - start
+    return run
+
+def main():
+    """
+    Prints per-row timings of every transport for each batch size.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--queue-rows", type=int, default=2_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    command = discover_registry(os.path.join("app", "plugins"))["divide"]
+    pool = WorkerPool(args.workers)
+    pool.submit(command, 1.0, 1.0)  # start the workers outside the timings
+    print(f"divide on float64, {pool.size} workers; microseconds per row")
+    print(f"{'rows':>10}{'queue':>10}{'pickled':>10}{'shared':>10}{'inline':>10}")
+    try:
+        for rows in args.rows:
+            nums1 = np.linspace(1, 1000, rows)
+            nums2 = np.linspace(1000, 0, rows)
+            queue_rows = min(rows, args.queue_rows)
+            queue = timed(lambda: [pool.submit(command, a, b)  # pylint: disable=cell-var-from-loop
+                                   for a, b in zip(nums1[:queue_rows], nums2[:queue_rows])])
+            timings = [
+                best(queue, 1) / queue_rows,
+                best(lambda: time_pickled(pool, command, nums1, nums2), args.repeat) / rows,  # pylint: disable=cell-var-from-loop
+                best(timed(lambda: pool.execute_batch_shared(command, nums1, nums2)), args.repeat) / rows,  # pylint: disable=cell-var-from-loop
+                best(timed(lambda: command.execute_batch(nums1, nums2)), args.repeat) / rows,  # pylint: disable=cell-var-from-loop
+            ]
+            print(f"{rows:>10}" + "".join(f"{seconds * 1e6:>10.3f}" for seconds in timings))
+    finally:
+        pool.shutdown()
+
+if __name__ == "__main__":
+    main()
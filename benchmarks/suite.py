@@ -0,0 +1,155 @@
+"""
+Times every plugin and the history store operations, and optionally checks the timings against a baseline.
+
+Run from the project root:
+
+    python -m benchmarks.suite [--sizes 1000 10000 100000 1000000] [--output results.json]
+    python -m benchmarks.suite --compare baseline.json [--tolerance 0.25]
+
+Every result is the best per-call time in seconds over ``--repeat`` runs.
+With ``--compare``, the run exits with status 1 if any benchmark present in
+both files is slower than its baseline by more than the tolerance.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from decimal import Decimal
+import numpy as np
+from app.core.plugin_registry import discover_registry
+from app.utils.pandas_facade import PandasFacade
+from benchmarks.history_formats import build_history
+
+DEFAULT_SIZES = [10**3, 10**4, 10**5, 10**6]
+PLUGIN_CALLS = 10_000
+BATCH_ROWS = 100_000
+APPENDS = 1_000
+FORMATS = [".csv", ".npz"]
+
+def best_time(func, calls: int, repeat: int, setup=None) -> float:
+    """
+    Returns the lowest average seconds per call of ``func`` over ``repeat`` runs of ``calls`` calls.
+
+    :param setup: Optional callable run before each timed run, outside the timing.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        for _ in range(calls):
+            func()
+        best = min(best, (time.perf_counter() - start) / calls)
+    return best
+
+def bench_plugins(repeat: int) -> dict:
+    """
+    Times ``execute`` on Decimal operands and ``execute_batch`` per row on float64 arrays for every plugin.
+    """
+    results = {}
+    registry = discover_registry(os.path.join("app", "plugins"))
+    num1, num2 = Decimal("12.5"), Decimal("3.25")
+    nums1 = np.linspace(1, 1000, BATCH_ROWS)
+    nums2 = np.linspace(1000, 1, BATCH_ROWS)
+    for operation in registry:
+        command = registry[operation]
+        results[f"plugin.{operation}.execute"] = best_time(
+            lambda command=command: command.execute(num1, num2), PLUGIN_CALLS, repeat)
+        results[f"plugin.{operation}.execute_batch"] = best_time(
+            lambda command=command: command.execute_batch(nums1, nums2), 1, repeat) / BATCH_ROWS
+    return results
+
+def bench_facade(size: int, repeat: int, directory: str) -> dict:
+    """
+    Times the history store operations on a history of ``size`` rows.
+    """
+    results = {}
+    history = build_history(size)
+    facade = PandasFacade()
+    record = {"operation": "add", "num1": Decimal(1), "num2": Decimal(2), "result": Decimal(3)}
+
+    def reset():
+        facade.dataframe = history.copy()
+
+    def append_and_read():
+        for _ in range(APPENDS):
+            facade.add_record(record)
+        len(facade.dataframe)
+    results[f"facade.add_record@{size}"] = best_time(append_and_read, 1, repeat, setup=reset) / APPENDS
+
+    reset()
+    results[f"facade.filter_by_operation@{size}"] = best_time(
+        lambda: facade.filter_by_operation("divide"), 10, repeat)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        results[f"facade.delete_record@{size}"] = best_time(
+            lambda: facade.delete_record(size // 2), 1, repeat, setup=reset)
+
+    reset()
+    for extension in FORMATS:
+        path = os.path.join(directory, f"benchmark_history{extension}")
+        results[f"facade.save_to_file{extension}@{size}"] = best_time(
+            lambda path=path: facade.save_to_file(path), 1, repeat)
+        results[f"facade.load_from_file{extension}@{size}"] = best_time(
+            lambda path=path: facade.load_from_file(path), 1, repeat)
+        os.remove(path)
+    return results
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """
+    Returns the names of benchmarks slower than their baseline by more than ``tolerance``.
+
+    :param results: Benchmark name mapped to seconds for this run.
+    :param baseline: Benchmark name mapped to seconds for the stored baseline.
+    :param tolerance: Allowed relative slowdown, e.g. 0.25 for 25 %.
+    """
+    return [
+        name for name, seconds in results.items()
+        if baseline.get(name) and seconds > baseline[name] * (1 + tolerance)
+    ]
+
+def main():
+    """
+    Runs the suite, prints and stores the results, and compares them with a baseline if requested.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="JSON file to write the results to")
+    parser.add_argument("--compare", metavar="BASELINE", help="JSON results to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--directory", default=tempfile.gettempdir())
+    args = parser.parse_args()
+
+    results = bench_plugins(args.repeat)
+    for size in args.sizes:
+        results.update(bench_facade(size, args.repeat, args.directory))
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as handle:
+            baseline = json.load(handle)["results"]
+    for name, seconds in results.items():
+        change = f"{seconds / baseline[name] - 1:+8.1%}" if baseline.get(name) else ""
+        print(f"{name:<45} {seconds * 1e6:>14.3f} us {change}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            json.dump({"python": platform.python_version(), "sizes": args.sizes, "results": results},
+                      handle, indent=2)
+
+    if args.compare:
+        regressions = compare(results, baseline, args.tolerance)
+        for name in regressions:
+            print(f"REGRESSION {name}: {results[name]:.3g}s vs baseline {baseline[name]:.3g}s")
+        if regressions:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
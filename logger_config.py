@@ -1,15 +1,103 @@
+import atexit
 import logging
 import logging.config
+import logging.handlers
 import os
+import queue
+import threading
+import time
+
+# Logger for the per-operation messages written on the calculator's hot path
+OPERATIONS_LOGGER = "calculator.operations"
+
+_listener = None
+
+class SampleFilter(logging.Filter):
+    """
+    Passes one in every `every` records below WARNING; warnings and errors always pass.
+    """
+
+    def __init__(self, every: int):
+        super().__init__()
+        self.every = max(1, every)
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        with self._lock:
+            self._count += 1
+            return (self._count - 1) % self.every == 0
+
+class RateLimitFilter(logging.Filter):
+    """
+    Token bucket allowing at most `per_second` records below WARNING per second.
+
+    The bucket holds at least one token, so rates below 1 still let one
+    record through every 1 / `per_second` seconds.
+    """
+
+    def __init__(self, per_second: float, clock=time.monotonic):
+        super().__init__()
+        self.per_second = per_second
+        self.capacity = max(1.0, per_second)
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.per_second)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue handler that leaves message formatting to the listener thread.
+
+    The stock QueueHandler formats each record in the calling thread so it can
+    be pickled; the queue here never leaves the process, so the record is
+    queued as-is and the caller only pays for creating it.
+    """
+
+    def prepare(self, record):
+        return record
+
+def _env_flag(name):
+    return os.getenv(name, "").lower() in ("1", "true", "yes", "on")
+
+def stop_logging():
+    """
+    Stops the background listener, writing out any queued records.
+    """
+    global _listener  # pylint: disable=global-statement
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+atexit.register(stop_logging)
 
 # Configure logging with dynamic settings
-def configure_logging(log_level=None):
+def configure_logging(log_level=None, queued=None, sample_every=None, rate_limit=None):
+    global _listener  # pylint: disable=global-statement
     os.makedirs("logs", exist_ok=True)  # Ensure the logs directory exists
+    stop_logging()
 
     # Load environment variables for logging configuration if not explicitly passed
     log_level = log_level or os.getenv("LOG_LEVEL", "INFO").upper()  # Default to INFO if not set
     log_file = os.getenv("LOG_FILE", "logs/application.log")  # Default log file location
     log_format = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    queued = _env_flag("LOG_QUEUE") if queued is None else queued
+    sample_every = sample_every or int(os.getenv("LOG_SAMPLE_EVERY", "1"))
+    rate_limit = rate_limit or float(os.getenv("LOG_RATE_LIMIT", "0"))
 
     # Configure logging settings
     logging_config = {
@@ -42,4 +130,25 @@ def configure_logging(log_level=None):
     }
 
     # Apply logging configuration
-    logging.config.dictConfig(logging_config)
\ No newline at end of file
+    logging.config.dictConfig(logging_config)
+
+    # Sampling and rate limiting apply to per-operation messages only
+    operations_logger = logging.getLogger(OPERATIONS_LOGGER)
+    for existing in list(operations_logger.filters):
+        operations_logger.removeFilter(existing)
+    if sample_every > 1:
+        operations_logger.addFilter(SampleFilter(sample_every))
+    if rate_limit > 0:
+        operations_logger.addFilter(RateLimitFilter(rate_limit))
+
+    # In queued mode, callers only enqueue records; a background thread formats and writes them
+    if queued:
+        root = logging.getLogger()
+        handlers = list(root.handlers)
+        records = queue.SimpleQueue()
+        for handler in handlers:
+            root.removeHandler(handler)
+        root.addHandler(DeferredQueueHandler(records))
+        _listener = logging.handlers.QueueListener(records, *handlers, respect_handler_level=True)
+        _listener.start()
+    return _listener
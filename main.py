@@ -1,120 +1,380 @@
 # Refactored REPL and Main Entry Point
 
-import multiprocessing
 import sys
-import importlib
 import os
 import logging
-from decimal import Decimal, InvalidOperation
-from collections import OrderedDict
-from dotenv import load_dotenv
+import time
+from decimal import InvalidOperation
 from app.core.calculations import Calculations
 from app.core.calculation import Calculation
-from logger_config import configure_logging
+from app.core.expression import ExpressionEngine, ExpressionError
+from app.core.batch_runner import run_batch, DEFAULT_CHUNK_SIZE, MP_CHUNK_SIZE
+from app.core.metrics import get_metrics
+from app.core.numeric_mode import NUMERIC_MODES, get_numeric_mode, set_numeric_mode, parse_number
+from app.core.plugin_registry import PluginRegistry, discover_registry
+from app.core.result_cache import get_result_cache
+from app.core.statistics import iter_values
+from app.core.worker_pool import get_worker_pool, shutdown_worker_pool
+from app.utils.history_query import QueryError, parse_query
+from logger_config import configure_logging, OPERATIONS_LOGGER
+
+# Per-operation messages; sampled or rate limited by LOG_SAMPLE_EVERY / LOG_RATE_LIMIT
+operation_log = logging.getLogger(OPERATIONS_LOGGER)
 
 # Load environment settings
 def initialize_environment():
-    load_dotenv()
-    env_settings = {key: value for key, value in os.environ.items()}
+    dotenv_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.env')
+    if os.path.exists(dotenv_path):
+        from dotenv import load_dotenv  # Deferred: only needed when a .env file exists
+        load_dotenv(dotenv_path)
     logging.info("Environment variables successfully loaded.")
-    return env_settings
+    return os.environ
+
+# Trailing per-call flags: 'mp' and a numeric mode ('decimal' or 'float')
+CALL_FLAGS = ('mp',) + NUMERIC_MODES
 
-# Discover and load plugin commands
+def split_flags(flags):
+    flags = [flag.lower() for flag in flags]
+    numeric_mode = next((flag for flag in flags if flag in NUMERIC_MODES), None)
+    return 'mp' in flags, numeric_mode
+
+# Discover plugin commands; modules are imported on first dispatch
 def discover_plugins():
-    command_registry = OrderedDict()
     plugins_directory = os.path.join('app', 'plugins')
 
     if not os.path.exists(plugins_directory):
-        logging.warning(f"Plugins directory does not exist: {plugins_directory}")
-        return command_registry
+        logging.warning("Plugins directory does not exist: %s", plugins_directory)
+        return PluginRegistry({"plugins": {}})
 
-    for file in os.listdir(plugins_directory):
-        if file.endswith('_command.py'):
-            try:
-                module_name = file[:-3]
-                module = importlib.import_module(f'app.plugins.{module_name}')
-                command_class = getattr(module, module_name[:-8].capitalize() + 'Command')
-                command_registry[module_name[:-8]] = command_class()
-                logging.info(f"Plugin loaded: {module_name}")
-            except (ImportError, AttributeError) as e:
-                logging.error(f"Error loading plugin {module_name}: {e}")
-
-    return command_registry
+    registry = discover_registry(plugins_directory)
+    logging.info("Plugins available: %s", ", ".join(registry))
+    return registry
 
 # Logging decorator for function execution
 def execution_logger(func):
     def wrapper(*args, **kwargs):
-        logging.info(f"Running {func.__name__}")
+        operation_log.info("Running %s", func.__name__)
         try:
             return func(*args, **kwargs)
         except Exception as err:
-            logging.error(f"Error in {func.__name__}: {err}")
+            logging.error("Error in %s: %s", func.__name__, err)
             raise
     return wrapper
 
 @execution_logger
-def execute_operation(num1, num2, operation_key, command_registry, multiprocess=False):
-    logging.debug(f"Starting operation: {num1} {operation_key} {num2}")
+def execute_operation(num1, num2, operation_key, command_registry, multiprocess=False, numeric_mode=None):
+    operation_log.debug("Starting operation: %s %s %s", num1, operation_key, num2)
+    # None unless METRICS / METRICS_FILE is set, so disabled metrics cost one check
+    metrics = get_metrics()
     try:
-        dec_num1, dec_num2 = map(Decimal, [num1, num2])
+        operand1, operand2 = (parse_number(value, numeric_mode) for value in (num1, num2))
         command = command_registry.get(operation_key)
 
         if not command:
-            logging.warning(f"Operation '{operation_key}' not found.")
+            logging.warning("Operation '%s' not found.", operation_key)
             print(f"Invalid operation: {operation_key}")
             return
 
+        cache = get_result_cache()
+        started = time.perf_counter() if metrics else None
         if multiprocess:
-            result_queue = multiprocessing.Queue()
-            process = multiprocessing.Process(
-                target=command.execute_multiprocessing,
-                args=(dec_num1, dec_num2, result_queue)
-            )
-            process.start()
-            process.join()
-
-            if not result_queue.empty():
-                result = result_queue.get()
-                logging.info(f"Multiprocess result: {result}")
-                print(f"{num1} {operation_key} {num2} (multiprocessing) = {result}")
-            else:
+            key = cache.key(command, operand1, operand2) if cache else None
+            result = cache.lookup(key) if cache else None
+            if result is None:
+                result = get_worker_pool().submit(command, operand1, operand2)
+                if cache and result is not None and not isinstance(result, Exception):
+                    cache.store(key, result)
+            if metrics:
+                metrics.record_operation(operation_key, time.perf_counter() - started, 'mp')
+
+            if result is None:
                 logging.error("Multiprocess queue returned no result.")
                 print("Multiprocessing error.")
+                return
+            operation_log.info("Multiprocess result: %s", result)
+            print(f"{num1} {operation_key} {num2} (multiprocessing) = {result}")
         else:
-            result = command.execute(dec_num1, dec_num2)
-            logging.info(f"Result: {result}")
+            try:
+                result = cache.execute(command, operand1, operand2) if cache else command.execute(operand1, operand2)
+            finally:
+                if metrics:
+                    metrics.record_operation(operation_key, time.perf_counter() - started)
+            operation_log.info("Result: %s", result)
             print(f"{num1} {operation_key} {num2} = {result}")
 
-        calculation = Calculation(dec_num1, dec_num2, command)
-        calculation.operate()
-        Calculations.add_calculation(calculation)
-        logging.debug("Calculation logged in history.")
+        if isinstance(result, Exception):
+            raise result
+        # The result is computed exactly once above; the record reuses it
+        Calculations.add_calculation(Calculation(operand1, operand2, command, result))
+        operation_log.debug("Calculation logged in history.")
 
-    except InvalidOperation:
-        logging.error(f"Invalid numeric input: {num1}, {num2}")
+    except InvalidOperation as error:
+        if metrics:
+            metrics.record_error(operation_key, error)
+        logging.error("Invalid numeric input: %s, %s", num1, num2)
         print(f"Invalid numbers: {num1}, {num2}")
     except Exception as error:
-        logging.error(f"Unexpected error: {error}")
+        if metrics:
+            metrics.record_error(operation_key, error)
+        logging.error("Unexpected error: %s", error)
         print(f"An error occurred: {error}")
 
+# Run an n-ary statistic over the given numbers, or streamed from `file <path> [column]`
+@execution_logger
+def execute_aggregate(operation_key, arguments, command_registry):
+    command = command_registry.get(operation_key)
+    if not hasattr(command, "execute_many"):
+        print(f"Operation '{operation_key}' takes exactly two numbers.")
+        return
+    try:
+        if arguments[0].lower() == 'file':
+            if len(arguments) not in (2, 3):
+                print("Format: <operation> file <path> [column]")
+                return
+            values = iter_values(*arguments[1:])
+            label = " ".join(arguments)
+        else:
+            values = map(parse_number, arguments)
+            label = f"of {len(arguments)} values"
+        result = command.execute_many(values)
+        operation_log.info("Result: %s", result)
+        print(f"{operation_key} {label} = {result}")
+    except InvalidOperation:
+        logging.error("Invalid numeric input for %s", operation_key)
+        print(f"Invalid numbers in input for {operation_key}.")
+    except FileNotFoundError:
+        print(f"File not found: {arguments[1]}")
+    except KeyError as error:
+        print(f"Column not found: {error}")
+    except ValueError as error:
+        print(f"An error occurred: {error}")
+
+# Evaluate a prefix expression such as `divide (add 1 2) (multiply 3 (add 1 2))`;
+# `... with x=1,2,3 y=4,5,6` evaluates it once per row of variable bindings
+@execution_logger
+def execute_expression(text, engine):
+    expression, _, binding_text = text.partition(' with ')
+    try:
+        bindings = dict(binding.split('=', 1) for binding in binding_text.split())
+        if any(',' in values for values in bindings.values()):
+            columns = {name: values.split(',') for name, values in bindings.items()}
+            result = engine.evaluate_batch(expression, columns)
+            for row, (value, failed) in enumerate(zip(*result)):
+                print(f"{expression} [{row}] = {'error' if failed else value}")
+            return
+        steps = []
+        result = engine.evaluate(expression, bindings, steps=steps)
+        # Each distinct subexpression is recorded once, in evaluation order
+        if steps:
+            Calculations.add_calculations(*zip(*steps))
+        operation_log.info("Expression result: %s", result)
+        print(f"{expression} = {result}")
+    except InvalidOperation:
+        logging.error("Invalid numeric input in expression: %s", text)
+        print(f"Invalid numbers in expression: {text}")
+    except (ExpressionError, ArithmeticError) as error:
+        print(f"An error occurred: {str(error) or type(error).__name__}")
+    except ValueError:
+        print("Format: <expression> [with name=value[,value...] ...]")
+
+# With `mp`, large float64 groups are split across the worker pool through shared memory
+@execution_logger
+def execute_batch_file(input_path, output_path, command_registry, multiprocess=False):
+    chunk_size = int(os.getenv("BATCH_CHUNK_SIZE", MP_CHUNK_SIZE if multiprocess else DEFAULT_CHUNK_SIZE))
+    try:
+        stats = run_batch(input_path, output_path, command_registry, chunk_size,
+                          pool=get_worker_pool() if multiprocess else None)
+    except FileNotFoundError:
+        logging.error("Batch input not found: %s", input_path)
+        print(f"File not found: {input_path}")
+        return
+    except (OSError, ValueError) as error:  # unreadable input or unwritable output, e.g. not UTF-8
+        logging.error("Batch failed: %s", error)
+        print(f"Batch failed: {error}")
+        return
+    logging.info("Batch finished: %s", stats)
+    print(stats)
+
+# Serve JSONL requests until interrupted; asyncio is only imported for this mode
+@execution_logger
+def start_server(command_registry, address=None):
+    import asyncio
+    from app.core.server import DEFAULT_ADDRESS, serve
+    address = address or os.getenv("SERVE_ADDRESS", DEFAULT_ADDRESS)
+    def ready(_listener):
+        print(f"Serving JSONL requests on {address} (Ctrl+C to stop)")
+    try:
+        asyncio.run(serve(command_registry, address, ready))
+    except KeyboardInterrupt:
+        print("Server stopped.")
+
+# `load_history <path> [append] [operation=add,divide] [min=<n>] [max=<n>] [chunk=<rows>]`;
+# any option streams the file in chunks and keeps only the matching rows. Options are taken off
+# the end of the line, so the path may contain spaces
+def load_history(text):
+    path, options = text.strip(), []
+    while not os.path.exists(path) and ' ' in path:
+        rest, last = path.rsplit(maxsplit=1)
+        if last != 'append' and '=' not in last:
+            break
+        path, options = rest, [last, *options]
+    if not path:
+        print("Format: load_history <path> [append] [operation=a,b] [min=<n>] [max=<n>] [chunk=<rows>]")
+        return
+    if not os.path.exists(path):
+        print(f"File not found: {path}")
+        return
+    settings = dict(option.split('=', 1) if '=' in option else (option, True) for option in options)
+    unknown = set(settings) - {'append', 'operation', 'min', 'max', 'chunk'}
+    if unknown:
+        print(f"Unknown load_history option: {', '.join(sorted(unknown))}")
+        return
+    try:
+        loaded = Calculations.load_history(
+            path,
+            chunk_size=int(settings['chunk']) if 'chunk' in settings else None,
+            operations=settings['operation'].split(',') if 'operation' in settings else None,
+            min_result=parse_number(settings['min'], 'decimal') if 'min' in settings else None,
+            max_result=parse_number(settings['max'], 'decimal') if 'max' in settings else None,
+            append='append' in settings
+        )
+    except (InvalidOperation, ValueError) as e:
+        print(f"Invalid load_history option: {e}")
+        return
+    print(f"History {'appended' if 'append' in settings else 'loaded'} from {path} ({loaded} rows)")
+
+# `history [offset] [limit]` and `filter_with_operation <op> [offset] [limit]` open a cursor over the
+# history and print its first page; `next` prints the following page
+HISTORY_PAGE_SIZE = 20
+
+def open_history_cursor(arguments, operation=None, empty_message="No history available."):
+    try:
+        offset = int(arguments[0]) if arguments else 0
+        limit = int(arguments[1]) if len(arguments) > 1 else HISTORY_PAGE_SIZE
+        cursor = Calculations.iter_history(offset, limit, operation)
+    except ValueError as e:
+        print(f"Invalid page: {e}")
+        return None
+    return show_next_page(cursor, empty_message)
+
+def show_next_page(cursor, empty_message="No more entries."):
+    page = next(cursor, None) if cursor is not None else None
+    if page is None:
+        print(empty_message)
+        return None
+    print(page)
+    print(f"Rows {page.index[0]}..{page.index[-1]}; type 'next' for more.")
+    return cursor
+
+# `query <predicates> [order by <column> [asc|desc]] [limit <n>]`, e.g.
+# `query result > 10 and operation = divide order by result desc limit 5`
+def run_query(text):
+    if not text.strip():
+        print("Format: query <column> <op> <value> [and ...] [order by <column> [asc|desc]] [limit <n>]")
+        return
+    try:
+        rows = Calculations.query(*parse_query(text))
+    except QueryError as e:
+        print(f"Invalid query: {e}")
+        return
+    print("No matching entries." if rows.empty else rows)
+
+# Print per-operation metrics, or `stats export <path>` to write them in Prometheus text format
+def show_stats(arguments):
+    metrics = get_metrics()
+    if metrics is None:
+        print("Metrics disabled (set METRICS=1 or METRICS_FILE to enable).")
+    elif arguments[:1] == ['export'] and len(arguments) == 2:
+        metrics.export(arguments[1])
+        print(f"Metrics written to {arguments[1]}")
+    elif arguments:
+        print("Format: stats [export <path>]")
+    else:
+        stats = metrics.stats()
+        if not stats["operations"] and not stats["history"]:
+            print("No metrics recorded yet.")
+        for op_name, paths in stats["operations"].items():
+            errors = paths.pop("errors", {})
+            for path, latency in paths.items():
+                print(f"- {op_name} [{path}]: {latency['count']} calls, mean {latency['mean_ms']:.4f} ms, "
+                      f"p50 <= {latency['p50_ms']:g} ms, p99 <= {latency['p99_ms']:g} ms")
+            if errors:
+                print(f"- {op_name} errors: " + ", ".join(f"{name}={count}" for name, count in errors.items()))
+        if stats["history"]:
+            print("- history: " + ", ".join(f"{event}={count}" for event, count in stats["history"].items()))
+
 @execution_logger
 def start_repl(command_registry):
     print("Calculator REPL started. Type 'exit' to leave.")
-    print("Append 'mp' to use multiprocessing.")
+    print("Append 'mp' to use multiprocessing, 'float' or 'decimal' to pick the numeric mode.")
+    print("mean, median and mode also take any number of values, or 'file <path> [column]'.")
+    print("Nested expressions use parentheses, e.g. 'divide (add 1 2) (multiply 3 (add 1 2))'.")
+    engine = ExpressionEngine(command_registry)
+    cursor = None  # paging position of the last `history` or `filter_with_operation`
 
     while True:
         user_input = input(">> ")
         if user_input.lower() == 'exit':
+            shutdown_worker_pool()
             print("Closing REPL.")
             break
+        elif user_input.lower() == 'pool':
+            pool = get_worker_pool()
+            if not pool.started:
+                print(f"Worker pool not started ({pool.size} workers configured).")
+            for pid, usage in pool.utilisation().items():
+                print(f"- worker {pid}: {usage['tasks']} tasks, "
+                      f"{usage['busy_seconds']:.4f}s busy, {usage['utilisation']:.1%} utilised")
+            continue
+        elif user_input.lower() in ('cache', 'cache clear'):
+            cache = get_result_cache()
+            if cache is None:
+                print("Result cache disabled (set RESULT_CACHE_SIZE to enable).")
+            elif user_input.lower() == 'cache clear':
+                cache.clear()
+                print("Result cache cleared.")
+            else:
+                stats = cache.stats()
+                print(f"Result cache: {stats['size']}/{stats['max_size']} entries, "
+                      f"{stats['hits']} hits, {stats['misses']} misses, "
+                      f"{stats['evictions']} evictions ({stats['hit_rate']:.1%} hit rate)")
+            continue
+        elif user_input.lower().split()[:1] == ['numeric']:
+            _, *mode = user_input.split()
+            if mode:
+                try:
+                    set_numeric_mode(mode[0])
+                except ValueError as e:
+                    print(e)
+                    continue
+            print(f"Numeric mode: {get_numeric_mode()}")
+            continue
+        elif user_input.lower().split()[:1] == ['query']:
+            run_query(user_input[5:])
+            continue
+        elif user_input.lower().split()[:1] == ['stats']:
+            show_stats(user_input.split()[1:])
+            continue
         elif user_input.lower() == 'menu':
             print("Available operations:")
             for cmd in command_registry:
-                print(f"- {cmd}")
+                description = command_registry.describe(cmd)
+                print(f"- {cmd}" + (f": {description}" if description else ""))
+            continue
+        elif user_input.lower().split()[:1] == ['history']:
+            cursor = open_history_cursor(user_input.split()[1:])
             continue
-        elif user_input.lower() == 'history':
-            history = Calculations.get_all_calculations()
-            print("No history available." if history.empty else history)
+        elif user_input.lower() == 'next':
+            cursor = show_next_page(cursor)
+            continue
+        elif user_input.lower() == 'summary':
+            summary = Calculations.summary()
+            if not summary:
+                print("No history available.")
+            for op_name, stats in summary.items():
+                variance = "n/a" if stats["variance"] is None else f"{stats['variance']:.6g}"
+                print(f"- {op_name}: count={stats['count']} sum={stats['sum']} min={stats['min']} "
+                      f"max={stats['max']} mean={stats['mean']:.6g} variance={variance}")
             continue
         elif user_input.lower() == 'clear_history':
             Calculations.clear_history()
@@ -126,12 +386,7 @@ def start_repl(command_registry):
             print(f"History saved to {path}")
             continue
         elif user_input.startswith('load_history'):
-            _, path = user_input.split(maxsplit=1)
-            if os.path.exists(path):
-                Calculations.load_history(path)
-                print(f"History loaded from {path}")
-            else:
-                print(f"File not found: {path}")
+            load_history(user_input[len('load_history'):])
             continue
         elif user_input.startswith('delete_history'):
             _, idx = user_input.split(maxsplit=1)
@@ -141,43 +396,71 @@ def start_repl(command_registry):
                 print(f"Error deleting entry: {e}")
             continue
         elif user_input.startswith('filter_with_operation'):
-            _, op_name = user_input.split(maxsplit=1)
-            filtered = Calculations.filter_with_operation(op_name)
-            print(f"No entries found for operation '{op_name}'." if filtered.empty else filtered)
+            _, op_name, *page = user_input.split()
+            cursor = open_history_cursor(page, op_name, f"No entries found for operation '{op_name}'.")
+            continue
+
+        elif '(' in user_input or user_input.lower().startswith('expr '):
+            execute_expression(user_input[5:] if user_input.lower().startswith('expr ') else user_input, engine)
             continue
 
         parts = user_input.split()
-        if len(parts) not in [3, 4]:
-            print("Format: <operation> <num1> <num2> [mp]")
+        if len(parts) >= 2 and parts[0] in command_registry and (
+                parts[1].lower() == 'file' or len(parts) == 2 or (len(parts) > 3 and parts[3].lower() not in CALL_FLAGS)):
+            execute_aggregate(parts[0], parts[1:], command_registry)
+            continue
+        if len(parts) < 3 or any(flag.lower() not in CALL_FLAGS for flag in parts[3:]):
+            print("Format: <operation> <num1> <num2> [mp] [decimal|float]")
             continue
 
         op, val1, val2 = parts[:3]
-        use_mp = len(parts) == 4 and parts[3].lower() == 'mp'
+        use_mp, numeric_mode = split_flags(parts[3:])
 
         if op not in command_registry:
             print(f"Operation '{op}' not recognized.")
             continue
 
-        execute_operation(val1, val2, op, command_registry, use_mp)
+        execute_operation(val1, val2, op, command_registry, use_mp, numeric_mode)
 
 @execution_logger
 def main():
     commands = discover_plugins()
+    if os.getenv("HISTORY_COMPACT_RATIO"):
+        Calculations.configure_compaction(float(os.getenv("HISTORY_COMPACT_RATIO")))
+    log_path = os.getenv("HISTORY_LOG")
+    if log_path:
+        Calculations.enable_log(
+            log_path,
+            fsync=os.getenv("HISTORY_LOG_FSYNC", "batch"),
+            flush_every=int(os.getenv("HISTORY_LOG_FLUSH_EVERY", "100")),
+            compact_every=int(os.getenv("HISTORY_LOG_COMPACT_EVERY", "10000"))
+        )
+        logging.info("History write-ahead log enabled: %s", log_path)
 
-    if len(sys.argv) == 4:
-        _, val1, val2, op = sys.argv
-        execute_operation(val1, val2, op, commands)
-    elif len(sys.argv) == 5:
-        _, val1, val2, op, flag = sys.argv
-        execute_operation(val1, val2, op, commands, flag.lower() == 'mp')
-    elif len(sys.argv) == 2 and sys.argv[1].lower() == 'repl':
-        start_repl(commands)
-    else:
-        print("Usage: python run_app.py <num1> <num2> <operation> [mp] | python run_app.py repl")
+    try:
+        if len(sys.argv) in (4, 5) and sys.argv[1].lower() == 'batch' and sys.argv[4:] in ([], ['mp']):
+            _, _, input_path, output_path, *flags = sys.argv
+            execute_batch_file(input_path, output_path, commands, bool(flags))
+        elif len(sys.argv) == 2 and sys.argv[1].lower() == 'repl':
+            start_repl(commands)
+        elif len(sys.argv) in (2, 3) and sys.argv[1].lower() == 'serve':
+            start_server(commands, *sys.argv[2:])
+        elif len(sys.argv) >= 4 and all(flag.lower() in CALL_FLAGS for flag in sys.argv[4:]):
+            _, val1, val2, op, *flags = sys.argv
+            execute_operation(val1, val2, op, commands, *split_flags(flags))
+        else:
+            print("Usage: python run_app.py <num1> <num2> <operation> [mp] [decimal|float] | python run_app.py repl"
+                  " | python run_app.py batch <input> <output> [mp] | python run_app.py serve [host:port|unix:/path]")
+    finally:
+        shutdown_worker_pool()
+        Calculations.disable_log()
+        metrics_path = os.getenv("METRICS_FILE")
+        if metrics_path and get_metrics():
+            get_metrics().export(metrics_path)
 
 if __name__ == '__main__':
     env = initialize_environment()
     configure_logging(log_level=env.get("LOG_LEVEL", "INFO").upper())
-    logging.info(f"Environment mode: {env.get('ENVIRONMENT', 'Development')}")
+    logging.info("Environment mode: %s", env.get('ENVIRONMENT', 'Development'))
     logging.info("Calculator Application Launched.")
     main()
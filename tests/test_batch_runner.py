@@ -0,0 +1,117 @@
+# tests/test_batch_runner.py
+import csv
+import json
+import pytest
+from decimal import Decimal
+from app.core import batch_runner
+from app.core.batch_runner import process_chunk, run_batch, iter_chunks
+from app.core.calculations import Calculations
+from app.plugins.add_command import AddCommand
+from app.plugins.divide_command import DivideCommand
+from app.plugins.multiply_command import MultiplyCommand
+
+@pytest.fixture
+def registry():
+    Calculations.clear_history()
+    return {"add": AddCommand(), "divide": DivideCommand(), "multiply": MultiplyCommand()}
+
+def write_csv(path, rows):
+    with open(path, "w", newline="") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(["operation", "num1", "num2"])
+        writer.writerows(rows)
+
+def test_iter_chunks_bounds_chunk_size():
+    assert [len(chunk) for chunk in iter_chunks(range(7), 3)] == [3, 3, 1]
+
+def test_run_batch_csv_to_csv(registry, tmp_path):
+    input_path, output_path = tmp_path / "ops.csv", tmp_path / "out" / "results.csv"
+    write_csv(input_path, [["add", "1", "2"], ["divide", "1", "0"], ["pow", "2", "3"],
+                           ["multiply", "x", "2"], ["divide", "9", "3"], ["multiply", "2.5", "2"]])
+
+    stats = run_batch(str(input_path), str(output_path), registry, chunk_size=4)
+    assert (stats.rows, stats.failed) == (6, 3)
+    assert stats.rows_per_second > 0
+
+    with open(output_path, newline="") as handle:
+        rows = list(csv.DictReader(handle))
+    assert [row["result"] for row in rows] == ["3", "", "", "", "3", "5.0"]
+    assert rows[1]["error"] == "Division by zero"
+    assert rows[2]["error"] == "Invalid operation: pow"
+    assert rows[3]["error"] == "Invalid numbers: x, 2"
+
+    history = Calculations.get_all_calculations()
+    assert list(history["operation"]) == ["add", "divide", "multiply"]
+    assert list(history["result"]) == [Decimal(3), Decimal(3), Decimal("5.0")]
+
+def test_run_batch_overflowing_row_is_an_error_row(registry, tmp_path):
+    input_path, output_path = tmp_path / "ops.csv", tmp_path / "results.csv"
+    write_csv(input_path, [["add", "1", "2"], ["multiply", "1E+999999", "1E+999999"], ["multiply", "2", "3"]])
+
+    stats = run_batch(str(input_path), str(output_path), registry)
+    assert (stats.rows, stats.failed) == (3, 1)
+    with open(output_path, newline="") as handle:
+        rows = list(csv.DictReader(handle))
+    assert [(row["result"], row["error"]) for row in rows] == [("3", ""), ("", "Undefined result"), ("6", "")]
+    assert list(Calculations.get_all_calculations()["result"]) == [Decimal(3), Decimal(6)]
+
+def test_process_chunk_survives_an_unmasked_override(registry):
+    class RaisingMultiply(MultiplyCommand):
+        def execute_batch(self, nums1, nums2):
+            return [num1 * num2 for num1, num2 in zip(nums1, nums2)]  # no masking
+
+    output, records = process_chunk([("multiply", "1E+999999", "1E+999999"), ("multiply", "2", "3")],
+                                    {"multiply": RaisingMultiply()}, "decimal")
+    assert [row[4] for row in output] == ["Undefined result", ""]
+    assert records == [("multiply", Decimal(2), Decimal(3), Decimal(6))]
+
+def test_run_batch_jsonl(registry, tmp_path):
+    input_path, output_path = tmp_path / "ops.jsonl", tmp_path / "results.jsonl"
+    input_path.write_text('{"operation": "add", "num1": "1", "num2": "2"}\n\n'
+                          '{"operation": "multiply", "num1": 3, "num2": 4}\n')
+
+    stats = run_batch(str(input_path), str(output_path), registry)
+    assert (stats.rows, stats.failed) == (2, 0)
+    results = [json.loads(line) for line in output_path.read_text().splitlines()]
+    assert [row["result"] for row in results] == ["3", "12"]
+    assert len(Calculations.get_all_calculations()) == 2
+
+def test_run_batch_jsonl_malformed_lines_become_error_rows(registry, tmp_path):
+    input_path, output_path = tmp_path / "ops.jsonl", tmp_path / "results.jsonl"
+    input_path.write_text('{"operation": "add", "num1": "1", "num2": "2"}\n'
+                          '{"operation": "add", "num1": \n'
+                          '[1, 2]\n'
+                          '{"operation": "divide", "num1": 4, "num2": 0}\n'
+                          '{"operation": "multiply", "num1": 3, "num2": 4}\n')
+
+    stats = run_batch(str(input_path), str(output_path), registry)
+    assert (stats.rows, stats.failed) == (5, 3)
+    results = [json.loads(line) for line in output_path.read_text().splitlines()]
+    assert [row["error"] for row in results] == [
+        "", "Invalid JSON object on line 2", "Invalid JSON object on line 3", "Division by zero", ""]
+    assert [row["result"] for row in results] == ["3", "", "", "", "12"]
+    assert len(Calculations.get_all_calculations()) == 2
+
+def test_run_batch_missing_input(registry, tmp_path):
+    with pytest.raises(FileNotFoundError):
+        run_batch(str(tmp_path / "missing.csv"), str(tmp_path / "out.csv"), registry)
+
+class RecordingPool:
+    def __init__(self):
+        self.batches = []
+
+    def execute_batch_shared(self, command, nums1, nums2):
+        self.batches.append((command.operation_name, len(nums1)))
+        return command.execute_batch(nums1, nums2)
+
+def test_process_chunk_sends_large_float_groups_to_pool(registry, monkeypatch):
+    monkeypatch.setattr(batch_runner, "SHARED_MEMORY_MIN_ROWS", 3)
+    pool = RecordingPool()
+    chunk = [("add", "1", "2")] * 3 + [("divide", "1", "0")] * 2
+    output, records = process_chunk(chunk, registry, "float", pool)
+    assert pool.batches == [("add", 3)]
+    assert [row[3] for row in output] == ["3.0", "3.0", "3.0", "", ""]
+    assert len(records) == 3
+
+    process_chunk(chunk, registry, "decimal", pool)
+    assert pool.batches == [("add", 3)]
@@ -72,3 +72,12 @@ def test_divide_operation(divide_calculation):
 def test_divide_by_zero_operation(divide_by_zero_calculation):
     with pytest.raises(ValueError, match="Cannot divide by zero"):
         divide_by_zero_calculation.operate()
+
+def test_precomputed_result_is_kept():
+    calculation = Calculation(Decimal(2), Decimal(3), MockAddCommand(), Decimal(5))
+    assert calculation.result == Decimal(5)
+
+def test_calculation_has_no_instance_dict(add_calculation):
+    assert not hasattr(add_calculation, "__dict__")
+    with pytest.raises(AttributeError):
+        add_calculation.extra = 1
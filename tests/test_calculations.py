@@ -7,6 +7,7 @@ from app.plugins.add_command import AddCommand
 from app.plugins.subtract_command import SubtractCommand
 from app.plugins.multiply_command import MultiplyCommand
 from app.plugins.divide_command import DivideCommand
+from app.utils.pandas_facade import PandasFacade
 
 @pytest.fixture
 def setup_calculations():
@@ -97,4 +98,143 @@ def test_delete_invalid_index(setup_calculations, capsys):
 def test_get_all_calculations_empty(setup_calculations):
     # Verify history is empty
     history = Calculations.get_all_calculations()
-    assert history.empty
\ No newline at end of file
+    assert history.empty
+
+
+def record_results(command, results):
+    for result in results:
+        calculation = Calculation(Decimal(result), Decimal(0), command)
+        calculation.operate()
+        Calculations.add_calculation(calculation)
+
+def test_summary_tracks_adds_and_deletes(setup_calculations):
+    record_results(AddCommand(), [4, 1, 7])
+    record_results(MultiplyCommand(), [0])
+    Calculations.add_calculations(["add"], [Decimal(10)], [Decimal(0)], [Decimal(10)])
+
+    add = Calculations.summary()["add"]
+    assert (add["count"], add["sum"], add["min"], add["max"], add["mean"]) == (4, 22, 1, 10, Decimal("5.5"))
+    assert add["variance"] == Decimal(15)
+    assert Calculations.summary()["multiply"]["variance"] is None
+
+    Calculations.delete_history(4)  # the maximum of 'add'
+    Calculations.delete_history(1)  # the minimum of 'add'
+    add = Calculations.summary()["add"]
+    assert (add["count"], add["sum"], add["min"], add["max"]) == (2, 11, 4, 7)
+    assert add["variance"] == Decimal("4.5")
+
+    Calculations.delete_history(2)
+    assert "multiply" not in Calculations.summary()
+
+def test_summary_rebuilt_on_load_and_clear(setup_calculations, tmp_path):
+    record_results(SubtractCommand(), [3, 5])
+    path = str(tmp_path / "history.csv")
+    Calculations.save_history(path)
+    Calculations.clear_history()
+    assert Calculations.summary() == {}
+
+    Calculations.load_history(path)
+    record_results(SubtractCommand(), [1])
+    Calculations.delete_history(2)
+    subtract = Calculations.summary()["subtract"]
+    assert (subtract["count"], subtract["sum"], subtract["mean"], subtract["variance"]) == (2, 8, 4, 2)
+
+def test_configure_compaction_validates_ratio():
+    Calculations.configure_compaction(0.5)
+    assert Calculations._facade.compact_ratio == 0.5
+    with pytest.raises(ValueError):
+        Calculations.configure_compaction(0)
+    Calculations.configure_compaction(PandasFacade.COMPACT_RATIO)
+
+def test_iter_history_pages_and_records():
+    Calculations.clear_history()
+    Calculations.add_calculations(["add", "divide"] * 5, [Decimal(value) for value in range(10)],
+                                  [Decimal(1)] * 10, [Decimal(value + 1) for value in range(10)])
+    pages = list(Calculations.iter_history(offset=2, page_size=3))
+    assert [list(page.index) for page in pages] == [[2, 3, 4], [5, 6, 7], [8, 9]]
+    records = list(Calculations.iter_records(operation="divide", page_size=2))
+    assert [record[0] for record in records] == [1, 3, 5, 7, 9]
+    assert records[0][1:] == ("divide", Decimal(1), Decimal(1), Decimal(2))
+
+    cursor = Calculations.iter_history(page_size=4)
+    next(cursor)
+    Calculations.delete_history(0)  # the cursor counts records, so the next page starts one later
+    assert list(next(cursor)["num1"]) == [Decimal(value) for value in range(5, 9)]
+    with pytest.raises(ValueError):
+        Calculations.iter_history(page_size=0)
+    Calculations.clear_history()
+
+def test_concurrent_appends_lose_no_records(monkeypatch):
+    import sys
+    import threading
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # switch threads as often as possible
+    monkeypatch.setattr(Calculations, "SHARD_MERGE_SIZE", 64)
+    Calculations.clear_history()
+    threads, per_thread = 8, 2000
+    start = threading.Barrier(threads + 1)
+    done = threading.Event()
+
+    def append(thread):
+        start.wait()
+        for value in range(per_thread):
+            Calculations.add_calculation(Calculation(Decimal(thread), Decimal(value), AddCommand(),
+                                                     Decimal(thread + value)))
+
+    def read():
+        start.wait()
+        while not done.is_set():
+            Calculations.summary()
+            next(Calculations.iter_history(page_size=5), None)
+
+    try:
+        workers = [threading.Thread(target=append, args=(thread,)) for thread in range(threads)]
+        reader = threading.Thread(target=read)
+        for worker in workers + [reader]:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        done.set()
+        reader.join()
+    finally:
+        sys.setswitchinterval(interval)
+
+    history = Calculations.get_all_calculations()
+    assert len(history) == threads * per_thread
+    assert Calculations.summary()["add"]["count"] == threads * per_thread
+    for thread, rows in history.groupby("num1"):
+        assert list(rows["num2"]) == [Decimal(value) for value in range(per_thread)], thread
+    Calculations.clear_history()
+
+def test_summary_skips_non_finite_results(setup_calculations):
+    for num1 in ("NaN", "2", "Infinity", "5"):
+        calculation = Calculation(Decimal(num1), Decimal(1), AddCommand())
+        calculation.operate()
+        Calculations.add_calculation(calculation)
+
+    assert len(Calculations.get_all_calculations()) == 4
+    add = Calculations.summary()["add"]
+    assert (add["count"], add["sum"], add["min"], add["max"]) == (2, 9, 3, 6)
+    Calculations.delete_history(0)
+    assert Calculations.summary()["add"]["count"] == 2
+
+def test_shard_merge_handles_non_finite_results_and_keeps_failed_batches(setup_calculations, monkeypatch):
+    from app.core import statistics
+    for num1 in ("NaN", "2"):
+        calculation = Calculation(Decimal(num1), Decimal(1), AddCommand())
+        calculation.operate()
+        Calculations.add_calculation(calculation)  # waits in this thread's shard until the next read
+    assert list(Calculations.get_all_calculations()["num1"].astype(str)) == ["NaN", "2"]
+    assert Calculations.summary()["add"]["count"] == 1
+
+    Calculations.add_calculation(Calculation(Decimal(4), Decimal(1), AddCommand(), Decimal(5)))
+    bulk = statistics.RunningAggregate.from_values
+
+    def fail_once(values):
+        monkeypatch.setattr(statistics.RunningAggregate, "from_values", bulk)
+        raise ArithmeticError("boom")
+    monkeypatch.setattr(statistics.RunningAggregate, "from_values", staticmethod(fail_once))
+    with pytest.raises(ArithmeticError):
+        Calculations.summary()
+    assert Calculations.summary()["add"]["count"] == 2
+    assert len(Calculations.get_all_calculations()) == 3
@@ -2,6 +2,7 @@
 import pytest
 from decimal import Decimal
 from app.core.command import Command
+import numpy as np
 from multiprocessing import Queue
 
 class MockCommand(Command):
@@ -37,4 +38,26 @@ def test_mock_command_execute_multiprocessing():
     # Perform an execution using multiprocessing and check the result
     mock_command.execute_multiprocessing(Decimal(2), Decimal(3), result_queue)
     result = result_queue.get()  # Get the result from the queue
-    assert result == Decimal(5)
\ No newline at end of file
+    assert result == Decimal(5)
+
+class FailingCommand(MockCommand):
+    operation_name = "failing"
+
+    def execute(self, num1: Decimal, num2: Decimal) -> Decimal:
+        if num2 == 0:
+            raise ZeroDivisionError("no zero")
+        return num1 + num2
+
+def test_execute_batch_falls_back_to_execute():
+    batch = MockCommand().execute_batch([Decimal(1), Decimal(2)], [Decimal(3), Decimal(4)])
+    assert list(batch.values) == [Decimal(4), Decimal(6)]
+    assert not batch.mask.any()
+
+def test_execute_batch_fallback_masks_arithmetic_errors():
+    batch = FailingCommand().execute_batch([Decimal(1), Decimal(2)], [Decimal(0), Decimal(4)])
+    assert list(batch.mask) == [True, False]
+    assert list(batch.values) == [None, Decimal(6)]
+
+    batch = FailingCommand().execute_batch(np.array([1.0, 2.0]), np.array([0.0, 4.0]))
+    assert batch.values.dtype == np.float64
+    assert np.isnan(batch.values[0]) and batch.values[1] == 6.0
@@ -0,0 +1,92 @@
+# tests/test_expression.py
+import math
+import pytest
+from decimal import Decimal
+from app.core.expression import ExpressionEngine, ExpressionError
+from app.plugins.add_command import AddCommand
+from app.plugins.divide_command import DivideCommand
+from app.plugins.multiply_command import MultiplyCommand
+from app.plugins.subtract_command import SubtractCommand
+
+class CountingAdd(AddCommand):
+    def __init__(self):
+        self.calls = 0
+
+    def execute(self, a, b):
+        self.calls += 1
+        return super().execute(a, b)
+
+@pytest.fixture
+def engine():
+    return ExpressionEngine({"add": CountingAdd(), "divide": DivideCommand(),
+                             "multiply": MultiplyCommand(), "subtract": SubtractCommand()})
+
+def test_evaluate_nested_expression(engine):
+    assert engine.evaluate("subtract (multiply 2 5) (add 1 2)") == Decimal("7")
+
+def test_common_subexpressions_are_computed_once(engine):
+    plan = engine.compile("divide (add 1 2) (multiply 3 (add 1 2))")
+    assert plan.tree_size == 9
+    assert len(plan) == 6
+    assert plan.evaluate() == Decimal(1) / Decimal(3)
+    assert engine.registry["add"].calls == 1
+
+def test_commutative_operands_share_a_node(engine):
+    plan = engine.compile("multiply (add x 1) (add 1 x)")
+    assert len(plan) == 4
+    assert plan.evaluate({"x": "2"}) == Decimal("9")
+
+def test_steps_record_each_operation_once(engine):
+    steps = []
+    engine.evaluate("multiply (add 1 2) (add 2 1)", steps=steps)
+    assert steps == [("add", Decimal(1), Decimal(2), Decimal(3)), ("multiply", Decimal(3), Decimal(3), Decimal(9))]
+
+def test_plans_are_cached_by_normalised_text(engine):
+    first = engine.compile("add 1 (multiply 2 3)")
+    assert engine.compile("  add 1 ( multiply 2 3 ) ") is first
+    assert (engine.hits, engine.misses) == (1, 1)
+
+def test_plan_cache_is_bounded():
+    engine = ExpressionEngine({"add": AddCommand()}, cache_size=2)
+    engine.compile("add 1 1")
+    engine.compile("add 2 2")
+    engine.compile("add 3 3")
+    assert len(engine._plans) == 2
+    assert "add 1 1" not in engine._plans
+
+@pytest.mark.parametrize("text, message", [
+    ("", "Empty expression"),
+    ("(add 1", "Incomplete expression"),
+    ("add 1 2 3", "Unexpected token"),
+    ("add 1 2)", "Unexpected token"),
+    ("add 1 $", "Invalid token"),
+    (")", "Unexpected"),
+])
+def test_malformed_expressions(engine, text, message):
+    with pytest.raises(ExpressionError, match=message):
+        engine.compile(text)
+
+def test_unbound_variable(engine):
+    with pytest.raises(ExpressionError, match="Unbound variable: y"):
+        engine.evaluate("add x y", {"x": 1})
+
+def test_division_by_zero_propagates(engine):
+    with pytest.raises(ZeroDivisionError):
+        engine.evaluate("add 1 (divide 1 0)")
+
+def test_float_mode(engine):
+    assert engine.evaluate("divide x 4", {"x": "1"}, numeric_mode="float") == 0.25
+
+def test_evaluate_batch_decimal(engine):
+    result = engine.evaluate_batch("add x (multiply y y)", {"x": ["1", "2", "3"], "y": ["2", "3", "4"]})
+    assert list(result.values) == [Decimal(5), Decimal(11), Decimal(19)]
+    assert not result.mask.any()
+
+def test_evaluate_batch_masks_failed_rows(engine):
+    result = engine.evaluate_batch("add 1 (divide x y)", {"x": [1, 2, 3], "y": [2, 0, 4]}, numeric_mode="float")
+    assert list(result.mask) == [False, True, False]
+    assert result.values[0] == 1.5 and math.isnan(result.values[1]) and result.values[2] == 1.75
+
+def test_evaluate_batch_rejects_uneven_bindings(engine):
+    with pytest.raises(ExpressionError, match="same number"):
+        engine.evaluate_batch("add x y", {"x": [1, 2], "y": [1]})
@@ -0,0 +1,114 @@
+# tests/test_history_formats.py
+import pytest
+import numpy as np
+import pandas as pd
+from decimal import Decimal
+from app.core.calculations import Calculations
+from app.utils.history_formats import save_frame, load_frame, file_format, iter_frames
+
+@pytest.fixture
+def frame():
+    return pd.DataFrame({
+        "operation": ["add", "divide", "add", "multiply"],
+        "num1": [Decimal("1.50"), Decimal("1"), Decimal("-0"), Decimal("1E+30")],
+        "num2": [Decimal("2"), Decimal("3"), Decimal("0.1"), Decimal("2")],
+        "result": [Decimal("3.50"), Decimal("0.3333333333333333333333333333"), Decimal("0.1"), Decimal("2E+30")],
+    })
+
+def test_file_format_by_extension():
+    assert file_format("history.NPZ") == ".npz"
+    assert file_format("history.parquet") == ".parquet"
+    assert file_format("history.csv") == ".csv"
+    assert file_format("history.txt") == ".csv"
+
+def test_npz_round_trip_is_exact(frame, tmp_path):
+    path = str(tmp_path / "history.npz")
+    save_frame(frame, path)
+    loaded = load_frame(path)
+    assert list(loaded.columns) == ["operation", "num1", "num2", "result"]
+    assert list(loaded["operation"]) == list(frame["operation"])
+    for column in ("num1", "num2", "result"):
+        assert [str(value) for value in loaded[column]] == [str(value) for value in frame[column]]
+        assert all(isinstance(value, Decimal) for value in loaded[column])
+
+def test_npz_stores_dictionary_encoded_operations(frame, tmp_path):
+    path = str(tmp_path / "history.npz")
+    save_frame(frame, path)
+    with np.load(path) as archive:
+        assert sorted(archive["operation.categories"]) == ["add", "divide", "multiply"]
+        assert archive["operation.codes"].dtype.kind == "i"
+
+def test_npz_keeps_float_columns_native(tmp_path):
+    path = str(tmp_path / "floats.npz")
+    save_frame(pd.DataFrame({"operation": ["add"], "num1": [1.5], "num2": [2.0], "result": [3.5]}), path)
+    loaded = load_frame(path)
+    assert loaded["num1"].dtype == np.float64
+    assert loaded["result"].iloc[0] == 3.5
+
+@pytest.mark.parametrize("extension", [".npz", ".feather", ".parquet"])
+def test_round_trip_keeps_missing_and_float_values(tmp_path, extension):
+    if extension != ".npz":
+        pytest.importorskip("pyarrow")
+    path = str(tmp_path / f"mixed{extension}")
+    save_frame(pd.DataFrame({"operation": ["add", "divide", "add"],
+                             "num1": [Decimal("1.0"), 0.1, Decimal(2)],
+                             "num2": [Decimal(1), Decimal(0), Decimal(3)],
+                             "result": [Decimal("2.0"), None, 5.0]}), path)
+    loaded = load_frame(path)
+    assert [type(value) for value in loaded["num1"]] == [Decimal, float, Decimal]
+    assert list(loaded["num1"]) == [Decimal("1.0"), 0.1, Decimal(2)]
+    assert list(loaded["result"]) == [Decimal("2.0"), None, 5.0]
+    assert all(isinstance(value, Decimal) for value in loaded["num2"])
+    assert list(pd.concat(iter_frames(path, 2))["result"]) == [Decimal("2.0"), None, 5.0]
+
+def test_npz_history_with_missing_result_loads(tmp_path):
+    Calculations.clear_history()
+    Calculations.add_calculations(["add", "divide"], [Decimal(1), Decimal(1)], [Decimal(2), Decimal(0)],
+                                  [Decimal(3), None])
+    path = str(tmp_path / "history.npz")
+    Calculations.save_history(path)
+    Calculations.clear_history()
+    Calculations.load_history(path)
+    assert list(Calculations.get_all_calculations()["result"]) == [Decimal(3), None]
+    Calculations.clear_history()
+
+def test_npz_round_trip_empty(tmp_path):
+    path = str(tmp_path / "empty.npz")
+    save_frame(pd.DataFrame(columns=["operation", "num1", "num2", "result"]), path)
+    assert load_frame(path).empty
+
+@pytest.mark.parametrize("extension", [".feather", ".parquet"])
+def test_arrow_round_trip_is_exact(frame, tmp_path, extension):
+    pytest.importorskip("pyarrow")
+    path = str(tmp_path / f"history{extension}")
+    save_frame(frame, path)
+    loaded = load_frame(path)
+    assert [str(value) for value in loaded["result"]] == [str(value) for value in frame["result"]]
+
+@pytest.mark.parametrize("extension", [".csv", ".npz", ".feather", ".parquet"])
+def test_iter_frames_reads_bounded_chunks(frame, tmp_path, extension):
+    if extension in (".feather", ".parquet"):
+        pytest.importorskip("pyarrow")
+    path = str(tmp_path / f"history{extension}")
+    save_frame(frame, path)
+    chunks = list(iter_frames(path, 3))
+    assert [len(chunk) for chunk in chunks] == [3, 1]
+    assert list(pd.concat(chunks)["operation"]) == list(frame["operation"])
+    if extension != ".csv":
+        assert chunks[1]["result"].iloc[0] == Decimal("2E+30")
+
+def test_iter_frames_rejects_bad_chunk_size(frame, tmp_path):
+    path = str(tmp_path / "history.npz")
+    save_frame(frame, path)
+    with pytest.raises(ValueError):
+        next(iter_frames(path, 0))
+
+def test_save_and_load_history_binary(tmp_path):
+    Calculations.clear_history()
+    Calculations.add_calculations(["add"], [Decimal("0.1")], [Decimal("0.2")], [Decimal("0.3")])
+    path = str(tmp_path / "history.npz")
+    Calculations.save_history(path)
+    Calculations.clear_history()
+    Calculations.load_history(path)
+    assert Calculations.get_all_calculations().iloc[0]["result"] == Decimal("0.3")
+    Calculations.clear_history()
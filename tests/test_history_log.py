@@ -0,0 +1,117 @@
+# tests/test_history_log.py
+import pytest
+from decimal import Decimal
+from app.core.calculation import Calculation
+from app.core.calculations import Calculations
+from app.plugins.add_command import AddCommand
+from app.utils.history_log import HistoryLog
+
+@pytest.fixture
+def log_path(tmp_path):
+    Calculations.clear_history()
+    yield tmp_path / "history.log"
+    Calculations.disable_log()
+    Calculations.clear_history()
+
+def add(a, b):
+    calculation = Calculation(Decimal(a), Decimal(b), AddCommand())
+    calculation.operate()
+    Calculations.add_calculation(calculation)
+
+def test_history_log_batches_writes(tmp_path):
+    path = tmp_path / "batched.log"
+    log = HistoryLog(str(path), fsync="batch", flush_every=3)
+    log.append({"type": "clear"})
+    log.append({"type": "clear"})
+    assert path.read_text() == ""
+    log.append({"type": "clear"})
+    assert len(path.read_text().splitlines()) == 3
+    log.close()
+
+def test_history_log_rejects_unknown_policy(tmp_path):
+    with pytest.raises(ValueError, match="Unknown fsync policy"):
+        HistoryLog(str(tmp_path / "bad.log"), fsync="sometimes")
+
+def test_history_log_ignores_torn_tail(tmp_path):
+    path = tmp_path / "torn.log"
+    path.write_text('{"type": "clear"}\n{"type": "ad')
+    assert list(HistoryLog.read(str(path))) == [{"type": "clear"}]
+    log = HistoryLog(str(path), fsync="always")
+    log.append({"type": "delete", "index": 0})
+    log.close()
+    assert list(HistoryLog.read(str(path))) == [{"type": "clear"}, {"type": "delete", "index": 0}]
+
+def test_log_replays_adds_deletes_and_clears(log_path):
+    Calculations.enable_log(str(log_path), fsync="never", flush_every=100)
+    add(1, 2)
+    Calculations.clear_history()
+    add(3, 4)
+    add(5, 6)
+    add(7, 8)
+    Calculations.delete_history(1)
+    Calculations.disable_log()
+
+    assert [entry["type"] for entry in HistoryLog.read(str(log_path))] == ["add", "clear", "add", "add", "add", "delete"]
+
+    Calculations.clear_history()
+    Calculations.enable_log(str(log_path))
+    history = Calculations.get_all_calculations()
+    assert list(history["result"]) == [Decimal(7), Decimal(15)]
+
+def test_invalid_delete_is_not_logged(log_path):
+    Calculations.enable_log(str(log_path), fsync="always")
+    add(1, 2)
+    Calculations.delete_history(5)
+    assert [entry["type"] for entry in HistoryLog.read(str(log_path))] == ["add"]
+
+def test_compaction_folds_log_into_snapshot(log_path):
+    Calculations.enable_log(str(log_path), fsync="always", compact_every=4)
+    for value in range(5):
+        add(value, 1)
+    Calculations.delete_history(0)
+
+    entries = list(HistoryLog.read(str(log_path)))
+    assert entries[0]["type"] == "snapshot"
+    assert len(entries) < 4
+    assert (log_path.parent / entries[0]["file"]).exists()
+
+    Calculations.disable_log()
+    Calculations.enable_log(str(log_path))
+    assert list(Calculations.get_all_calculations()["num1"]) == [1, 2, 3, 4]
+
+def test_compaction_removes_previous_snapshot(log_path):
+    Calculations.enable_log(str(log_path), fsync="never")
+    add(1, 1)
+    Calculations.compact_log()
+    first = list(HistoryLog.read(str(log_path)))[0]["file"]
+    add(2, 2)
+    Calculations.compact_log()
+    second = list(HistoryLog.read(str(log_path)))[0]["file"]
+    assert first != second
+    assert not (log_path.parent / first).exists()
+    assert (log_path.parent / second).exists()
+
+def test_log_replays_float_mode_values(log_path):
+    Calculations.enable_log(str(log_path), fsync="never")
+    calculation = Calculation(0.1, 0.2, AddCommand())
+    calculation.operate()
+    Calculations.add_calculation(calculation)
+    add(1, 2)
+    Calculations.disable_log()
+
+    Calculations.clear_history()
+    Calculations.enable_log(str(log_path))
+    results = list(Calculations.get_all_calculations()["result"])
+    assert results == [0.1 + 0.2, Decimal(3)]
+    assert isinstance(results[0], float) and isinstance(results[1], Decimal)
+
+def test_log_replays_missing_results(log_path):
+    Calculations.enable_log(str(log_path), fsync="never")
+    Calculations.add_calculations(["divide"], [Decimal(1)], [Decimal(0)], [None])
+    add(1, 2)
+    Calculations.disable_log()
+    assert '"result": null' in log_path.read_text()
+
+    Calculations.clear_history()
+    Calculations.enable_log(str(log_path))
+    assert list(Calculations.get_all_calculations()["result"]) == [None, Decimal(3)]
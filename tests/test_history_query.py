@@ -0,0 +1,133 @@
+# tests/test_history_query.py
+import random
+import pytest
+from decimal import Decimal
+from app.core.calculations import Calculations
+from app.utils.history_query import Predicate, QueryError, SortedIndex, matches, parse_query, predicate
+from app.utils.pandas_facade import PandasFacade
+
+def test_parse_query_predicates_order_and_limit():
+    query = parse_query("where result > 10 and num1 between -1 and 2.5 and operation in add, divide "
+                        "order by result desc limit 5")
+    assert query.where == (
+        Predicate("result", ">", Decimal(10)),
+        Predicate("num1", "between", (Decimal(-1), Decimal("2.5"))),
+        Predicate("operation", "in", ("add", "divide")),
+    )
+    assert (query.order_by, query.descending, query.limit) == ("result", True, 5)
+    assert parse_query("result>=3") == parse_query("result >= 3")
+    assert parse_query("order by num2") == parse_query("ORDER BY num2 asc")
+
+@pytest.mark.parametrize("text", [
+    "result >", "foo = 1", "operation < add", "result > x", "result > 1 or num1 < 2",
+    "num1 between 1 2", "order num1", "limit -1", "result > 1 limit 2 extra", "result > nan",
+])
+def test_parse_query_rejects_invalid_text(text):
+    with pytest.raises(QueryError):
+        parse_query(text)
+
+def test_matches_compares_as_decimal_and_skips_missing():
+    assert matches(predicate("result", "=", "0.1"), 0.1)
+    assert matches(predicate("result", "between", (1, 2)), Decimal(2))
+    assert not matches(predicate("result", "!=", 1), None)
+    assert matches(predicate("operation", "!=", "add"), "divide")
+
+def test_sorted_index_spans_walks_and_compacts():
+    index = SortedIndex([Decimal(3), None, Decimal(1), Decimal(3), 2.0])
+    assert index.keys == [Decimal(1), Decimal(2), Decimal(3), Decimal(3)]
+    assert index.positions == [2, 4, 0, 3]
+    assert index.span(predicate("result", ">=", 2)) == (1, 4)
+    assert index.span(predicate("result", "between", (3, 1))) == (2, 2)
+    index.insert(Decimal(3), 5)
+    assert index.positions == [2, 4, 0, 3]  # buffered until the next search
+    assert list(index.walk(0, len(index), descending=True)) == [0, 3, 5, 4, 2]
+    index.compact({3}, lambda positions: [position - (position > 3) for position in positions])
+    assert index.positions == [2, 3, 0, 4]
+
+def test_sorted_index_merges_a_long_tail():
+    rng = random.Random(5)
+    values = [Decimal(rng.randint(0, 20)) for _ in range(300)]
+    index = SortedIndex(values[:100])
+    for position, value in enumerate(values[100:], start=100):
+        index.insert(value, position)
+    assert index.span(predicate("result", ">=", 0)) == (0, 300)
+    assert index.positions == sorted(range(300), key=values.__getitem__)
+
+def make_facade(rows: int, seed: int = 3):
+    rng = random.Random(seed)
+    facade = PandasFacade(chunk_size=50)
+    for _ in range(rows):
+        num1, num2 = Decimal(rng.randint(-20, 20)), Decimal(rng.randint(1, 5))
+        facade.append(rng.choice(["add", "subtract", "divide"]), num1, num2, num1 + num2)
+    return facade, rng
+
+def brute_force(facade, query):
+    frame = facade.dataframe
+    rows = [label for label, row in frame.iterrows()
+            if all(matches(condition, row[condition.column]) for condition in query.where)]
+    if query.order_by:
+        rows.sort(key=lambda label: frame.at[label, query.order_by], reverse=query.descending)
+    return rows if query.limit is None else rows[:query.limit]
+
+QUERIES = [
+    "result > 10",
+    "operation = divide and num1 between -5 and 5",
+    "num2 = 3 and result <= 0 order by num1",
+    "operation in add,subtract and num1 != 0 order by result desc limit 7",
+    "order by result limit 4",
+    "result >= -3 and result < 4 and num2 > 1 order by num2 desc",
+]
+
+@pytest.mark.parametrize("text", QUERIES)
+def test_query_matches_brute_force_through_mutations(text):
+    facade, rng = make_facade(400)
+    query = parse_query(text)
+    assert list(facade.query(*query).index) == brute_force(facade, query)
+    for _ in range(60):  # appends go into the built indexes, deletes are tombstoned
+        facade.append("add", Decimal(rng.randint(-20, 20)), Decimal(2), Decimal(rng.randint(-20, 20)))
+        facade.remove_record(rng.randrange(len(facade)))
+    assert facade._dead
+    rows = facade.query(*query)
+    expected = brute_force(facade, query)
+    assert list(rows.index) == expected
+    assert list(rows["num1"]) == list(facade.dataframe.loc[expected, "num1"])
+
+def test_query_orders_ties_and_missing_results():
+    facade = PandasFacade()
+    for num1, result in [(1, Decimal(5)), (2, None), (3, Decimal(7)), (4, Decimal(5))]:
+        facade.append("add", Decimal(num1), Decimal(0), result)
+    assert list(facade.query((), "result", True)["num1"]) == [Decimal(3), Decimal(1), Decimal(4), Decimal(2)]
+    assert list(facade.query((), "result", False, 3)["num1"]) == [Decimal(1), Decimal(4), Decimal(3)]
+    assert list(facade.query((predicate("result", ">", 1),), "result", True)["num1"]) == \
+        [Decimal(3), Decimal(1), Decimal(4)]
+
+def test_bulk_inserts_and_loads_drop_indexes(tmp_path):
+    facade, _ = make_facade(20)
+    facade.query((predicate("result", ">", 0),))
+    assert "result" in facade._indexes
+    facade.add_records({"operation": ["add"], "num1": [Decimal(99)], "num2": [Decimal(1)], "result": [Decimal(100)]})
+    assert facade._indexes == {}
+    assert list(facade.query((predicate("result", ">", 99),))["num1"]) == [Decimal(99)]
+    path = str(tmp_path / "history.npz")
+    facade.save_to_file(path)
+    facade.load_from_file(path, max_result=0)
+    assert facade.query((predicate("result", ">", 99),)).empty
+
+def test_selective_operation_predicate_skips_index_build():
+    facade, _ = make_facade(200)
+    facade.append("multiply", Decimal(1), Decimal(2), Decimal(2))
+    rows = facade.query((predicate("operation", "=", "multiply"), predicate("result", ">", 1)))
+    assert list(rows.index) == [200]
+    assert facade._indexes == {}
+
+def test_calculations_query_validates_arguments():
+    Calculations.clear_history()
+    Calculations.add_calculations(["add", "divide"], [Decimal(1), Decimal(8)], [Decimal(2), Decimal(4)],
+                                  [Decimal(3), Decimal(2)])
+    rows = Calculations.query([("num1", ">", 0)], order_by="result", limit=1)
+    assert list(rows["operation"]) == ["divide"]
+    with pytest.raises(QueryError):
+        Calculations.query(order_by="size")
+    with pytest.raises(QueryError):
+        Calculations.query([("result", "like", 1)])
+    Calculations.clear_history()
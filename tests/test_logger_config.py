@@ -0,0 +1,75 @@
+# tests/test_logger_config.py
+import logging
+import pytest
+from logger_config import (
+    configure_logging, stop_logging, SampleFilter, RateLimitFilter, DeferredQueueHandler, OPERATIONS_LOGGER
+)
+
+def make_log_record(level=logging.INFO):
+    return logging.LogRecord("test", level, __file__, 1, "value %s", ("x",), None)
+
+@pytest.fixture
+def isolated_logging(tmp_path, monkeypatch):
+    monkeypatch.setenv("LOG_FILE", str(tmp_path / "app.log"))
+    monkeypatch.chdir(tmp_path)
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    yield tmp_path / "app.log"
+    stop_logging()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+        handler.close()
+    for handler in handlers:
+        root.addHandler(handler)
+    root.setLevel(level)
+    for existing in list(logging.getLogger(OPERATIONS_LOGGER).filters):
+        logging.getLogger(OPERATIONS_LOGGER).removeFilter(existing)
+
+def test_sample_filter_passes_one_in_n():
+    sampler = SampleFilter(every=3)
+    passed = [sampler.filter(make_log_record()) for _ in range(7)]
+    assert passed == [True, False, False, True, False, False, True]
+    assert sampler.filter(make_log_record(logging.ERROR))
+
+def test_rate_limit_filter_refills_over_time():
+    now = [0.0]
+    limiter = RateLimitFilter(per_second=2, clock=lambda: now[0])
+    assert [limiter.filter(make_log_record()) for _ in range(3)] == [True, True, False]
+    assert limiter.filter(make_log_record(logging.WARNING))
+    now[0] = 0.5
+    assert limiter.filter(make_log_record())
+    assert not limiter.filter(make_log_record())
+
+def test_rate_limit_below_one_per_second():
+    now = [0.0]
+    limiter = RateLimitFilter(per_second=0.5, clock=lambda: now[0])
+    assert [limiter.filter(make_log_record()) for _ in range(2)] == [True, False]
+    now[0] = 1.0
+    assert not limiter.filter(make_log_record())
+    now[0] = 2.0
+    assert limiter.filter(make_log_record())
+    now[0] = 10.0  # a long pause still banks only one record
+    assert [limiter.filter(make_log_record()) for _ in range(2)] == [True, False]
+
+def test_queued_mode_writes_through_listener(isolated_logging):
+    listener = configure_logging("INFO", queued=True)
+    root = logging.getLogger()
+    assert listener is not None
+    assert [type(handler) for handler in root.handlers] == [DeferredQueueHandler]
+
+    logging.getLogger(OPERATIONS_LOGGER).info("Result: %s", 42)
+    stop_logging()
+    assert "calculator.operations - INFO - Result: 42" in isolated_logging.read_text()
+
+def test_operations_logger_is_sampled(isolated_logging):
+    assert configure_logging("INFO", queued=False, sample_every=2) is None
+    operations = logging.getLogger(OPERATIONS_LOGGER)
+    for value in range(4):
+        operations.info("Result: %s", value)
+    logging.getLogger().info("unsampled")
+    for handler in logging.getLogger().handlers:
+        handler.flush()
+    text = isolated_logging.read_text()
+    assert "Result: 0" in text and "Result: 2" in text
+    assert "Result: 1" not in text and "Result: 3" not in text
+    assert "unsampled" in text
@@ -0,0 +1,90 @@
+# tests/test_metrics.py
+import pytest
+from decimal import Decimal, DivisionByZero, InvalidOperation
+from app.core import metrics as metrics_module
+from app.core.calculations import Calculations
+from app.core.metrics import Histogram, MetricsRegistry, get_metrics
+
+@pytest.fixture
+def enabled_metrics(monkeypatch):
+    registry = MetricsRegistry()
+    monkeypatch.setattr(metrics_module, "_default_metrics", registry)
+    monkeypatch.setattr(metrics_module, "_configured", True)
+    Calculations.clear_history()
+    registry.clear()
+    yield registry
+    Calculations.clear_history()
+
+def test_histogram_buckets_and_quantiles():
+    histogram = Histogram((0.001, 0.01, 0.1))
+    for value in (0.0005, 0.001, 0.005, 0.05, 5.0):
+        histogram.observe(value)
+    assert histogram.counts == [2, 1, 1, 1]
+    assert histogram.count == 5
+    assert histogram.quantile(0.4) == 0.001
+    assert histogram.quantile(0.6) == 0.01
+    assert histogram.quantile(1.0) == float("inf")
+    assert Histogram().quantile(0.5) == 0.0
+
+def test_operation_counts_errors_and_latency():
+    registry = MetricsRegistry()
+    registry.record_operation("add", 0.00002)
+    registry.record_operation("add", 0.00004)
+    registry.record_operation("add", 0.02, path="mp")
+    registry.record_error("divide", DivisionByZero())
+    registry.record_error("divide", InvalidOperation())
+    registry.record_error("divide", DivisionByZero())
+
+    operations = registry.stats()["operations"]
+    assert operations["add"]["inline"]["count"] == 2
+    assert operations["add"]["inline"]["mean_ms"] == pytest.approx(0.03)
+    assert operations["add"]["inline"]["p50_ms"] == pytest.approx(0.025)
+    assert operations["add"]["mp"]["count"] == 1
+    assert operations["divide"]["errors"] == {"DivisionByZero": 2, "InvalidOperation": 1}
+
+def test_prometheus_text_format(tmp_path):
+    registry = MetricsRegistry(buckets=(0.001, 0.01))
+    registry.record_operation("add", 0.005)
+    registry.record_error("divide", DivisionByZero())
+    text = registry.to_prometheus()
+    assert "# TYPE calculator_operations_total counter" in text
+    assert 'calculator_operations_total{operation="add",path="inline"} 1' in text
+    assert 'calculator_operation_errors_total{error="DivisionByZero",operation="divide"} 1' in text
+    assert "# TYPE calculator_operation_seconds histogram" in text
+    assert 'calculator_operation_seconds_bucket{operation="add",path="inline",le="0.001"} 0' in text
+    assert 'calculator_operation_seconds_bucket{operation="add",path="inline",le="0.01"} 1' in text
+    assert 'calculator_operation_seconds_bucket{operation="add",path="inline",le="+Inf"} 1' in text
+    assert 'calculator_operation_seconds_count{operation="add",path="inline"} 1' in text
+
+    path = tmp_path / "metrics.prom"
+    registry.export(str(path))
+    assert path.read_text() == text
+
+def test_label_values_are_escaped():
+    registry = MetricsRegistry()
+    registry.increment("custom_total", plugin='a "b"\\c')
+    assert 'custom_total{plugin="a \\"b\\"\\\\c"} 1' in registry.to_prometheus()
+
+def test_history_store_feeds_metrics(enabled_metrics, tmp_path):
+    from app.core.calculation import Calculation
+    from app.plugins.add_command import AddCommand
+    Calculations.add_calculation(Calculation(Decimal(1), Decimal(2), AddCommand(), Decimal(3)))
+    Calculations.add_calculations(["add", "add"], [Decimal(1)] * 2, [Decimal(1)] * 2, [Decimal(2)] * 2)
+    Calculations.delete_history(0)
+    path = str(tmp_path / "history.csv")
+    Calculations.save_history(path)
+    Calculations.load_history(path)
+    Calculations.clear_history()
+
+    history = enabled_metrics.stats()["history"]
+    assert history == {"append": 3, "delete": 1, "save": 1, "load": 1, "clear": 1}
+    assert 'calculator_history_seconds_count{event="load"} 1' in enabled_metrics.to_prometheus()
+
+def test_metrics_disabled_by_default(monkeypatch):
+    monkeypatch.setattr(metrics_module, "_configured", False)
+    monkeypatch.delenv("METRICS", raising=False)
+    monkeypatch.delenv("METRICS_FILE", raising=False)
+    assert get_metrics() is None
+    monkeypatch.setattr(metrics_module, "_configured", False)
+    monkeypatch.setenv("METRICS", "1")
+    assert isinstance(get_metrics(), MetricsRegistry)
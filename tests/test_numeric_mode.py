@@ -0,0 +1,63 @@
+# tests/test_numeric_mode.py
+import pytest
+from decimal import Decimal, InvalidOperation
+from app.core import numeric_mode
+from app.core.numeric_mode import parse_number, get_numeric_mode, set_numeric_mode
+from app.core.batch_runner import process_chunk
+from app.core.calculation import Calculation
+from app.core.calculations import Calculations
+from app.core.result_cache import ResultCache
+from app.plugins.add_command import AddCommand
+from app.plugins.divide_command import DivideCommand
+from app.plugins.mean_command import MeanCommand
+
+@pytest.fixture(autouse=True)
+def session_mode(monkeypatch):
+    monkeypatch.setattr(numeric_mode, "_session_mode", None)
+    monkeypatch.delenv("NUMERIC_MODE", raising=False)
+    Calculations.clear_history()
+    yield
+    Calculations.clear_history()
+
+def test_parse_number_in_each_mode():
+    assert parse_number("0.1") == Decimal("0.1")
+    assert parse_number("0.1", "float") == 0.1 and isinstance(parse_number("0.1", "float"), float)
+    for mode in ("decimal", "float"):
+        with pytest.raises(InvalidOperation):
+            parse_number("abc", mode)
+    with pytest.raises(ValueError, match="Unknown numeric mode"):
+        parse_number("1", "binary")
+
+def test_session_mode_from_environment_and_setter(monkeypatch):
+    assert get_numeric_mode() == "decimal"
+    monkeypatch.setenv("NUMERIC_MODE", "FLOAT")
+    assert get_numeric_mode() == "float"
+    set_numeric_mode("decimal")
+    assert get_numeric_mode() == "decimal"
+    with pytest.raises(ValueError):
+        set_numeric_mode("fast")
+
+def test_plugins_compute_natively_on_floats():
+    assert MeanCommand().execute(1.0, 2.0) == 1.5
+    assert AddCommand().execute(0.1, 0.2) == 0.1 + 0.2
+    assert MeanCommand().execute(Decimal(1), Decimal(2)) == Decimal("1.5")
+
+def test_float_history_is_stored_as_float64():
+    for a, b in [(0.5, 0.25), (1.0, 3.0)]:
+        calculation = Calculation(a, b, DivideCommand())
+        calculation.operate()
+        Calculations.add_calculation(calculation)
+    history = Calculations.get_all_calculations()
+    assert [str(history[column].dtype) for column in ("num1", "num2", "result")] == ["float64"] * 3
+    assert history["result"].iloc[0] == 2.0
+
+def test_process_chunk_float_mode_uses_float64_batches():
+    chunk = [("divide", "1", "4"), ("divide", "1", "0"), ("add", "0.1", "0.2")]
+    output, records = process_chunk(chunk, {"add": AddCommand(), "divide": DivideCommand()}, "float")
+    assert [row[3] for row in output] == ["0.25", "", str(0.1 + 0.2)]
+    assert [type(record[3]).__name__ for record in records] == ["float64", "float64"]
+    Calculations.add_calculations(*zip(*records))
+    assert str(Calculations.get_all_calculations()["result"].dtype) == "float64"
+
+def test_cache_keys_separate_float_and_decimal_operands():
+    assert ResultCache.key(AddCommand(), 2.0, 3.0) != ResultCache.key(AddCommand(), Decimal("2.0"), Decimal("3.0"))
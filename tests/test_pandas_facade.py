@@ -0,0 +1,251 @@
+# tests/test_pandas_facade.py
+import pytest
+from decimal import Decimal
+from app.utils.pandas_facade import PandasFacade
+
+def make_record(value):
+    return {"operation": "add", "num1": Decimal(value), "num2": Decimal(1), "result": Decimal(value) + 1}
+
+def test_add_record_buffers_until_read():
+    facade = PandasFacade(chunk_size=3)
+    for value in range(7):
+        facade.add_record(make_record(value))
+
+    # Two sealed chunks and one pending record, nothing consolidated yet
+    assert len(facade._chunks) == 2
+    assert len(facade) == 7
+
+    dataframe = facade.dataframe
+    assert list(dataframe.index) == list(range(7))
+    assert list(dataframe["num1"]) == [Decimal(v) for v in range(7)]
+    assert facade._chunks == []
+
+def test_appends_after_read_are_visible():
+    facade = PandasFacade(chunk_size=2)
+    facade.add_record(make_record(1))
+    assert len(facade.dataframe) == 1
+    facade.add_record(make_record(2))
+    assert list(facade.dataframe["result"]) == [Decimal(2), Decimal(3)]
+
+def test_append_writes_columns_like_add_record():
+    facade = PandasFacade(chunk_size=2)
+    facade.append("multiply", Decimal(2), Decimal(3), Decimal(6))
+    facade.add_record({"operation": "add", "num1": Decimal(1), "num2": Decimal(1), "result": Decimal(2)})
+    facade.append("multiply", Decimal(4), Decimal(2), Decimal(8))
+    assert list(facade.filter_by_operation("multiply")["result"]) == [Decimal(6), Decimal(8)]
+    assert facade.summary()["multiply"]["count"] == 2
+
+def test_delete_record_sees_pending_appends(capsys):
+    facade = PandasFacade(chunk_size=10)
+    for value in range(3):
+        facade.add_record(make_record(value))
+    facade.delete_record(2)
+    assert "Deleted calculation at index 2." in capsys.readouterr().out
+    assert list(facade.dataframe["num1"]) == [Decimal(0), Decimal(1)]
+
+def test_clear_discards_pending_appends():
+    facade = PandasFacade(chunk_size=2)
+    for value in range(5):
+        facade.add_record(make_record(value))
+    facade.clear()
+    assert len(facade) == 0
+    assert facade.dataframe.empty
+
+def make_operation_record(operation, value):
+    return {"operation": operation, "num1": Decimal(value), "num2": Decimal(1), "result": Decimal(value)}
+
+def test_operation_column_is_categorical():
+    facade = PandasFacade(chunk_size=2)
+    facade.add_record(make_operation_record("add", 1))
+    assert facade.dataframe["operation"].dtype == "category"
+    facade.add_records({"operation": ["divide"], "num1": [1], "num2": [1], "result": [1]})
+    assert facade.dataframe["operation"].dtype == "category"
+    assert list(facade.dataframe["operation"]) == ["add", "divide"]
+
+def test_filter_by_operation_uses_positions_across_chunks():
+    facade = PandasFacade(chunk_size=2)
+    for value, operation in enumerate(["add", "multiply", "add", "subtract", "add"]):
+        facade.add_record(make_operation_record(operation, value))
+    facade.dataframe  # consolidate, then keep appending
+    facade.add_records({"operation": ["multiply", "add"], "num1": [5, 6], "num2": [1, 1], "result": [5, 6]})
+
+    filtered = facade.filter_by_operation("add")
+    assert list(filtered.index) == [0, 2, 4, 6]
+    assert list(filtered["num1"]) == [0, 2, 4, 6]
+    assert facade.filter_by_operation("divide").empty
+
+def test_operation_index_renumbers_after_delete(capsys):
+    facade = PandasFacade(chunk_size=2)
+    for value, operation in enumerate(["add", "multiply", "add", "multiply"]):
+        facade.add_record(make_operation_record(operation, value))
+    facade.delete_record(1)
+    assert list(facade.filter_by_operation("multiply")["num1"]) == [3]
+    assert list(facade.filter_by_operation("add").index) == [0, 1]
+
+    facade.dataframe  # delete from the consolidated frame as well
+    facade.delete_record(2)
+    assert facade.filter_by_operation("multiply").empty
+    assert list(facade.filter_by_operation("add")["num1"]) == [0, 2]
+
+def test_deletes_are_tombstoned_until_compaction():
+    facade = PandasFacade(chunk_size=4, compact_ratio=0.5)
+    for value, operation in enumerate(["add", "multiply"] * 5):
+        facade.add_record(make_operation_record(operation, value))
+    facade.dataframe
+    for index in (1, 1, 5):  # live indexes shift after each delete, as before
+        assert facade.remove_record(index)
+    assert len(facade._dead) == 3 and len(facade._frame) == 10
+
+    filtered = facade.filter_by_operation("add")
+    assert list(filtered["num1"]) == [0, 4, 6, 8]
+    assert list(filtered.index) == [0, 2, 4, 5]
+    assert facade.summary()["multiply"]["count"] == 3
+
+    assert list(facade.dataframe["num1"]) == [0, 3, 4, 5, 6, 8, 9]
+    assert facade._dead == set() and len(facade._frame) == 7
+    assert list(facade.filter_by_operation("multiply").index) == [1, 3, 6]
+
+def test_compaction_runs_at_dead_ratio():
+    facade = PandasFacade(compact_ratio=0.25)
+    for value in range(8):
+        facade.add_record(make_record(value))
+    facade.dataframe
+    facade.remove_record(0)
+    assert len(facade._dead) == 1
+    facade.remove_record(0)  # 2 dead of 8 stored reaches the ratio
+    assert facade._dead == set() and len(facade._frame) == 6
+    assert list(facade.dataframe["num1"]) == [Decimal(v) for v in range(2, 8)]
+
+def test_tombstones_span_frame_and_pending_rows():
+    facade = PandasFacade(chunk_size=3, compact_ratio=1.0)
+    for value in range(4):
+        facade.add_record(make_record(value))
+    facade.dataframe
+    for value in range(4, 8):
+        facade.add_record(make_record(value))
+    for index in (6, 2, 3):  # pending, consolidated, pending
+        facade.remove_record(index)
+    assert len(facade) == 5
+    assert not facade.remove_record(5)
+    assert list(facade.dataframe["num1"]) == [Decimal(v) for v in (0, 1, 3, 5, 7)]
+
+def test_many_deletes_match_a_list_model():
+    import random
+    facade = PandasFacade(chunk_size=64, compact_ratio=0.3)
+    model = []
+    rng = random.Random(7)
+    for step in range(600):
+        if model and rng.random() < 0.45:
+            index = rng.randrange(len(model))
+            del model[index]
+            facade.remove_record(index)
+        else:
+            model.append(step)
+            facade.add_record(make_operation_record(rng.choice(["add", "divide"]), step))
+        if step % 97 == 0:
+            facade.dataframe
+    assert len(facade) == len(model)
+    assert facade._dead  # the labels below are computed with tombstones present
+    add_rows = facade.filter_by_operation("add")
+    assert all(model[label] == value for label, value in zip(add_rows.index, add_rows["num1"]))
+    assert list(facade.dataframe["num1"]) == model
+
+def test_operation_index_rebuilt_on_load(tmp_path):
+    facade = PandasFacade()
+    for value, operation in enumerate(["add", "divide", "add"]):
+        facade.add_record(make_operation_record(operation, value))
+    path = str(tmp_path / "history.csv")
+    facade.save_to_file(path)
+
+    loaded = PandasFacade()
+    loaded.load_from_file(path)
+    assert loaded.dataframe["operation"].dtype == "category"
+    assert list(loaded.filter_by_operation("add").index) == [0, 2]
+    loaded.clear()
+    assert loaded.filter_by_operation("add").empty
+
+@pytest.fixture
+def history_file(tmp_path):
+    facade = PandasFacade()
+    for value in range(10):
+        facade.add_record({"operation": "add" if value % 2 else "multiply", "num1": Decimal(value),
+                           "num2": Decimal(1), "result": Decimal(value)})
+    path = str(tmp_path / "history.npz")
+    facade.save_to_file(path)
+    return path
+
+def test_streaming_load_filters_by_operation_and_range(history_file):
+    facade = PandasFacade()
+    assert facade.load_from_file(history_file, chunk_size=3, operations=["add"], min_result=3, max_result="7") == 3
+    assert list(facade.dataframe["result"]) == [Decimal(3), Decimal(5), Decimal(7)]
+    assert list(facade.dataframe.index) == [0, 1, 2]
+    assert facade.summary()["add"]["count"] == 3
+
+def test_streaming_load_without_matches_empties_history(history_file):
+    facade = PandasFacade()
+    facade.add_record(make_record(1))
+    assert facade.load_from_file(history_file, operations=["divide"]) == 0
+    assert len(facade) == 0 and facade.dataframe.empty
+
+def test_streaming_load_appends_after_pending_records(history_file):
+    facade = PandasFacade()
+    facade.add_record(make_record(100))
+    assert facade.load_from_file(history_file, chunk_size=4, max_result=2, append=True) == 3
+    assert list(facade.dataframe["result"]) == [Decimal(101), Decimal(0), Decimal(1), Decimal(2)]
+    assert list(facade.filter_by_operation("add")["result"]) == [Decimal(101), Decimal(1)]
+    assert facade.summary()["multiply"]["count"] == 2
+    facade.remove_record(0)
+    assert list(facade.filter_by_operation("add").index) == [1]
+
+def test_streaming_load_compares_float_results(tmp_path):
+    import pandas as pd
+    path = str(tmp_path / "floats.csv")
+    pd.DataFrame({"operation": ["add"] * 4, "num1": [0.5, 1.0, 1.5, 2.0], "num2": [0.0] * 4,
+                  "result": [0.5, 1.0, None, 2.0]}).to_csv(path, index=False)
+    facade = PandasFacade()
+    assert facade.load_from_file(path, chunk_size=2, min_result=Decimal("0.75")) == 2
+    assert list(facade.dataframe["result"]) == [1.0, 2.0]
+
+def test_page_reads_frame_and_pending_rows_without_consolidating():
+    facade = PandasFacade(chunk_size=4)
+    for value in range(6):
+        facade.add_record(make_operation_record("add" if value % 2 else "divide", value))
+    facade.dataframe
+    for value in range(6, 15):
+        facade.add_record(make_operation_record("add" if value % 2 else "divide", value))
+    page = facade.page(4, 5)
+    assert facade._chunks  # still pending
+    assert list(page.index) == [4, 5, 6, 7, 8]
+    assert list(page["num1"]) == [Decimal(value) for value in range(4, 9)]
+    assert list(facade.page(1, 3, "add")["num1"]) == [Decimal(3), Decimal(5), Decimal(7)]
+    assert facade.page(15, 5).empty
+
+def test_page_skips_tombstones_and_labels_live_indexes():
+    facade = PandasFacade(chunk_size=4, compact_ratio=1)
+    for value in range(12):
+        facade.add_record(make_operation_record("add" if value % 2 else "divide", value))
+    for index in (0, 2, 2):
+        facade.remove_record(index)  # drops 0, 3 and 4
+    assert facade._dead
+    page = facade.page(1, 4)
+    assert list(page.index) == [1, 2, 3, 4]
+    assert list(page["num1"]) == [Decimal(value) for value in (2, 5, 6, 7)]
+    add_page = facade.page(0, 3, "add")
+    assert list(add_page.index) == [0, 2, 4]
+    assert list(add_page["num1"]) == [Decimal(1), Decimal(5), Decimal(7)]
+
+def test_append_many_matches_repeated_append():
+    records = [("add" if value % 3 else "divide", Decimal(value), Decimal(2), Decimal(value) / 7)
+               for value in range(25)]
+    one_by_one, bulk = PandasFacade(chunk_size=8), PandasFacade(chunk_size=8)
+    for record in records:
+        one_by_one.append(*record)
+    one_by_one.summary()
+    bulk.summary()  # aggregates exist before the bulk append, as after earlier appends
+    bulk.append_many(records)
+    assert bulk.dataframe.equals(one_by_one.dataframe)
+    assert list(bulk.filter_by_operation("divide").index) == [0, 3, 6, 9, 12, 15, 18, 21, 24]
+    for operation, expected in one_by_one.summary().items():
+        actual = bulk.summary()[operation]
+        assert actual["count"] == expected["count"] and actual["max"] == expected["max"]
+        assert abs(actual["variance"] - expected["variance"]) < Decimal("1e-20")
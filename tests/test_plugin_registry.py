@@ -0,0 +1,79 @@
+# tests/test_plugin_registry.py
+import json
+import os
+import sys
+import pytest
+from decimal import Decimal
+from app.core.plugin_registry import discover_registry, load_manifest
+
+PLUGIN_SOURCE = '''
+from decimal import Decimal
+from app.core.command import Command
+
+class {name}Command(Command):
+    """
+    Test plugin {name}.
+    """
+    operation_name = "{operation}"
+
+    def execute(self, num1, num2):
+        return num1 {symbol} num2
+
+    def execute_multiprocessing(self, num1, num2, result_queue):
+        result_queue.put(self.execute(num1, num2))
+'''
+
+@pytest.fixture
+def plugins_directory(tmp_path, monkeypatch):
+    package = tmp_path / "fakeplugins"
+    package.mkdir()
+    (package / "__init__.py").write_text("")
+    (package / "plus_command.py").write_text(PLUGIN_SOURCE.format(name="Plus", operation="plus", symbol="+"))
+    (package / "times_command.py").write_text(PLUGIN_SOURCE.format(name="Times", operation="times", symbol="*"))
+    (package / "broken_command.py").write_text("class SomethingElse:\n    pass\n")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield "fakeplugins"
+    for module in [name for name in sys.modules if name.startswith("fakeplugins")]:
+        del sys.modules[module]
+
+def test_registry_lists_without_importing(plugins_directory):
+    registry = discover_registry(plugins_directory)
+    assert list(registry) == ["plus", "times"]
+    assert "plus" in registry and "broken" not in registry
+    assert registry.describe("times") == "Test plugin Times."
+    assert "fakeplugins.plus_command" not in sys.modules
+
+def test_registry_imports_on_first_dispatch(plugins_directory):
+    registry = discover_registry(plugins_directory)
+    command = registry["plus"]
+    assert command.execute(Decimal(2), Decimal(3)) == Decimal(5)
+    assert "fakeplugins.plus_command" in sys.modules
+    assert "fakeplugins.times_command" not in sys.modules
+    assert registry["plus"] is command
+    assert registry.get("missing") is None
+
+def test_manifest_cache_is_reused_and_invalidated(plugins_directory):
+    cache_path = os.path.join(plugins_directory, "__pycache__", "plugin_manifest.json")
+    discover_registry(plugins_directory)
+    with open(cache_path) as handle:
+        cached = json.load(handle)
+    assert set(cached["plugins"]) == {"plus", "times"}
+
+    # A stale entry in a valid cache is served as-is
+    cached["plugins"]["plus"]["description"] = "cached"
+    with open(cache_path, "w") as handle:
+        json.dump(cached, handle)
+    assert load_manifest(plugins_directory, cache_path)["plugins"]["plus"]["description"] == "cached"
+
+    # Touching a plugin file invalidates the cache
+    path = os.path.join(plugins_directory, "plus_command.py")
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert load_manifest(plugins_directory, cache_path)["plugins"]["plus"]["description"] == "Test plugin Plus."
+
+def test_new_plugin_file_invalidates_cache(plugins_directory, tmp_path):
+    assert "minus" not in discover_registry(plugins_directory)
+    (tmp_path / "fakeplugins" / "minus_command.py").write_text(
+        PLUGIN_SOURCE.format(name="Minus", operation="minus", symbol="-"))
+    assert discover_registry(plugins_directory)["minus"].execute(Decimal(5), Decimal(3)) == Decimal(2)
@@ -1,5 +1,6 @@
 import pytest
 import multiprocessing
+import numpy as np
 from decimal import Decimal, DivisionByZero
 from app.plugins.add_command import AddCommand
 from app.plugins.subtract_command import SubtractCommand
@@ -115,4 +116,54 @@ def test_execute_multiprocessing_with_zero():
     
     # Retrieve the result from the queue
     result = result_queue.get()
-    assert result == Decimal(0)
\ No newline at end of file
+    assert result == Decimal(0)
+
+def test_arithmetic_execute_batch_decimal():
+    nums1 = [Decimal(6), Decimal("2.5"), Decimal(-4)]
+    nums2 = [Decimal(3), Decimal("0.5"), Decimal(2)]
+    expected = {
+        AddCommand(): [Decimal(9), Decimal("3.0"), Decimal(-2)],
+        SubtractCommand(): [Decimal(3), Decimal("2.0"), Decimal(-6)],
+        MultiplyCommand(): [Decimal(18), Decimal("1.25"), Decimal(-8)],
+        DivideCommand(): [Decimal(2), Decimal(5), Decimal(-2)],
+    }
+    for command, values in expected.items():
+        batch = command.execute_batch(nums1, nums2)
+        assert list(batch.values) == values
+        assert not batch.mask.any()
+        assert all(isinstance(value, Decimal) for value in batch.values)
+
+def test_arithmetic_execute_batch_numpy():
+    nums1 = np.array([1.0, 2.0, 3.0])
+    nums2 = np.array([4.0, 5.0, 6.0])
+    np.testing.assert_array_equal(AddCommand().execute_batch(nums1, nums2).values, [5.0, 7.0, 9.0])
+    np.testing.assert_array_equal(MultiplyCommand().execute_batch(nums1, nums2).values, [4.0, 10.0, 18.0])
+
+def test_divide_execute_batch_masks_zero_divisors():
+    batch = DivideCommand().execute_batch([Decimal(6), Decimal(1), Decimal(0)], [Decimal(3), Decimal(0), Decimal(0)])
+    assert list(batch.mask) == [False, True, True]
+    assert list(batch.values) == [Decimal(2), None, None]
+
+    batch = DivideCommand().execute_batch(np.array([1.0, 4.0]), np.array([0.0, 2.0]))
+    assert list(batch.mask) == [True, False]
+    assert np.isnan(batch.values[0]) and batch.values[1] == 2.0
+
+def test_execute_batch_masks_only_overflowing_pairs():
+    from app.plugins.mean_command import MeanCommand
+    from app.plugins.median_command import MedianCommand
+    huge = Decimal("9E+999999")
+    nums1, nums2 = [Decimal(6), huge, Decimal(1)], [Decimal(2), huge, Decimal(1)]
+    for command in (AddCommand(), MultiplyCommand(), MeanCommand(), MedianCommand()):
+        batch = command.execute_batch(nums1, nums2)
+        assert list(batch.mask) == [False, True, False], command.operation_name
+        assert batch.values[1] is None
+        assert batch.values[0] == command.execute(Decimal(6), Decimal(2))
+    batch = SubtractCommand().execute_batch(nums1, [Decimal(2), -huge, Decimal(1)])
+    assert list(batch.mask) == [False, True, False]
+    batch = DivideCommand().execute_batch([Decimal(6), huge, Decimal(1)], [Decimal(2), Decimal("1E-999999"), Decimal(0)])
+    assert list(batch.mask) == [False, True, True]
+    assert list(batch.values) == [Decimal(3), None, None]
+
+def test_execute_batch_rejects_mismatched_lengths():
+    with pytest.raises(ValueError, match="equal length"):
+        AddCommand().execute_batch([Decimal(1), Decimal(2)], [Decimal(1)])
@@ -0,0 +1,68 @@
+# tests/test_result_cache.py
+import pytest
+from decimal import Decimal, DivisionByZero
+from app.core.result_cache import ResultCache
+from app.plugins.add_command import AddCommand
+from app.plugins.subtract_command import SubtractCommand
+from app.plugins.divide_command import DivideCommand
+from app.plugins.mean_command import MeanCommand
+from app.plugins.median_command import MedianCommand
+from app.plugins.mode_command import ModeCommand
+from app.plugins.multiply_command import MultiplyCommand
+
+class CountingAdd(AddCommand):
+    def __init__(self):
+        self.calls = 0
+
+    def execute(self, num1, num2):
+        self.calls += 1
+        return super().execute(num1, num2)
+
+def test_commutative_flags():
+    assert all(command.commutative for command in (AddCommand(), MultiplyCommand(), MeanCommand(), MedianCommand(), ModeCommand()))
+    assert not SubtractCommand().commutative
+    assert not DivideCommand().commutative
+
+def test_cache_hits_skip_execution():
+    cache, command = ResultCache(8), CountingAdd()
+    assert cache.execute(command, Decimal(1), Decimal(2)) == Decimal(3)
+    assert cache.execute(command, Decimal(1), Decimal(2)) == Decimal(3)
+    assert command.calls == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+def test_commutative_operands_share_an_entry():
+    cache, command = ResultCache(8), CountingAdd()
+    cache.execute(command, Decimal(1), Decimal(2))
+    cache.execute(command, Decimal(2), Decimal(1))
+    assert command.calls == 1
+    assert ResultCache.key(SubtractCommand(), Decimal(1), Decimal(2)) != ResultCache.key(SubtractCommand(), Decimal(2), Decimal(1))
+
+def test_keys_keep_decimal_representation():
+    cache = ResultCache(8)
+    assert str(cache.execute(AddCommand(), Decimal("2.0"), Decimal(3))) == "5.0"
+    assert str(cache.execute(AddCommand(), Decimal("2"), Decimal(3))) == "5"
+
+def test_lru_eviction():
+    cache = ResultCache(2)
+    cache.execute(AddCommand(), Decimal(1), Decimal(1))
+    cache.execute(AddCommand(), Decimal(2), Decimal(2))
+    cache.execute(AddCommand(), Decimal(1), Decimal(1))  # refresh (1, 1)
+    cache.execute(AddCommand(), Decimal(3), Decimal(3))  # evicts (2, 2)
+    stats = cache.stats()
+    assert (stats["size"], stats["evictions"], stats["hits"]) == (2, 1, 1)
+    assert cache.lookup(ResultCache.key(AddCommand(), Decimal(2), Decimal(2))) is None
+    assert cache.lookup(ResultCache.key(AddCommand(), Decimal(1), Decimal(1))) == Decimal(2)
+
+def test_errors_are_not_cached():
+    cache = ResultCache(2)
+    with pytest.raises(DivisionByZero):
+        cache.execute(DivideCommand(), Decimal(1), Decimal(0))
+    assert cache.stats()["size"] == 0
+
+def test_clear_and_invalid_size():
+    cache = ResultCache(2)
+    cache.execute(AddCommand(), Decimal(1), Decimal(1))
+    cache.clear()
+    assert cache.stats() == {"size": 0, "max_size": 2, "hits": 0, "misses": 0, "evictions": 0, "hit_rate": 0.0}
+    with pytest.raises(ValueError):
+        ResultCache(0)
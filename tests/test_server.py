@@ -0,0 +1,115 @@
+# tests/test_server.py
+import asyncio
+import json
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from app.core.calculations import Calculations
+from app.core.server import CalculatorServer, LatencyTracker, parse_address
+from app.plugins.add_command import AddCommand
+from app.plugins.divide_command import DivideCommand
+
+class CountingExecutor(ThreadPoolExecutor):
+    def __init__(self):
+        super().__init__(max_workers=2)
+        self.submitted = 0
+
+    def submit(self, *args, **kwargs):
+        self.submitted += 1
+        return super().submit(*args, **kwargs)
+
+@pytest.fixture
+def server():
+    Calculations.clear_history()
+    calculator = CalculatorServer({"add": AddCommand(), "divide": DivideCommand()}, executor=CountingExecutor())
+    yield calculator
+    Calculations.clear_history()
+
+async def exchange(server, address, requests):
+    listener = await server.start(address)
+    try:
+        if address.startswith("unix:"):
+            reader, writer = await asyncio.open_unix_connection(address[len("unix:"):])
+        else:
+            reader, writer = await asyncio.open_connection("127.0.0.1", listener.sockets[0].getsockname()[1])
+        writer.write(b"".join(json.dumps(request).encode() + b"\n" for request in requests))
+        writer.write_eof()
+        responses = [json.loads(line) for line in (await reader.read(-1)).splitlines()]
+        writer.close()
+        return responses
+    finally:
+        await server.close()
+
+def test_parse_address():
+    assert parse_address("0.0.0.0:9000") == ("tcp", "0.0.0.0", 9000)
+    assert parse_address(":9000") == ("tcp", "127.0.0.1", 9000)
+    assert parse_address("unix:/tmp/calc.sock") == ("unix", "/tmp/calc.sock")
+
+def test_latency_percentiles():
+    tracker = LatencyTracker()
+    assert tracker.percentiles() == {}
+    for milliseconds in range(1, 101):
+        tracker.record(milliseconds / 1000)
+    report = tracker.percentiles()
+    assert [round(report[key]) for key in ("p50", "p90", "p99", "max")] == [50, 90, 99, 100]
+
+def test_pipelined_requests_answer_in_order(server):
+    requests = [
+        {"op": "add", "a": "1", "b": "2", "id": 1},
+        {"op": "add", "batch": [["2", "3"], ["x", "1"]], "id": 2},
+        {"op": "divide", "a": "1", "b": "0", "id": 3},
+        {"op": "pow", "a": "1", "b": "2", "id": 4},
+        {"op": "divide", "a": "1", "b": "4", "mode": "float", "id": 5},
+        {"cmd": "stats", "id": 6},
+    ]
+    responses = asyncio.run(exchange(server, "127.0.0.1:0", requests))
+    assert [response["id"] for response in responses] == [1, 2, 3, 4, 5, 6]
+    assert responses[0]["result"] == "3"
+    assert responses[1] == {"results": ["5", None], "errors": [None, "Invalid numbers: x, 1"], "id": 2}
+    assert responses[2]["error"] == "Division by zero is not allowed."
+    assert responses[3]["error"] == "Invalid operation: pow"
+    assert responses[4]["result"] == "0.25"
+    assert responses[5]["requests"] >= 4 and "p50" in responses[5]["latency_ms"]
+    assert server._executor.submitted == 1
+    # The batch is recorded when the executor finishes, possibly after later single requests
+    assert sorted(map(str, Calculations.get_all_calculations()["result"])) == ["0.25", "3", "5"]
+
+def test_invalid_lines_get_error_responses(server):
+    async def send_raw():
+        listener = await server.start("127.0.0.1:0")
+        reader, writer = await asyncio.open_connection("127.0.0.1", listener.sockets[0].getsockname()[1])
+        writer.write(b'{broken\n[1, 2]\n{"op": "add", "a": 1, "b": 1}\n')
+        writer.write_eof()
+        lines = (await reader.read(-1)).splitlines()
+        writer.close()
+        await server.close()
+        return [json.loads(line) for line in lines]
+    responses = asyncio.run(send_raw())
+    assert responses[0]["error"].startswith("Invalid request")
+    assert responses[1]["error"] == "Invalid request: request must be a JSON object"
+    assert responses[2] == {"result": "2"}
+
+def test_concurrent_connections_record_every_calculation(server):
+    async def run_clients():
+        listener = await server.start("127.0.0.1:0")
+        port = listener.sockets[0].getsockname()[1]
+
+        async def client(number):
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            for value in range(25):
+                writer.write(json.dumps({"op": "add", "a": number, "b": value}).encode() + b"\n")
+            writer.write_eof()
+            responses = [json.loads(line) for line in (await reader.read(-1)).splitlines()]
+            writer.close()
+            return [response["result"] for response in responses]
+
+        results = await asyncio.gather(*(client(number) for number in range(20)))
+        await server.close()
+        return results
+
+    results = asyncio.run(run_clients())
+    assert results == [[str(number + value) for value in range(25)] for number in range(20)]
+    assert len(Calculations.get_all_calculations()) == 500
+
+def test_unix_socket(server, tmp_path):
+    responses = asyncio.run(exchange(server, f"unix:{tmp_path / 'calc.sock'}", [{"op": "add", "a": "4", "b": "5"}]))
+    assert responses == [{"result": "9"}]
@@ -0,0 +1,32 @@
+# tests/test_startup_budget.py
+import json
+import os
+import subprocess
+import sys
+
+# Import + single-operation dispatch budget, in milliseconds. Override with
+# STARTUP_BUDGET_MS on slow machines.
+BUDGET_MS = float(os.getenv("STARTUP_BUDGET_MS", "300"))
+HEAVY_MODULES = ["pandas", "numpy", "dotenv", "multiprocessing.pool"]
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SNIPPET = f"""
+import json, sys, time
+start = time.perf_counter()
+import main
+main.execute_operation('1', '2', 'add', main.discover_plugins())
+elapsed = time.perf_counter() - start
+print(json.dumps({{"ms": elapsed * 1000, "loaded": [name for name in {HEAVY_MODULES!r} if name in sys.modules]}}))
+"""
+
+def run_single_operation():
+    completed = subprocess.run([sys.executable, "-c", SNIPPET], cwd=PROJECT_ROOT,
+                               capture_output=True, text=True, check=True)
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+def test_single_operation_skips_heavy_imports():
+    assert run_single_operation()["loaded"] == []
+
+def test_single_operation_startup_within_budget():
+    best = min(run_single_operation()["ms"] for _ in range(3))
+    assert best < BUDGET_MS, f"single-operation startup took {best:.1f} ms (budget {BUDGET_MS:.0f} ms)"
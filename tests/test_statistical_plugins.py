@@ -1,5 +1,6 @@
 import pytest
 import multiprocessing
+import numpy as np
 from decimal import Decimal
 from multiprocessing import Queue
 from app.plugins.mean_command import MeanCommand
@@ -54,6 +55,16 @@ def test_mode_command_execute_different_values():
     # Arbitrary choice: returns the smaller of the two when no mode
     assert result == Decimal(5)
 
+def test_mode_command_execute_ignores_operand_order():
+    command = ModeCommand()
+    for num1, num2 in [(Decimal("1.0"), Decimal("1.00")), (-0.0, 0.0)]:
+        assert repr(command.execute(num1, num2)) == repr(command.execute(num2, num1))
+    nums1, nums2 = [Decimal("1.0"), Decimal("1.00"), Decimal(2)], [Decimal("1.00"), Decimal("1.0"), Decimal(1)]
+    assert [repr(value) for value in command.execute_batch(nums1, nums2).values] == \
+        [repr(Decimal("1.0")), repr(Decimal("1.0")), repr(Decimal(1))]
+    floats = command.execute_batch(np.array([-0.0, 0.0, 3.0]), np.array([0.0, -0.0, 3.0])).values
+    assert list(np.signbit(floats)) == [True, True, False]
+
 def test_mode_command_execute_multiprocessing_same_values():
     command = ModeCommand()
     result_queue = Queue()
@@ -71,3 +82,35 @@ def test_mode_command_execute_multiprocessing_different_values():
     result = result_queue.get()
 
     assert result == Decimal(12)  # Assuming smallest value when no clear mode
+
+# -----------------------------------
+# Batch execution Tests
+# -----------------------------------
+def test_statistical_execute_batch():
+    nums1 = [Decimal(10), Decimal(5), Decimal(7)]
+    nums2 = [Decimal(20), Decimal(5), Decimal(3)]
+    assert list(MeanCommand().execute_batch(nums1, nums2).values) == [Decimal(15), Decimal(5), Decimal(5)]
+    assert list(MedianCommand().execute_batch(nums1, nums2).values) == [Decimal(15), Decimal(5), Decimal(5)]
+    assert list(ModeCommand().execute_batch(nums1, nums2).values) == [Decimal(10), Decimal(5), Decimal(3)]
+
+def test_statistical_execute_batch_matches_execute():
+    nums1 = [Decimal("1.5"), Decimal(-2), Decimal(9)]
+    nums2 = [Decimal("0.25"), Decimal(8), Decimal(9)]
+    for command in (MeanCommand(), MedianCommand(), ModeCommand()):
+        batch = command.execute_batch(nums1, nums2)
+        assert list(batch.values) == [command.execute(a, b) for a, b in zip(nums1, nums2)]
+        assert not batch.mask.any()
+
+# -----------------------------------
+# N-ary execution Tests
+# -----------------------------------
+def test_statistical_execute_many():
+    values = [Decimal(v) for v in (4, 8, 1, 8, 9)]
+    assert MeanCommand().execute_many(iter(values)) == Decimal(6)
+    assert MedianCommand().execute_many(iter(values)) == Decimal(8)
+    assert ModeCommand().execute_many(iter(values)) == Decimal(8)
+
+def test_statistical_execute_many_matches_execute_for_pairs():
+    for command in (MeanCommand(), MedianCommand(), ModeCommand()):
+        for a, b in [(Decimal(5), Decimal(10)), (Decimal(7), Decimal(7)), (Decimal("-1.5"), Decimal(2))]:
+            assert command.execute_many([a, b]) == command.execute(a, b)
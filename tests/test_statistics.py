@@ -0,0 +1,82 @@
+# tests/test_statistics.py
+import pytest
+from decimal import Decimal, InvalidOperation
+from app.core.statistics import RunningAggregate, RunningMedian, streaming_mean, streaming_median, streaming_mode, iter_values
+
+def test_streaming_mean_consumes_a_generator():
+    values = (Decimal(value) for value in range(1, 101))
+    assert streaming_mean(values) == Decimal("50.5")
+
+@pytest.mark.parametrize("values, expected", [
+    ([5], 5),
+    ([3, 1], 2),
+    ([7, 1, 3], 3),
+    ([9, 2, 7, 4], Decimal("5.5")),
+    ([1, 1, 1, 2], 1),
+])
+def test_streaming_median(values, expected):
+    assert streaming_median(Decimal(value) for value in values) == Decimal(expected)
+
+def test_running_median_matches_sorted_median():
+    running, seen = RunningMedian(), []
+    for value in [Decimal(v) for v in (13, -4, 8, 8, 0, 21, -4, 5, 2)]:
+        running.push(value)
+        seen.append(value)
+        ordered = sorted(seen)
+        middle = len(ordered) // 2
+        expected = ordered[middle] if len(ordered) % 2 else (ordered[middle - 1] + ordered[middle]) / 2
+        assert running.median() == expected
+
+def test_streaming_mode_prefers_smallest_on_ties():
+    assert streaming_mode(Decimal(v) for v in (4, 1, 4, 2, 2)) == Decimal(2)
+    assert streaming_mode(Decimal(v) for v in (9, 3, 3)) == Decimal(3)
+
+@pytest.mark.parametrize("function", [streaming_mean, streaming_median, streaming_mode])
+def test_empty_input_raises(function):
+    with pytest.raises(ValueError, match="At least one value"):
+        function(iter(()))
+
+def test_iter_values_reads_tokens_and_columns(tmp_path):
+    plain = tmp_path / "values.txt"
+    plain.write_text("1, 2 3\n\n4.5\n")
+    assert list(iter_values(str(plain))) == [Decimal(1), Decimal(2), Decimal(3), Decimal("4.5")]
+
+    table = tmp_path / "values.csv"
+    table.write_text("name,value\na,10\nb,\nc,30\n")
+    assert list(iter_values(str(table), "value")) == [Decimal(10), Decimal(30)]
+    with pytest.raises(KeyError):
+        list(iter_values(str(table), "missing"))
+    with pytest.raises(InvalidOperation):
+        list(iter_values(str(table)))
+
+def test_running_aggregate_matches_bulk_after_removals():
+    values = [Decimal(v) for v in ("2.5", "-1", "8", "3.25", "8", "0")]
+    running = RunningAggregate()
+    for value in values:
+        running.add(value)
+    bulk = RunningAggregate.from_values(values).as_dict()
+    assert abs(running.as_dict()["variance"] - bulk["variance"]) < Decimal("1e-20")
+    assert {**running.as_dict(), "variance": None} == {**bulk, "variance": None}
+
+    running.remove(Decimal(8))
+    running.remove(Decimal(-1))
+    assert running.stale
+    remaining = [Decimal(v) for v in ("2.5", "3.25", "8", "0")]
+    running.refresh_extremes(remaining)
+    expected = RunningAggregate.from_values(remaining).as_dict()
+    actual = running.as_dict()
+    assert actual["count"] == 4 and actual["min"] == 0 and actual["max"] == 8
+    for key in ("sum", "mean", "variance"):
+        assert abs(actual[key] - expected[key]) < Decimal("1e-20")
+
+def test_running_aggregate_merge_matches_bulk():
+    values = [Decimal(v) for v in ("2.5", "-1", "8", "3.25", "8", "0", "7.75")]
+    merged = RunningAggregate()
+    for part in (values[:3], values[3:3], values[3:]):
+        merged.merge(RunningAggregate.from_values(part))
+    expected = RunningAggregate.from_values(values).as_dict()
+    actual = merged.as_dict()
+    assert (actual["count"], actual["sum"], actual["min"], actual["max"]) == \
+        (expected["count"], expected["sum"], expected["min"], expected["max"])
+    for key in ("mean", "variance"):
+        assert abs(actual[key] - expected[key]) < Decimal("1e-20")
@@ -0,0 +1,52 @@
+# tests/test_worker_pool.py
+import pytest
+from decimal import Decimal, DivisionByZero
+from app.core.worker_pool import WorkerPool
+from app.plugins.add_command import AddCommand
+from app.plugins.divide_command import DivideCommand
+
+@pytest.fixture
+def pool():
+    worker_pool = WorkerPool(size=2)
+    yield worker_pool
+    worker_pool.shutdown()
+
+def test_pool_starts_lazily(pool):
+    assert not pool.started
+    assert pool.utilisation() == {}
+    assert pool.submit(AddCommand(), Decimal(2), Decimal(3)) == Decimal(5)
+    assert pool.started
+
+def test_pool_reuses_workers(pool):
+    for value in range(10):
+        assert pool.submit(AddCommand(), Decimal(value), Decimal(1)) == Decimal(value + 1)
+    usage = pool.utilisation()
+    assert 1 <= len(usage) <= 2
+    assert sum(worker["tasks"] for worker in usage.values()) == 10
+    assert all(0.0 <= worker["utilisation"] <= 1.0 for worker in usage.values())
+
+def test_pool_returns_plugin_errors(pool):
+    result = pool.submit(DivideCommand(), Decimal(6), Decimal(0))
+    assert isinstance(result, DivisionByZero)
+
+def test_pool_restarts_after_shutdown(pool):
+    pool.submit(AddCommand(), Decimal(1), Decimal(1))
+    pool.shutdown()
+    assert not pool.started
+    assert pool.submit(AddCommand(), Decimal(1), Decimal(2)) == Decimal(3)
+
+def test_shared_batch_matches_inline_results(pool):
+    import numpy as np
+    nums1, nums2 = np.arange(10.0), np.array([1.0, 0.0, 2.0, 4.0, 5.0, 0.0, 3.0, 7.0, 8.0, 9.0])
+    result = pool.execute_batch_shared(DivideCommand(), nums1, nums2, slices=3)
+    expected = DivideCommand().execute_batch(nums1, nums2)
+    assert list(result.mask) == list(expected.mask)
+    assert np.array_equal(result.values, expected.values, equal_nan=True)
+    assert sum(worker["tasks"] for worker in pool.utilisation().values()) == 3
+
+def test_shared_batch_edge_cases(pool):
+    assert len(pool.execute_batch_shared(AddCommand(), [], []).values) == 0
+    assert not pool.started
+    assert list(pool.execute_batch_shared(AddCommand(), [1, 2], [3, 4], slices=8).values) == [4.0, 6.0]
+    with pytest.raises(ValueError):
+        pool.execute_batch_shared(AddCommand(), [1, 2], [3])